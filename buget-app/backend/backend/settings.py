@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+from importlib.util import find_spec
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -44,6 +45,8 @@ INSTALLED_APPS = [
 
 
 MIDDLEWARE = [
+    "finante.instrumentare.ProfilareMiddleware",
+    "finante.compresie.CompresieMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -53,6 +56,7 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "finante.instrumentare.NumarInterogariMiddleware",
 ]
 
 ROOT_URLCONF = "backend.urls"
@@ -129,18 +133,78 @@ STATIC_URL = "static/"
 CORS_ALLOW_ALL_ORIGINS = True
 
 
+# Cache (bridge-uri între useri etc.)
+# cu mai multe procese / servere trebuie un backend comun (ex: Redis, fișiere),
+# altfel invalidarea se vede doar în procesul care a făcut scrierea
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "buget",
+    },
+    # răspunsurile endpointurilor de grafice (finante/utils_cache.py); fără
+    # server extern, între procese merge
+    # "django.core.cache.backends.filebased.FileBasedCache" cu un LOCATION comun
+    "raspunsuri": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "buget-raspunsuri",
+        "TIMEOUT": 60 * 60,
+        "OPTIONS": {"MAX_ENTRIES": 5000},
+    },
+}
+
+# în dezvoltare (un singur proces) cache-ul local e suficient; în producție,
+# finante.E001 / E002 cer un cache comun (versiuni, revendicări JWT)
+if DEBUG:
+    SILENCED_SYSTEM_CHECKS = ["finante.E001", "finante.E002"]
+
+
 from datetime import timedelta
 
 REST_FRAMEWORK = {
+    # JWTAuthentication / JSONRenderer, cu timpul măsurat pentru profilare
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "finante.autentificare.JWTAuthenticationCronometrat",
     ),
+    # MessagePack la cerere (Accept: application/msgpack), dacă e instalat
+    "DEFAULT_RENDERER_CLASSES": (
+        "finante.renderers.JSONRendererCronometrat",
+        *(["finante.renderers.MessagePackRenderer"] if find_spec("msgpack") else []),
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+}
+
+# profilarea requesturilor (finante/instrumentare.py): Server-Timing pe o
+# fracțiune din requesturi și histograme de latență pe rută, în memoria
+# fiecărui proces, văzute în /api/admin/perf/
+FINANTE_PROFILARE = {
+    "ESANTION": 0.1,
+    "SERVER_TIMING": True,
+    "PRAG_LENT_MS": 1000,
+    "FEREASTRA_S": 300,
+    "MAX_RUTE": 200,
+}
+
+# compresia răspunsurilor (finante/compresie.py): brotli dacă e instalat,
+# altfel gzip, doar pentru răspunsurile de cel puțin PRAG_OCTETI
+FINANTE_COMPRESIE = {
+    "PRAG_OCTETI": 1024,
+    "NIVEL_BROTLI": 5,
+}
+
+# sincronizarea incrementală (finante/utils_sync.py): tokenul se dă cu
+# SUPRAPUNERE_S în urmă; urmele rândurilor șterse se păstrează PASTRARE_ZILE
+FINANTE_SYNC = {
+    "SUPRAPUNERE_S": 60,
+    "PASTRARE_ZILE": 30,
 }
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
     "AUTH_HEADER_TYPES": ("Bearer",),
+    # tokenurile de acces poartă userul și gospodăria (finante/autentificare.py)
+    "TOKEN_OBTAIN_SERIALIZER": "finante.serializers.TokenCuRevendicariSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "finante.serializers.TokenRefreshCuRevendicariSerializer",
 }
 
 
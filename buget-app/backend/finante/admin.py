@@ -1,8 +1,20 @@
 from django.contrib import admin
-from .models import Fond
+from .models import Fond, CursValutar, StatisticaGlobala
 
 
 @admin.register(Fond)
 class FondAdmin(admin.ModelAdmin):
     list_display = ("user", "suma_eur", "suma_ron", "data")
     search_fields = ("user__username", "observatii")
+
+
+@admin.register(CursValutar)
+class CursValutarAdmin(admin.ModelAdmin):
+    list_display = ("data", "moneda", "moneda_baza", "curs")
+    list_filter = ("moneda", "moneda_baza")
+
+
+@admin.register(StatisticaGlobala)
+class StatisticaGlobalaAdmin(admin.ModelAdmin):
+    list_display = ("tip", "moneda", "felie", "numar", "total")
+    list_filter = ("tip",)
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class FinanteConfig(AppConfig):
     name = 'finante'
+
+    def ready(self):
+        from . import checks, signals  # noqa: F401
@@ -0,0 +1,204 @@
+"""
+Autentificare JWT fără interogări: tokenurile de acces emise de
+/api/token/ (și refresh) poartă username-ul, flag-urile userului și userii
+din gospodărie, din care se construiește request.user. Revendicările sunt
+valabile până la următoarea schimbare a userului sau a bridge-urilor lui
+(signals.py); după ea, și pentru tokenurile fără revendicări, userul vine
+din baza de date, printr-un cache scurt în proces, invalidat la fel.
+"""
+
+import copy
+import threading
+import time
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .instrumentare import faza
+from .utils_users import get_connected_user_ids, memoreaza_conectati
+
+
+CHEIE_SCHIMBARE = "finante:auth:{}"
+TTL_USER = 30  # secunde, cât ține userul citit din baza de date în proces
+MAX_USERI = 10_000  # peste atâția useri în cache, se golește
+
+# ce se citește din token (în ordinea coloanelor, cum cere from_db); restul
+# câmpurilor lui User se încarcă la cerere
+CAMPURI_PRINCIPAL = tuple(
+    f.attname
+    for f in User._meta.concrete_fields
+    if f.attname in ("id", "username", "is_staff", "is_superuser", "is_active")
+)
+
+# user_id → momentul ultimei schimbări (în procesul curent; între procese,
+# prin cache-ul comun)
+_schimbari = {}
+# user_id → (expiră la, citit la, user) pentru tokenurile fără revendicări
+# valabile
+_useri = {}
+_lock = threading.Lock()
+
+
+def _durata_token():
+    return int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds())
+
+
+def _user_id(token):
+    # simplejwt scrie id-ul ca text; cheile de aici sunt id-urile din model
+    return User._meta.pk.to_python(token[api_settings.USER_ID_CLAIM])
+
+
+def adauga_revendicari(token, user):
+    """
+    Pune în `token` ce trebuie pentru un request fără interogări de auth.
+    Momentul se ia înainte de citiri: o schimbare confirmată în timpul lor
+    face revendicările nevalabile.
+    """
+
+    token["rev_la"] = time.time()
+    token["username"] = user.username
+    token["is_staff"] = user.is_staff
+    token["is_superuser"] = user.is_superuser
+    token["is_active"] = user.is_active
+    token["gospodarie"] = get_connected_user_ids(user)[1:]
+    return token
+
+
+class RefreshTokenCuRevendicari(RefreshToken):
+    """
+    RefreshToken al cărui token de acces are revendicările recalculate din
+    baza de date (la login și la fiecare refresh).
+    """
+
+    @property
+    def access_token(self):
+        access = super().access_token
+        user = User.objects.filter(pk=self[api_settings.USER_ID_CLAIM]).first()
+        if user is not None:
+            adauga_revendicari(access, user)
+        return access
+
+
+def access_token_pentru(user):
+    """
+    Token de acces cu revendicări, ca cel primit de client la login.
+    """
+
+    return str(RefreshTokenCuRevendicari.for_user(user).access_token)
+
+
+def invalideaza_autentificare(*user_ids):
+    """
+    Revendicările din tokenurile deja emise pentru acești useri nu mai sunt
+    valabile, iar userii se recitesc din baza de date. Se aplică imediat și
+    din nou la commit (revendicările citite până atunci sunt tot vechi).
+    """
+
+    def aplica():
+        acum = time.time()
+        with _lock:
+            for user_id in user_ids:
+                _schimbari[user_id] = acum
+                _useri.pop(user_id, None)
+
+            # schimbările mai vechi decât orice token valid nu mai contează
+            expirate = acum - _durata_token()
+            for user_id in [u for u, t in _schimbari.items() if t < expirate]:
+                del _schimbari[user_id]
+
+        cache.set_many(
+            {CHEIE_SCHIMBARE.format(user_id): acum for user_id in user_ids},
+            _durata_token(),
+        )
+
+    aplica()
+    transaction.on_commit(aplica)
+
+
+def _nemodificat_din(user_id, moment):
+    # o schimbare mai veche văzută în proces nu o ascunde pe una mai nouă
+    # făcută în alt worker: contează cea mai recentă dintre ele
+    schimbare = _schimbari.get(user_id)
+    if schimbare is not None and schimbare >= moment:
+        return False
+    schimbare = cache.get(CHEIE_SCHIMBARE.format(user_id))
+    return schimbare is None or schimbare < moment
+
+
+def principal_din_token(token):
+    """
+    request.user construit doar din token (un User cu celelalte câmpuri
+    amânate), cu userii conectați deja memorați; None dacă tokenul nu are
+    revendicări, ele nu mai sunt valabile sau userul e inactiv.
+    """
+
+    try:
+        user_id = _user_id(token)
+        rev_la = token["rev_la"]
+        gospodarie = token["gospodarie"]
+        valori = {
+            "id": user_id,
+            "username": token["username"],
+            "is_staff": token["is_staff"],
+            "is_superuser": token["is_superuser"],
+            "is_active": token["is_active"],
+        }
+    except KeyError:
+        return None
+
+    # userul inactiv trece pe calea din baza de date, care îl refuză
+    if not valori["is_active"]:
+        return None
+
+    if not _nemodificat_din(user_id, rev_la):
+        return None
+
+    user = User.from_db(
+        DEFAULT_DB_ALIAS, CAMPURI_PRINCIPAL, [valori[c] for c in CAMPURI_PRINCIPAL]
+    )
+    memoreaza_conectati(user, gospodarie)
+    return user
+
+
+class JWTAuthenticationCronometrat(JWTAuthentication):
+    """
+    JWTAuthentication, cu timpul măsurat ca faza „auth” a requestului
+    (Server-Timing, /api/admin/perf/). Userul vine din revendicările
+    tokenului când se poate, altfel din cache-ul scurt din proces.
+    """
+
+    def authenticate(self, request):
+        with faza("auth"):
+            return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        principal = principal_din_token(validated_token)
+        if principal is not None:
+            return principal
+
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            return super().get_user(validated_token)  # InvalidToken
+
+        user_id = _user_id(validated_token)
+        intrare = _useri.get(user_id)
+        # o schimbare făcută în alt worker nu golește _useri de aici: se
+        # verifică la fiecare folosire, ca revendicările
+        if (
+            intrare is not None
+            and intrare[0] > time.monotonic()
+            and _nemodificat_din(user_id, intrare[1])
+        ):
+            return copy.copy(intrare[2])
+
+        # momentul se ia înainte de citire, ca la adauga_revendicari
+        citit_la = time.time()
+        user = super().get_user(validated_token)
+        with _lock:
+            if len(_useri) >= MAX_USERI:
+                _useri.clear()
+            _useri[user_id] = (time.monotonic() + TTL_USER, citit_la, user)
+        return copy.copy(user)
@@ -0,0 +1,59 @@
+"""
+Verificări la pornire (manage.py check / runserver / migrate) pentru
+setările de care depind versiunile datelor.
+"""
+
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+from rest_framework.settings import api_settings
+
+
+# backenduri cu datele doar în procesul curent
+CACHE_LOCAL = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+def cache_local():
+    return settings.CACHES.get("default", {}).get("BACKEND") in CACHE_LOCAL
+
+
+@register(Tags.caches)
+def verifica_cache_versiuni(app_configs, **kwargs):
+    # versiunile (utils_versiuni) și bridge-urile stau în cache-ul implicit:
+    # într-un cache local, o scriere într-un worker nu se vede în celelalte,
+    # care răspund 304 / din cache cu date vechi
+    if not cache_local():
+        return []
+
+    return [
+        Error(
+            "Cache-ul implicit e local procesului: versiunile datelor nu se "
+            "văd între workeri.",
+            hint="Folosiți un backend comun (Redis, Memcached, fișiere) sau un "
+            "singur proces.",
+            id="finante.E001",
+        )
+    ]
+
+
+@register(Tags.caches, Tags.security)
+def verifica_cache_autentificare(app_configs, **kwargs):
+    # revendicările din token se invalidează prin cache-ul implicit: într-un
+    # cache local, alt worker acceptă gospodăria / flag-urile vechi până la
+    # expirarea tokenului
+    from .autentificare import JWTAuthenticationCronometrat
+
+    clase = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    if not cache_local() or JWTAuthenticationCronometrat not in clase:
+        return []
+
+    return [
+        Error(
+            "JWTAuthenticationCronometrat cu un cache implicit local procesului: "
+            "schimbările userilor nu invalidează tokenurile în ceilalți workeri.",
+            hint="Folosiți un backend de cache comun sau un singur proces.",
+            id="finante.E002",
+        )
+    ]
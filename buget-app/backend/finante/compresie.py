@@ -0,0 +1,85 @@
+"""
+Compresia răspunsurilor: brotli când e instalat și clientul îl acceptă,
+altfel gzip (GZipMiddleware din Django, cu octeții aleatori anti-BREACH),
+doar peste un prag de mărime. Setări în settings.FINANTE_COMPRESIE.
+"""
+
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+
+from .instrumentare import faza
+
+try:
+    import brotli
+except ImportError:  # fără brotli rămâne doar gzip
+    brotli = None
+
+
+SETARI_COMPRESIE = {
+    # sub prag, antetele și CPU-ul costă mai mult decât octeții câștigați
+    "PRAG_OCTETI": 1024,
+    "NIVEL_BROTLI": 5,  # 0–11; peste ~6 câștigul e mic și timpul mare
+}
+
+
+def setari_compresie():
+    return {**SETARI_COMPRESIE, **getattr(settings, "FINANTE_COMPRESIE", {})}
+
+
+def accepta(antet, codare):
+    """
+    Dacă `Accept-Encoding: antet` permite `codare` (q > 0, direct sau prin *).
+    """
+
+    acceptate = {}
+    for parte in antet.split(","):
+        nume, _, parametri = parte.partition(";")
+        q = 1.0
+        parametri = parametri.strip().replace(" ", "")
+        if parametri.startswith("q="):
+            try:
+                q = float(parametri[2:])
+            except ValueError:
+                q = 0.0
+        acceptate[nume.strip().lower()] = q
+
+    return acceptate.get(codare, acceptate.get("*", 0.0)) > 0
+
+
+class CompresieMiddleware(GZipMiddleware):
+    """
+    Se pune imediat după ProfilareMiddleware: comprimă răspunsul final,
+    iar timpul apare ca faza „compresie”. Răspunsurile în flux (export)
+    rămân pe gzip, care se poate scrie bucată cu bucată.
+    """
+
+    def process_response(self, request, response):
+        if response.has_header("Content-Encoding"):
+            return response
+
+        setari = setari_compresie()
+        if not response.streaming and len(response.content) < setari["PRAG_OCTETI"]:
+            return response
+
+        with faza("compresie"):
+            antet = request.META.get("HTTP_ACCEPT_ENCODING", "")
+            if brotli and not response.streaming and accepta(antet, "br"):
+                return self._brotli(response, setari["NIVEL_BROTLI"])
+            return super().process_response(request, response)
+
+    def _brotli(self, response, nivel):
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        comprimat = brotli.compress(response.content, quality=nivel)
+        if len(comprimat) >= len(response.content):
+            return response
+        response.content = comprimat
+        response.headers["Content-Length"] = str(len(comprimat))
+
+        # ETag slab, ca la gzip: conținutul diferă, resursa e aceeași
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = "br"
+        return response
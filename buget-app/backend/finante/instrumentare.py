@@ -0,0 +1,462 @@
+import logging
+import random
+import threading
+import time
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager, nullcontext
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+
+logger = logging.getLogger("finante.interogari")
+logger_profilare = logging.getLogger("finante.profilare")
+
+
+# contorul și profilul requestului curent, văzute și din alte fire (views_async)
+_contor_curent = ContextVar("contor_interogari", default=None)
+_profil_curent = ContextVar("profil", default=None)
+
+
+class ContorInterogari:
+    def __init__(self):
+        self.numar = 0
+        self.buget_extra = 0  # adăugat de părțile cu buget propriu (buget_parte)
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        with self._lock:
+            self.numar += 1
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def numara_interogari():
+    """
+    Numără interogările SQL executate în bloc (merge și cu DEBUG = False).
+    """
+
+    contor = ContorInterogari()
+    token = _contor_curent.set(contor)
+    try:
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(contor))
+            yield contor
+    finally:
+        _contor_curent.reset(token)
+
+
+@contextmanager
+def numara_in_fir():
+    """
+    Adaugă interogările firului curent la contorul (și profilul) requestului
+    care l-a pornit (contextul se copiază în fir). Fără request, nu face nimic.
+    """
+
+    wrappere = [_contor_curent.get()]
+    profil = _profil_curent.get()
+    if profil is not None:
+        wrappere.append(profil.sql)
+
+    with ExitStack() as stack:
+        for wrapper in filter(None, wrappere):
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(wrapper))
+        yield
+
+
+def buget_interogari(numar):
+    """
+    Declară câte interogări are voie să facă un endpoint (autentificarea inclusă).
+    Se pune deasupra lui @api_view; la ViewSet-uri se folosește atributul
+    `buget_interogari` al clasei (număr sau dict pe acțiune).
+    """
+
+    def decorator(view):
+        view.buget_interogari = numar
+        return view
+
+    return decorator
+
+
+@contextmanager
+def buget_parte(eticheta, numar):
+    """
+    Bugetul unei părți care se repetă într-un request de câte ori cer datele
+    primite (ex: un lot de import): interogările ei se verifică separat, iar
+    bugetul ei se adaugă la cel fix al endpointului (@buget_interogari).
+    """
+
+    cerere = _contor_curent.get()
+    if cerere is not None:
+        cerere.buget_extra += numar
+
+    with numara_interogari() as contor:
+        yield contor
+
+    if contor.numar > numar:
+        logger.warning("%s: %d interogări (buget %d)", eticheta, contor.numar, numar)
+
+
+def buget_pentru_view(view_func, method):
+    buget = getattr(view_func, "buget_interogari", None)
+    if buget is None:
+        # ViewSet / APIView: as_view() păstrează clasa în `cls`
+        buget = getattr(getattr(view_func, "cls", None), "buget_interogari", None)
+
+    # la ViewSet-uri bugetul poate fi pe acțiune: {"list": 3, "create": 6, ...}
+    if isinstance(buget, dict):
+        actiuni = getattr(view_func, "actions", None) or {}
+        buget = buget.get(actiuni.get(method.lower()))
+
+    return buget
+
+
+class NumarInterogariMiddleware:
+    """
+    Numără interogările fiecărui request, le pune în headerul X-Query-Count
+    și loghează un warning când endpointul își depășește bugetul declarat.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        with numara_interogari() as contor:
+            response = self.get_response(request)
+
+        return self._incheie(request, response, contor)
+
+    async def __acall__(self, request):
+        # sub ASGI: views_async numără și interogările din firele lor
+        with numara_interogari() as contor:
+            response = await self.get_response(request)
+
+        return self._incheie(request, response, contor)
+
+    def _incheie(self, request, response, contor):
+        response["X-Query-Count"] = str(contor.numar)
+
+        buget = getattr(request, "buget_interogari", None)
+        if buget is not None:
+            buget += contor.buget_extra
+        if buget is not None and contor.numar > buget:
+            logger.warning(
+                "%s %s: %d interogări (buget %d)",
+                request.method,
+                request.path,
+                contor.numar,
+                buget,
+            )
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.buget_interogari = buget_pentru_view(view_func, request.method)
+
+
+# ---------- profilare: fazele requestului, Server-Timing, histograme pe rută ----------
+
+
+SETARI_PROFILARE = {
+    "ESANTION": 0.1,  # fracțiunea de requesturi cu fazele măsurate
+    "SERVER_TIMING": True,  # headerul Server-Timing pe requesturile eșantionate
+    "PRAG_LENT_MS": 1000,  # peste atât, requestul se loghează (None = niciodată)
+    "FEREASTRA_S": 300,  # histogramele acoperă ultimele 1–2 ferestre
+    "MAX_RUTE": 200,  # rutele în plus se adună la „(altele)”
+    "LIMITE_MS": (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000),
+}
+
+
+def setari_profilare():
+    return {**SETARI_PROFILARE, **getattr(settings, "FINANTE_PROFILARE", {})}
+
+
+class Profil:
+    """
+    Timpii (ms) fazelor unui request. Sunt exclusivi: SQL-ul făcut în
+    timpul autentificării intră la `sql`, nu și la `auth`. Fiecare fir are
+    stiva lui de faze (views_async rulează query-uri în paralel).
+    """
+
+    def __init__(self):
+        self.inceput = time.perf_counter()
+        self.durate = defaultdict(float)
+        self.numar = defaultdict(int)
+        self._fire = {}  # id fir → [stiva de faze, momentul ultimei schimbări]
+        self._lock = threading.Lock()
+
+    def _comuta(self, stare, acum):
+        if stare[0]:
+            self.durate[stare[0][-1]] += (acum - stare[1]) * 1000
+        stare[1] = acum
+
+    @contextmanager
+    def faza(self, nume):
+        with self._lock:
+            acum = time.perf_counter()
+            stare = self._fire.setdefault(threading.get_ident(), [[], acum])
+            self._comuta(stare, acum)
+            stare[0].append(nume)
+            self.numar[nume] += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._comuta(stare, time.perf_counter())
+                stare[0].pop()
+
+    def sql(self, execute, sql, params, many, context):
+        with self.faza("sql"):
+            return execute(sql, params, many, context)
+
+    def total(self):
+        return (time.perf_counter() - self.inceput) * 1000
+
+    def faze(self, total):
+        # „app” = timpul din afara fazelor (logica view-ului, middleware-uri)
+        faze = dict(self.durate)
+        faze["app"] = max(0.0, total - sum(faze.values()))
+        return faze
+
+    def server_timing(self, total):
+        parti = []
+        for nume, ms in self.faze(total).items():
+            parte = f"{nume};dur={ms:.1f}"
+            if nume == "sql":
+                parte += f';desc="{self.numar[nume]} interogari"'
+            parti.append(parte)
+        parti.append(f"total;dur={total:.1f}")
+        return ", ".join(parti)
+
+
+def faza(nume):
+    """
+    Măsoară un bloc ca faza `nume` a requestului profilat curent (dacă e unul).
+    """
+
+    profil = _profil_curent.get()
+    return profil.faza(nume) if profil is not None else nullcontext()
+
+
+def cronometrat(nume):
+    """
+    Decorator: fiecare apel al funcției intră la faza `nume`.
+    """
+
+    def decorator(functie):
+        @wraps(functie)
+        def wrapper(*args, **kwargs):
+            with faza(nume):
+                return functie(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class Histograma:
+    def __init__(self, limite):
+        self.limite = limite
+        self.galeti = [0] * (len(limite) + 1)
+        self.numar = 0
+        self.suma = 0.0
+        self.max = 0.0
+        self.faze = defaultdict(float)  # suma pe faze, doar din eșantioane
+        self.esantioane = 0
+
+    def adauga(self, ms, faze=None):
+        i = 0
+        while i < len(self.limite) and ms > self.limite[i]:
+            i += 1
+        self.galeti[i] += 1
+        self.numar += 1
+        self.suma += ms
+        self.max = max(self.max, ms)
+
+        if faze:
+            self.esantioane += 1
+            for nume, durata in faze.items():
+                self.faze[nume] += durata
+
+    def uneste(self, alta):
+        for i, n in enumerate(alta.galeti):
+            self.galeti[i] += n
+        self.numar += alta.numar
+        self.suma += alta.suma
+        self.max = max(self.max, alta.max)
+        self.esantioane += alta.esantioane
+        for nume, durata in alta.faze.items():
+            self.faze[nume] += durata
+
+    def percentila(self, p):
+        # limita de sus a găleții în care cade rangul (dar nu peste max)
+        rang = p / 100 * self.numar
+        cumulat = 0
+        for i, n in enumerate(self.galeti):
+            cumulat += n
+            if n and cumulat >= rang:
+                limita = self.limite[i] if i < len(self.limite) else self.max
+                return round(min(limita, self.max), 2)
+        return round(self.max, 2)
+
+    def rezumat(self):
+        return {
+            "numar": self.numar,
+            "medie_ms": round(self.suma / self.numar, 2) if self.numar else None,
+            "p50_ms": self.percentila(50),
+            "p95_ms": self.percentila(95),
+            "p99_ms": self.percentila(99),
+            "max_ms": round(self.max, 2),
+            "total_ms": round(self.suma, 1),
+            "esantioane": self.esantioane,
+            "faze_medie_ms": {
+                nume: round(durata / self.esantioane, 2)
+                for nume, durata in sorted(self.faze.items())
+            },
+            "galeti": dict(
+                zip([*map(str, self.limite), "inf"], self.galeti, strict=True)
+            ),
+        }
+
+
+class HistogramePeRute:
+    """
+    Histograme de latență pe rută, în memoria procesului: fereastra curentă și
+    cea dinainte (deci ultimele FEREASTRA_S – 2×FEREASTRA_S secunde), cel mult
+    MAX_RUTE rute pe fereastră.
+    """
+
+    ALTELE = "(altele)"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.goleste()
+
+    def goleste(self):
+        with self._lock:
+            self._curente, self._anterioare = {}, {}
+            self._inceput = time.monotonic()
+
+    def adauga(self, ruta, ms, faze, setari):
+        with self._lock:
+            acum = time.monotonic()
+            if acum - self._inceput >= setari["FEREASTRA_S"]:
+                # o fereastră întreagă fără trafic → nimic de păstrat
+                vechi = acum - self._inceput < 2 * setari["FEREASTRA_S"]
+                self._anterioare = self._curente if vechi else {}
+                self._curente = {}
+                self._inceput = acum
+
+            if ruta not in self._curente and len(self._curente) >= setari["MAX_RUTE"]:
+                ruta = self.ALTELE
+            if ruta not in self._curente:
+                self._curente[ruta] = Histograma(tuple(setari["LIMITE_MS"]))
+            self._curente[ruta].adauga(ms, faze)
+
+    def instantaneu(self):
+        with self._lock:
+            rute = {}
+            for ferestre in (self._anterioare, self._curente):
+                for ruta, h in ferestre.items():
+                    if ruta not in rute:
+                        rute[ruta] = Histograma(h.limite)
+                    rute[ruta].uneste(h)
+
+        rezumate = [{"ruta": ruta, **h.rezumat()} for ruta, h in rute.items()]
+        # întâi rutele care consumă cel mai mult timp în total
+        return sorted(rezumate, key=lambda r: r["total_ms"], reverse=True)
+
+
+HISTOGRAME = HistogramePeRute()
+
+
+def _ruta(request):
+    match = getattr(request, "resolver_match", None)
+    return f"{request.method} /{match.route}" if match else f"{request.method} (404)"
+
+
+class ProfilareMiddleware:
+    """
+    Măsoară fiecare request: durata totală intră în histograma rutei; pentru
+    o fracțiune ESANTION (setarea FINANTE_PROFILARE) se măsoară și fazele
+    (auth, bridge, sql, randare, app) și se trimit în headerul Server-Timing.
+    Se pune primul în MIDDLEWARE.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.setari = setari_profilare()
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _profil(self):
+        return Profil() if random.random() < self.setari["ESANTION"] else None
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        inceput = time.perf_counter()
+        with self._profileaza(self._profil()) as profil:
+            response = self.get_response(request)
+
+        return self._incheie(request, response, inceput, profil)
+
+    async def __acall__(self, request):
+        inceput = time.perf_counter()
+        with self._profileaza(self._profil()) as profil:
+            response = await self.get_response(request)
+
+        return self._incheie(request, response, inceput, profil)
+
+    @contextmanager
+    def _profileaza(self, profil):
+        if profil is None:
+            yield None
+            return
+
+        token = _profil_curent.set(profil)
+        try:
+            with ExitStack() as stack:
+                for conn in connections.all():
+                    stack.enter_context(conn.execute_wrapper(profil.sql))
+                yield profil
+        finally:
+            _profil_curent.reset(token)
+
+    def _incheie(self, request, response, inceput, profil):
+        total = (time.perf_counter() - inceput) * 1000
+        faze = profil.faze(total) if profil else None
+
+        HISTOGRAME.adauga(_ruta(request), total, faze, self.setari)
+
+        if profil and self.setari["SERVER_TIMING"]:
+            response["Server-Timing"] = profil.server_timing(total)
+
+        prag = self.setari["PRAG_LENT_MS"]
+        if prag is not None and total > prag:
+            logger_profilare.warning(
+                "%s %s: %.0f ms %s",
+                request.method,
+                request.path,
+                total,
+                {nume: round(ms, 1) for nume, ms in faze.items()} if faze else "",
+            )
+
+        return response
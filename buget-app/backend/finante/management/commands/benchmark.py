@@ -0,0 +1,164 @@
+import json
+import re
+from random import Random
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from finante.autentificare import access_token_pentru
+from finante.utils_benchmark import SCENARII, Sesiune, curata, ruleaza_scenariu
+from finante.utils_sintetic import useri_sintetici
+
+
+class Command(BaseCommand):
+    help = (
+        "Rulează toate endpointurile din finante/urls.py cu clienți autentificați "
+        "concurenți, pe un server pornit separat, și raportează p50/p95/p99, "
+        "req/s și interogările SQL pe cerere. Trebuie să vadă aceeași bază de "
+        "date ca serverul (tokenurile și id-urile se iau de acolo). "
+        "Datele de test: `genereaza_date`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--baza", default="http://127.0.0.1:8000")
+        clienti = parser.add_mutually_exclusive_group()
+        clienti.add_argument(
+            "--clienti",
+            type=int,
+            default=20,
+            help="Câți useri sintetici (aleși cu --seed) fac cererile.",
+        )
+        clienti.add_argument(
+            "--user",
+            action="append",
+            dest="useri",
+            help="Username al unui client (se repetă), în loc de useri sintetici.",
+        )
+        parser.add_argument(
+            "--admin", help="Username de admin (fără el, rutele admin se sar)."
+        )
+        parser.add_argument("--cereri", type=int, default=200, help="Pe scenariu.")
+        parser.add_argument("--concurenta", type=int, default=20)
+        parser.add_argument("--incalzire", type=int, default=10)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--doar", help="Regex pe numele scenariilor.")
+        parser.add_argument(
+            "--fara-scrieri",
+            action="store_true",
+            dest="fara_scrieri",
+            help="Doar GET-uri (nu modifică datele).",
+        )
+        parser.add_argument("--eticheta", default="", help="Numele rulării.")
+        parser.add_argument("--json", help="Scrie rezultatele în acest fișier.")
+        parser.add_argument(
+            "--compara", help="Fișier JSON al unei rulări anterioare (diferențe p50/p99)."
+        )
+
+    def handle(self, *args, **options):
+        if options["cereri"] < 1 or options["concurenta"] < 1:
+            raise CommandError("--cereri și --concurenta trebuie să fie pozitive")
+
+        sesiune = Sesiune(
+            options["baza"], self._clienti(options), admin=self._admin(options)
+        )
+        anterior = self._anterior(options["compara"])
+
+        scenarii = [
+            s
+            for s in SCENARII
+            if not (options["fara_scrieri"] and s.scriere)
+            and (not options["doar"] or re.search(options["doar"], s.nume))
+        ]
+
+        rezultate = []
+        try:
+            for scenariu in scenarii:
+                r = ruleaza_scenariu(
+                    sesiune,
+                    scenariu,
+                    options["cereri"],
+                    options["concurenta"],
+                    options["incalzire"],
+                )
+                if r is None:
+                    self.stdout.write(f"{scenariu.nume:<52} sărit")
+                    continue
+
+                r["scenariu"] = scenariu.nume
+                rezultate.append(r)
+                self._afiseaza(r, anterior.get(scenariu.nume))
+        finally:
+            curata(sesiune)
+
+        if options["json"]:
+            with open(options["json"], "w") as f:
+                json.dump(
+                    {
+                        "eticheta": options["eticheta"],
+                        "data": timezone.now().isoformat(),
+                        "baza": options["baza"],
+                        "clienti": len(sesiune.clienti),
+                        "cereri": options["cereri"],
+                        "concurenta": options["concurenta"],
+                        "rezultate": rezultate,
+                    },
+                    f,
+                    indent=2,
+                )
+
+        erori = sum(r["erori"] for r in rezultate)
+        mesaj = f"{len(rezultate)} scenarii, {erori} erori."
+        self.stdout.write(self.style.ERROR(mesaj) if erori else self.style.SUCCESS(mesaj))
+
+    def _clienti(self, options):
+        if options["useri"]:
+            useri = list(User.objects.filter(username__in=options["useri"]))
+            if len(useri) != len(set(options["useri"])):
+                raise CommandError("Unii useri dați cu --user nu există")
+        else:
+            ids = list(useri_sintetici().order_by("id").values_list("id", flat=True))
+            if not ids:
+                raise CommandError("Nu există useri sintetici (genereaza_date)")
+            ids = Random(options["seed"]).sample(ids, min(options["clienti"], len(ids)))
+            useri = list(User.objects.filter(id__in=ids))
+
+        return [(u.id, access_token_pentru(u)) for u in useri]
+
+    def _admin(self, options):
+        if not options["admin"]:
+            return None
+        try:
+            admin = User.objects.get(username=options["admin"], is_staff=True)
+        except User.DoesNotExist:
+            raise CommandError(f"Adminul {options['admin']} nu există")
+        return access_token_pentru(admin)
+
+    def _anterior(self, fisier):
+        if not fisier:
+            return {}
+        with open(fisier) as f:
+            return {r["scenariu"]: r for r in json.load(f)["rezultate"]}
+
+    def _afiseaza(self, r, anterior):
+        linie = f"{r['scenariu']:<52}"
+        if "p50_ms" not in r:
+            self.stdout.write(
+                self.style.ERROR(f"{linie} eșuat: {r.get('exemplu_eroare')}")
+            )
+            return
+
+        linie += (
+            f" p50 {r['p50_ms']:>8.2f}  p95 {r['p95_ms']:>8.2f}"
+            f"  p99 {r['p99_ms']:>8.2f} ms  {r['rps']:>7.1f} req/s"
+            f"  {r.get('interogari_medie', '-'):>5} q"
+        )
+        if anterior and "p50_ms" in anterior:
+            linie += "  (p50 {:+.0%}, p99 {:+.0%})".format(
+                r["p50_ms"] / anterior["p50_ms"] - 1,
+                r["p99_ms"] / anterior["p99_ms"] - 1,
+            )
+        if r["erori"]:
+            linie += f"  erori: {r['erori']} ({r['exemplu_eroare']})"
+
+        self.stdout.write(self.style.WARNING(linie) if r["erori"] else linie)
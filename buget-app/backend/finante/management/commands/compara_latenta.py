@@ -0,0 +1,127 @@
+import json
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from finante.autentificare import access_token_pentru
+from finante.utils_benchmark import cerere, masoara, rezumat
+
+
+ENDPOINTURI = [
+    "buget/lunar/",
+    "grafice/luna/",
+    "venit/status/",
+    "economii/vacanta/",
+    "fonduri/",
+    "dashboard/",
+]
+
+
+def _tinta(valoare):
+    nume, sep, url = valoare.partition("=")
+    if not sep or not nume or not url.startswith(("http://", "https://")):
+        raise ValueError(valoare)
+    return nume, url.rstrip("/")
+
+
+class Command(BaseCommand):
+    help = (
+        "Compară latența (p50/p99) endpointurilor de citire sub încărcare "
+        "concurentă, pe mai multe deploymenturi pornite separat, ex: "
+        "`gunicorn backend.wsgi -w 4` și `uvicorn backend.asgi:application "
+        "--workers 4`. Pentru ASGI se măsoară și variantele /api/async/."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tinta",
+            type=_tinta,
+            action="append",
+            dest="tinte",
+            required=True,
+            help="nume=URL de bază, ex: wsgi=http://127.0.0.1:8000 (se repetă).",
+        )
+        parser.add_argument(
+            "--async",
+            action="append",
+            default=[],
+            dest="async_",
+            help="Numele țintelor ASGI: se măsoară și /api/async/... .",
+        )
+        autentificare = parser.add_mutually_exclusive_group(required=True)
+        autentificare.add_argument("--user", help="Username; tokenul se emite aici.")
+        autentificare.add_argument("--token", help="Access token JWT.")
+        parser.add_argument(
+            "--endpoint",
+            action="append",
+            dest="endpointuri",
+            help="Cale sub /api/ (se repetă; implicit toate cele de citire).",
+        )
+        parser.add_argument("--cereri", type=int, default=500)
+        parser.add_argument("--concurenta", type=int, default=20)
+        parser.add_argument("--incalzire", type=int, default=20)
+        parser.add_argument("--json", help="Scrie rezultatele și în acest fișier.")
+
+    def handle(self, *args, **options):
+        if options["cereri"] < 1 or options["concurenta"] < 1:
+            raise CommandError("--cereri și --concurenta trebuie să fie pozitive")
+
+        token = options["token"]
+        if not token:
+            try:
+                user = User.objects.get(username=options["user"])
+            except User.DoesNotExist:
+                raise CommandError(f"Userul {options['user']} nu există")
+            token = access_token_pentru(user)
+
+        tinte = dict(options["tinte"])
+        necunoscute = set(options["async_"]) - set(tinte)
+        if necunoscute:
+            raise CommandError(f"--async pentru ținte necunoscute: {necunoscute}")
+
+        rezultate = []
+        for endpoint in options["endpointuri"] or ENDPOINTURI:
+            for nume, baza in tinte.items():
+                variante = [("sync", f"{baza}/api/{endpoint}")]
+                if nume in options["async_"]:
+                    variante.append(("async", f"{baza}/api/async/{endpoint}"))
+
+                for varianta, url in variante:
+                    def una(_, url=url):
+                        return cerere(url, token)
+
+                    # conexiuni, cache-uri, planurile bazei de date
+                    masoara(una, options["incalzire"], options["concurenta"])
+
+                    r = rezumat(*masoara(una, options["cereri"], options["concurenta"]))
+                    r.update(
+                        {"tinta": nume, "varianta": varianta, "endpoint": endpoint}
+                    )
+                    rezultate.append(r)
+                    self._afiseaza(r)
+
+        if options["json"]:
+            with open(options["json"], "w") as f:
+                json.dump(
+                    {
+                        "cereri": options["cereri"],
+                        "concurenta": options["concurenta"],
+                        "rezultate": rezultate,
+                    },
+                    f,
+                    indent=2,
+                )
+
+    def _afiseaza(self, r):
+        linie = f"{r['tinta']:>8} {r['varianta']:<5} {r['endpoint']:<20}"
+        if "p50_ms" not in r:
+            self.stdout.write(self.style.ERROR(f"{linie} toate cererile au eșuat"))
+            return
+
+        linie += (
+            f" p50 {r['p50_ms']:>8.2f} ms  p99 {r['p99_ms']:>8.2f} ms"
+            f"  {r['rps']:>7.1f} req/s"
+        )
+        if r["erori"]:
+            linie += f"  erori: {r['erori']}"
+        self.stdout.write(linie)
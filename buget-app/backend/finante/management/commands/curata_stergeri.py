@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from finante.utils_sync import curata_stergeri, setari_sync
+
+
+class Command(BaseCommand):
+    help = (
+        "Scoate urmele rândurilor șterse mai vechi decât FINANTE_SYNC"
+        '["PASTRARE_ZILE"]. Se rulează periodic (ex: cron zilnic).'
+    )
+
+    def handle(self, *args, **options):
+        sterse = curata_stergeri()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{sterse} urme mai vechi de {setari_sync()['PASTRARE_ZILE']} "
+                "zile scoase."
+            )
+        )
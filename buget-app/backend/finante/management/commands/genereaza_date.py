@@ -0,0 +1,70 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from finante.utils_sintetic import (
+    PAROLA_IMPLICITA,
+    PREFIX_USER,
+    genereaza,
+    sterge_sintetice,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Generează date sintetice reproductibile pentru teste de încărcare "
+        f"(useri `{PREFIX_USER}NNNNNN`, parola implicită `{PAROLA_IMPLICITA}`). "
+        "Ex: `--useri 5000 --ani 6` ≈ 12 milioane de rânduri. "
+        "Nu se rulează pe baza de producție."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--useri", type=int, default=1000)
+        parser.add_argument("--ani", type=int, default=3, help="Ani de istoric.")
+        parser.add_argument(
+            "--gospodarii",
+            type=float,
+            default=0.6,
+            help="Fracțiunea de useri grupați în perechi (bridge acceptat).",
+        )
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--parola", default=PAROLA_IMPLICITA)
+        parser.add_argument(
+            "--sterge",
+            action="store_true",
+            help="Șterge întâi userii sintetici existenți (și datele lor).",
+        )
+
+    def handle(self, *args, **options):
+        if options["useri"] < 1 or options["ani"] < 1:
+            raise CommandError("--useri și --ani trebuie să fie pozitive")
+        if not 0 <= options["gospodarii"] <= 1:
+            raise CommandError("--gospodarii trebuie să fie între 0 și 1")
+
+        if options["sterge"]:
+            self.stdout.write(f"Șterși {sterge_sintetice()} useri sintetici.")
+
+        def progres(useri):
+            if options["verbosity"] > 1:
+                self.stdout.write(f"{useri} / {options['useri']} useri")
+
+        inceput = time.monotonic()
+        try:
+            scrise = genereaza(
+                useri=options["useri"],
+                ani=options["ani"],
+                gospodarii=options["gospodarii"],
+                seed=options["seed"],
+                parola=options["parola"],
+                progres=progres,
+            )
+        except ValueError as e:
+            raise CommandError(f"{e} (--sterge)")
+
+        for model, randuri in sorted(scrise.items()):
+            self.stdout.write(f"{model:<20} {randuri:>10}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{sum(scrise.values())} rânduri în {time.monotonic() - inceput:.1f} s."
+            )
+        )
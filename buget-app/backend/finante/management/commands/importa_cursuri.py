@@ -0,0 +1,77 @@
+import json
+from datetime import date, timedelta
+from decimal import Decimal
+from urllib.request import urlopen
+
+from django.core.management.base import BaseCommand, CommandError
+
+from finante.models import CursValutar, Moneda
+from finante.utils_curs import goleste_cache_cursuri
+from finante.utils_versiuni import creste_versiune_cursuri
+
+
+URL_CURSURI = "https://api.frankfurter.app/{de_la}..{pana_la}?from={moneda}&to={baza}"
+
+
+class Command(BaseCommand):
+    help = "Descarcă cursurile zilnice (BCE, prin frankfurter.app) în CursValutar."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--de-la", type=date.fromisoformat, dest="de_la")
+        parser.add_argument("--pana-la", type=date.fromisoformat, dest="pana_la")
+        parser.add_argument("--moneda", choices=Moneda.values, default=Moneda.RON)
+        parser.add_argument("--baza", choices=Moneda.values, default=Moneda.EUR)
+
+    def handle(self, *args, **options):
+        moneda, baza = options["moneda"], options["baza"]
+        if moneda == baza:
+            raise CommandError("Moneda și baza trebuie să difere")
+
+        pana_la = options["pana_la"] or date.today()
+        de_la = options["de_la"]
+        if de_la is None:
+            # continuăm de unde am rămas
+            ultima = (
+                CursValutar.objects.filter(moneda=moneda, moneda_baza=baza)
+                .order_by("-data")
+                .values_list("data", flat=True)
+                .first()
+            )
+            de_la = ultima + timedelta(days=1) if ultima else pana_la - timedelta(days=365)
+
+        if de_la > pana_la:
+            self.stdout.write("Cursurile sunt deja la zi.")
+            return
+
+        url = URL_CURSURI.format(de_la=de_la, pana_la=pana_la, moneda=moneda, baza=baza)
+        try:
+            with urlopen(url, timeout=30) as raspuns:
+                rate = json.load(raspuns)["rates"]
+        except (OSError, ValueError, KeyError) as e:
+            raise CommandError(f"Nu am putut descărca cursurile: {e}")
+
+        cursuri = []
+        for zi, valori in rate.items():
+            curs = Decimal(str(valori[baza]))
+            zi = date.fromisoformat(zi)
+            # păstrăm și perechea inversă, ca să putem converti în ambele sensuri
+            cursuri.append(CursValutar(data=zi, moneda=moneda, moneda_baza=baza, curs=curs))
+            cursuri.append(
+                CursValutar(
+                    data=zi,
+                    moneda=baza,
+                    moneda_baza=moneda,
+                    curs=(1 / curs).quantize(Decimal("0.000001")),
+                )
+            )
+
+        CursValutar.objects.bulk_create(
+            cursuri,
+            update_conflicts=True,
+            unique_fields=["moneda", "moneda_baza", "data"],
+            update_fields=["curs"],
+        )
+        goleste_cache_cursuri()  # bulk_create nu trimite signals
+        creste_versiune_cursuri()
+
+        self.stdout.write(self.style.SUCCESS(f"Salvate cursurile pentru {len(rate)} zile."))
@@ -0,0 +1,40 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from finante.models import Moneda
+from finante.utils_import import importa_extras, format_din_nume
+
+
+class Command(BaseCommand):
+    help = "Importă un extras de cont (CSV sau OFX) ca venituri și cheltuieli variabile."
+
+    def add_arguments(self, parser):
+        parser.add_argument("fisier")
+        parser.add_argument("--user", required=True, help="username-ul proprietarului")
+        parser.add_argument("--format", choices=["csv", "ofx"])
+        parser.add_argument("--moneda", choices=Moneda.values, default=Moneda.EUR)
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options["user"])
+        except User.DoesNotExist:
+            raise CommandError(f"Userul {options['user']!r} nu există")
+
+        format_ = options["format"] or format_din_nume(options["fisier"])
+
+        try:
+            with open(options["fisier"], "rb") as fisier:
+                rezultat = importa_extras(fisier, user, format_, options["moneda"])
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        for eroare in rezultat["erori"]:
+            self.stderr.write(f"rândul {eroare['rand']}: {eroare['eroare']}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Importate {rezultat['venituri']} venituri și "
+                f"{rezultat['cheltuieli']} cheltuieli "
+                f"({rezultat['erori_total']} rânduri cu erori)."
+            )
+        )
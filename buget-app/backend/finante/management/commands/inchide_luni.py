@@ -0,0 +1,94 @@
+import os
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+
+from finante.utils_economii import (
+    MARIME_BUCATA,
+    inchide_luni_toti,
+    ultima_luna_incheiata,
+)
+
+
+def _luna(valoare):
+    if not re.fullmatch(r"\d{4}-(0[1-9]|1[0-2])", valoare):
+        raise ValueError(valoare)
+    return valoare
+
+
+class Command(BaseCommand):
+    help = (
+        "Închide lunile bugetare încheiate: scrie EconomieLunara pentru toți "
+        "userii (upsert în bloc). Se programează lunar, după 25 (ex: cron "
+        "`inchide_luni --de-la <luna trecută>`); fără --de-la reface tot istoricul."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--de-la", type=_luna, dest="de_la", help="AAAA-LL")
+        parser.add_argument(
+            "--pana-la",
+            type=_luna,
+            dest="pana_la",
+            help="AAAA-LL (implicit ultima lună încheiată)",
+        )
+        parser.add_argument(
+            "--user",
+            type=int,
+            action="append",
+            dest="user_ids",
+            help="Limitează la userul dat (se poate repeta).",
+        )
+        parser.add_argument(
+            "--procese",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Procese în paralel (implicit câte nuclee are mașina).",
+        )
+        parser.add_argument(
+            "--marime-bucata",
+            type=int,
+            default=MARIME_BUCATA,
+            dest="marime",
+            help="Useri pe bucată de lucru.",
+        )
+
+    def handle(self, *args, **options):
+        pana_la = options["pana_la"] or ultima_luna_incheiata()
+        de_la = options["de_la"]
+
+        if pana_la > ultima_luna_incheiata():
+            raise CommandError(f"Luna {pana_la} nu s-a încheiat încă")
+        if de_la and de_la > pana_la:
+            raise CommandError("--de-la trebuie să fie înainte de --pana-la")
+        if options["marime"] < 1:
+            raise CommandError("--marime-bucata trebuie să fie pozitivă")
+
+        total = 0
+        sarite = {}
+        for bucata, (randuri, fara_curs) in enumerate(
+            inchide_luni_toti(
+                options["user_ids"],
+                de_la,
+                pana_la,
+                procese=options["procese"],
+                marime=options["marime"],
+            ),
+            start=1,
+        ):
+            total += randuri
+            sarite.update(fara_curs)
+            if options["verbosity"] > 1:
+                self.stdout.write(f"bucata {bucata}: {randuri} rânduri")
+
+        if options["verbosity"] > 0:
+            self.stdout.write(
+                self.style.SUCCESS(f"Luni închise până la {pana_la}: {total} rânduri.")
+            )
+
+        # lunile cu rânduri fără curs nu s-au scris: se reiau după importa_cursuri
+        for (user_id, luna), numar in sorted(sarite.items()):
+            self.stderr.write(f"user {user_id}, {luna}: {numar} rânduri fără curs")
+        if sarite:
+            raise CommandError(
+                f"{len(sarite)} luni sărite din lipsă de curs (rulați importa_cursuri)"
+            )
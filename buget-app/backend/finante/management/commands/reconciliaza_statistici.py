@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from finante.utils_statistici import diferente_statistici, reconciliaza_statistici
+
+
+class Command(BaseCommand):
+    help = (
+        "Reface (sau doar verifică) statisticile globale din tabelele brute. "
+        "Se rulează periodic (ex: cron zilnic), și pentru userii activi."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verifica",
+            action="store_true",
+            help="Doar compară statisticile cu tabelele brute, fără să scrie nimic.",
+        )
+
+    def handle(self, *args, **options):
+        if options["verifica"]:
+            diferente = diferente_statistici()
+
+            for cheie, stocat, calculat in diferente:
+                self.stdout.write(f"{cheie}: stocat {stocat} ≠ calculat {calculat}")
+
+            if diferente:
+                raise CommandError(f"{len(diferente)} diferențe în statistici")
+
+            self.stdout.write(self.style.SUCCESS("Statisticile sunt corecte."))
+            return
+
+        randuri = reconciliaza_statistici()
+        self.stdout.write(
+            self.style.SUCCESS(f"Statistici refăcute: {randuri} rânduri zilnice.")
+        )
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from finante.utils_rezumat import diferente_rezumat, reconstruieste_rezumat
+
+
+class Command(BaseCommand):
+    help = "Reface (sau doar verifică) rezumatul lunar din tabelele brute."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verifica",
+            action="store_true",
+            help="Doar compară rezumatul cu tabelele brute, fără să scrie nimic.",
+        )
+        parser.add_argument(
+            "--user",
+            type=int,
+            action="append",
+            dest="user_ids",
+            help="Limitează la userul dat (se poate repeta).",
+        )
+
+    def handle(self, *args, **options):
+        user_ids = options["user_ids"]
+
+        if options["verifica"]:
+            diferente = diferente_rezumat(user_ids)
+
+            for cheie, stocat, calculat in diferente:
+                self.stdout.write(f"{cheie}: stocat {stocat} ≠ calculat {calculat}")
+
+            if diferente:
+                raise CommandError(f"{len(diferente)} diferențe în rezumat")
+
+            self.stdout.write(self.style.SUCCESS("Rezumatul este corect."))
+            return
+
+        randuri = reconstruieste_rezumat(user_ids)
+        self.stdout.write(self.style.SUCCESS(f"Rezumat refăcut: {randuri} rânduri."))
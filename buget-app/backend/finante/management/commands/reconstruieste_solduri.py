@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from finante.utils_solduri import diferente_solduri, reconstruieste_solduri
+
+
+class Command(BaseCommand):
+    help = "Reface (sau doar verifică) soldurile pe rubrici din mișcările de fond."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verifica",
+            action="store_true",
+            help="Doar compară soldurile cu mișcările, fără să scrie nimic.",
+        )
+        parser.add_argument(
+            "--user",
+            type=int,
+            action="append",
+            dest="user_ids",
+            help="Limitează la userul dat (se poate repeta).",
+        )
+
+    def handle(self, *args, **options):
+        user_ids = options["user_ids"]
+
+        if options["verifica"]:
+            diferente = diferente_solduri(user_ids)
+
+            for cheie, stocat, calculat in diferente:
+                self.stdout.write(f"{cheie}: stocat {stocat} ≠ calculat {calculat}")
+
+            if diferente:
+                raise CommandError(f"{len(diferente)} diferențe în solduri")
+
+            self.stdout.write(self.style.SUCCESS("Soldurile sunt corecte."))
+            return
+
+        randuri = reconstruieste_solduri(user_ids)
+        self.stdout.write(self.style.SUCCESS(f"Solduri refăcute: {randuri} rânduri."))
@@ -0,0 +1,83 @@
+# Generated by Django 6.0.2 on 2026-10-18 12:45
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+from finante.utils import cheie_luna_bugetara
+
+
+def umple_rezumat(apps, schema_editor):
+    RezumatLunar = apps.get_model("finante", "RezumatLunar")
+
+    surse = [
+        ("Venit", "venit", False),
+        ("CheltuialaFixa", "fixa", False),
+        ("CheltuialaVariabila", "variabila", True),
+    ]
+
+    totaluri = {}
+    for nume, tip, cu_categorie in surse:
+        campuri = ["user_id", "data", "moneda"] + (["categorie"] if cu_categorie else [])
+        randuri = (
+            apps.get_model("finante", nume)
+            .objects.values(*campuri)
+            .annotate(suma=Sum("suma"), cate=Count("id"))
+            .order_by()
+        )
+        for r in randuri.iterator():
+            cheie = (
+                r["user_id"],
+                cheie_luna_bugetara(r["data"]),
+                r["moneda"],
+                tip,
+                r.get("categorie", ""),
+            )
+            total, numar = totaluri.get(cheie, (0, 0))
+            totaluri[cheie] = (total + r["suma"], numar + r["cate"])
+
+    RezumatLunar.objects.bulk_create(
+        [
+            RezumatLunar(
+                user_id=user_id,
+                luna=luna,
+                moneda=moneda,
+                tip=tip,
+                categorie=categorie,
+                total=total,
+                numar=numar,
+            )
+            for (user_id, luna, moneda, tip, categorie), (total, numar) in totaluri.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finante', '0002_miscarefond_rubrica'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RezumatLunar',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('luna', models.CharField(max_length=7)),
+                ('moneda', models.CharField(choices=[('EUR', 'Euro'), ('RON', 'Lei')], max_length=3)),
+                ('tip', models.CharField(choices=[('venit', 'Venit'), ('fixa', 'Cheltuială fixă'), ('variabila', 'Cheltuială variabilă')], max_length=10)),
+                ('categorie', models.CharField(blank=True, default='', max_length=20)),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('numar', models.PositiveIntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rezumate_lunare', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['luna'],
+                'unique_together': {('user', 'luna', 'moneda', 'tip', 'categorie')},
+            },
+        ),
+        migrations.RunPython(umple_rezumat, migrations.RunPython.noop),
+    ]
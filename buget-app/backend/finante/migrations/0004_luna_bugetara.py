@@ -0,0 +1,48 @@
+# Generated by Django 6.0.2 on 2026-10-18 13:10
+
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.db.models import Max, Min
+
+from finante.utils import cheie_luna_bugetara, get_luna_bugetara
+
+
+MODELE = ["Venit", "CheltuialaFixa", "CheltuialaVariabila", "EconomieVacanta", "MiscareFond"]
+
+
+def umple_luna_bugetara(apps, schema_editor):
+    # un UPDATE pe fiecare lună bugetară, nu unul pe rând
+    for nume in MODELE:
+        model = apps.get_model("finante", nume)
+        limite = model.objects.aggregate(prima=Min("data"), ultima=Max("data"))
+        if limite["prima"] is None:
+            continue
+
+        start, end = get_luna_bugetara(limite["prima"])
+        while start <= limite["ultima"]:
+            model.objects.filter(data__range=(start, end)).update(
+                luna_bugetara=cheie_luna_bugetara(start)
+            )
+            start, end = get_luna_bugetara(end + timedelta(days=1))
+
+
+def adauga_camp(nume):
+    return migrations.AddField(
+        model_name=nume.lower(),
+        name="luna_bugetara",
+        field=models.CharField(db_index=True, default="", editable=False, max_length=7),
+        preserve_default=False,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finante', '0003_rezumatlunar'),
+    ]
+
+    operations = [
+        *[adauga_camp(nume) for nume in MODELE],
+        migrations.RunPython(umple_luna_bugetara, migrations.RunPython.noop),
+    ]
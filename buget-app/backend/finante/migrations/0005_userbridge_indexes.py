@@ -0,0 +1,23 @@
+# Generated by Django 6.0.2 on 2026-10-18 12:50
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finante', '0004_luna_bugetara'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userbridge',
+            index=models.Index(fields=['accepted', 'from_user'], name='bridge_accepted_from_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userbridge',
+            index=models.Index(fields=['accepted', 'to_user'], name='bridge_accepted_to_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 6.0.2 on 2026-10-18 12:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finante', '0005_userbridge_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cheltuialafixa',
+            index=models.Index(fields=['user', 'data'], include=('suma',), name='fixa_user_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cheltuialavariabila',
+            index=models.Index(fields=['user', 'data'], include=('suma',), name='variabila_user_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cheltuialavariabila',
+            index=models.Index(fields=['user', 'categorie', 'data'], include=('suma',), name='variabila_user_categ_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='miscarefond',
+            index=models.Index(fields=['user', 'data'], include=('suma_eur', 'suma_ron'), name='miscare_user_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='venit',
+            index=models.Index(fields=['user', 'data'], include=('suma',), name='venit_user_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='venit',
+            index=models.Index(fields=['user', 'luna_bugetara'], include=('suma',), name='venit_user_luna_idx'),
+        ),
+    ]
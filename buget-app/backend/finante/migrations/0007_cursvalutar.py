@@ -0,0 +1,27 @@
+# Generated by Django 6.0.2 on 2026-10-18 12:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finante', '0006_indexuri_tranzactii'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CursValutar',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('data', models.DateField()),
+                ('moneda', models.CharField(choices=[('EUR', 'Euro'), ('RON', 'Lei')], max_length=3)),
+                ('moneda_baza', models.CharField(choices=[('EUR', 'Euro'), ('RON', 'Lei')], max_length=3)),
+                ('curs', models.DecimalField(decimal_places=6, max_digits=12)),
+            ],
+            options={
+                'ordering': ['-data'],
+                'unique_together': {('moneda', 'moneda_baza', 'data')},
+            },
+        ),
+    ]
@@ -0,0 +1,97 @@
+# Generated by Django 6.0.2 on 2026-10-18 13:00
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def umple_statistici(apps, schema_editor):
+    # userii activi se numără la prima rulare a `reconciliaza_statistici`
+    StatisticaGlobala = apps.get_model("finante", "StatisticaGlobala")
+    StatisticaZilnica = apps.get_model("finante", "StatisticaZilnica")
+
+    zilnice = {}
+    for nume, tip in [
+        ("Venit", "venit"),
+        ("CheltuialaFixa", "fixa"),
+        ("CheltuialaVariabila", "variabila"),
+    ]:
+        randuri = (
+            apps.get_model("finante", nume)
+            .objects.annotate(zi=TruncDate("created_at"))
+            .values("zi", "moneda")
+            .annotate(suma=Sum("suma"), cate=Count("id"))
+            .order_by()
+        )
+        for r in randuri.iterator():
+            zilnice[(r["zi"], tip, r["moneda"])] = (r["suma"], r["cate"])
+
+    useri = (
+        apps.get_model(*settings.AUTH_USER_MODEL.split("."))
+        .objects.annotate(zi=TruncDate("date_joined"))
+        .values("zi")
+        .annotate(cate=Count("id"))
+        .order_by()
+    )
+    for r in useri.iterator():
+        zilnice[(r["zi"], "useri", "")] = (0, r["cate"])
+
+    globale = {}
+    for (_, tip, moneda), (total, numar) in zilnice.items():
+        t, n = globale.get((tip, moneda), (0, 0))
+        globale[(tip, moneda)] = (t + total, n + numar)
+
+    StatisticaZilnica.objects.bulk_create(
+        [
+            StatisticaZilnica(zi=zi, tip=tip, moneda=moneda, total=total, numar=numar)
+            for (zi, tip, moneda), (total, numar) in zilnice.items()
+        ],
+        batch_size=1000,
+    )
+    StatisticaGlobala.objects.bulk_create(
+        [
+            StatisticaGlobala(tip=tip, moneda=moneda, total=total, numar=numar)
+            for (tip, moneda), (total, numar) in globale.items()
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finante', '0007_cursvalutar'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatisticaGlobala',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tip', models.CharField(choices=[('useri', 'Useri înscriși'), ('useri_activi', 'Useri activi (30 zile)'), ('venit', 'Venit'), ('fixa', 'Cheltuială fixă'), ('variabila', 'Cheltuială variabilă')], max_length=12)),
+                ('moneda', models.CharField(blank=True, default='', max_length=3)),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('numar', models.IntegerField(default=0)),
+            ],
+            options={
+                'unique_together': {('tip', 'moneda')},
+            },
+        ),
+        migrations.CreateModel(
+            name='StatisticaZilnica',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('zi', models.DateField()),
+                ('tip', models.CharField(choices=[('useri', 'Useri înscriși'), ('useri_activi', 'Useri activi (30 zile)'), ('venit', 'Venit'), ('fixa', 'Cheltuială fixă'), ('variabila', 'Cheltuială variabilă')], max_length=12)),
+                ('moneda', models.CharField(blank=True, default='', max_length=3)),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('numar', models.IntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['zi'],
+                'unique_together': {('zi', 'tip', 'moneda')},
+            },
+        ),
+        migrations.RunPython(umple_statistici, migrations.RunPython.noop),
+    ]
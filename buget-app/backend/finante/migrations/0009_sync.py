@@ -0,0 +1,65 @@
+# Generated by Django 6.0.2 on 2026-10-18 13:36
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finante', '0008_statistici'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Stergere',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=30)),
+                ('obiect_id', models.BigIntegerField()),
+                ('sters_la', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='economievacanta',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='miscarefond',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='cheltuialafixa',
+            index=models.Index(fields=['user', 'updated_at'], name='fixa_user_upd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cheltuialavariabila',
+            index=models.Index(fields=['user', 'updated_at'], name='variabila_user_upd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='economievacanta',
+            index=models.Index(fields=['user', 'updated_at'], name='vacanta_user_upd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='miscarefond',
+            index=models.Index(fields=['user', 'updated_at'], name='miscare_user_upd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='venit',
+            index=models.Index(fields=['user', 'updated_at'], name='venit_user_upd_idx'),
+        ),
+        migrations.AddField(
+            model_name='stergere',
+            name='user',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='stergere',
+            index=models.Index(fields=['user', 'sters_la'], name='stergere_user_la_idx'),
+        ),
+    ]
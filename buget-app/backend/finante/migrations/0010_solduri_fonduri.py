@@ -0,0 +1,58 @@
+# Generated by Django 6.0.2 on 2026-10-18 13:43
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def umple_solduri(apps, schema_editor):
+    MiscareFond = apps.get_model("finante", "MiscareFond")
+    SoldFond = apps.get_model("finante", "SoldFond")
+
+    solduri = []
+    for moneda, coloana in [("EUR", "suma_eur"), ("RON", "suma_ron")]:
+        randuri = (
+            MiscareFond.objects.filter(**{f"{coloana}__isnull": False})
+            .values("user_id", "rubrica")
+            .annotate(total=Sum(coloana), numar=Count("id"))
+            .order_by()
+        )
+        solduri += [
+            SoldFond(
+                user_id=r["user_id"],
+                rubrica=r["rubrica"],
+                moneda=moneda,
+                total=r["total"],
+                numar=r["numar"],
+            )
+            for r in randuri.iterator()
+        ]
+
+    SoldFond.objects.bulk_create(solduri, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finante', '0009_sync'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SoldFond',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rubrica', models.CharField(choices=[('fond_urgenta', 'Fond de urgență'), ('trading212', 'Investiții - Trading212'), ('xtb', 'Investiții - XTB'), ('revolut', 'Investiții - Revolut'), ('tradeville', 'Investiții - Tradeville'), ('cont_economii', 'Cont de economii'), ('alte_investitii', 'Alte investiții')], max_length=30)),
+                ('moneda', models.CharField(choices=[('EUR', 'Euro'), ('RON', 'Lei')], max_length=3)),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('numar', models.PositiveIntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='solduri_fonduri', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'rubrica', 'moneda')},
+            },
+        ),
+        migrations.RunPython(umple_solduri, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 6.0.2 on 2026-10-18 13:56
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+
+
+FELII = 8  # utils_statistici.FELII la momentul migrației
+
+
+def imparte_pe_felii(apps, schema_editor):
+    # seria zilnică refăcută pe felii (user_id % FELII), ca scăderile
+    # ulterioare să nimerească rândul userului; totalurile globale se adună
+    # acum din serie, deci din StatisticaGlobala rămân doar userii activi
+    StatisticaGlobala = apps.get_model("finante", "StatisticaGlobala")
+    StatisticaZilnica = apps.get_model("finante", "StatisticaZilnica")
+
+    zilnice = []
+    for nume, tip in [
+        ("Venit", "venit"),
+        ("CheltuialaFixa", "fixa"),
+        ("CheltuialaVariabila", "variabila"),
+    ]:
+        randuri = (
+            apps.get_model("finante", nume)
+            .objects.annotate(zi=TruncDate("created_at"), felie=F("user_id") % FELII)
+            .values("zi", "moneda", "felie")
+            .annotate(suma=Sum("suma"), cate=Count("id"))
+            .order_by()
+        )
+        zilnice += [
+            StatisticaZilnica(
+                zi=r["zi"],
+                tip=tip,
+                moneda=r["moneda"],
+                felie=r["felie"],
+                total=r["suma"],
+                numar=r["cate"],
+            )
+            for r in randuri.iterator()
+        ]
+
+    useri = (
+        apps.get_model(*settings.AUTH_USER_MODEL.split("."))
+        .objects.annotate(zi=TruncDate("date_joined"), felie=F("id") % FELII)
+        .values("zi", "felie")
+        .annotate(cate=Count("id"))
+        .order_by()
+    )
+    zilnice += [
+        StatisticaZilnica(zi=r["zi"], tip="useri", felie=r["felie"], numar=r["cate"])
+        for r in useri.iterator()
+    ]
+
+    StatisticaZilnica.objects.all().delete()
+    StatisticaZilnica.objects.bulk_create(zilnice, batch_size=1000)
+    StatisticaGlobala.objects.exclude(tip="useri_activi").delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finante', '0010_solduri_fonduri'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='statisticazilnica',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='statisticazilnica',
+            name='felie',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AlterUniqueTogether(
+            name='statisticazilnica',
+            unique_together={('zi', 'tip', 'moneda', 'felie')},
+        ),
+        migrations.RunPython(imparte_pe_felii, migrations.RunPython.noop),
+    ]
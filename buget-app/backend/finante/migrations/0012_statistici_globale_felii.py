@@ -0,0 +1,55 @@
+# Generated by Django 6.0.2 on 2026-10-18 15:20
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def umple_totaluri(apps, schema_editor):
+    # totalurile platformei, pe felii, adunate o dată din seria zilnică;
+    # de aici înainte le ține la zi signals.py
+    StatisticaGlobala = apps.get_model("finante", "StatisticaGlobala")
+    StatisticaZilnica = apps.get_model("finante", "StatisticaZilnica")
+
+    randuri = (
+        StatisticaZilnica.objects.values("tip", "moneda", "felie")
+        .annotate(suma=Sum("total"), cate=Sum("numar"))
+        .order_by()
+    )
+    StatisticaGlobala.objects.exclude(tip="useri_activi").delete()
+    StatisticaGlobala.objects.bulk_create(
+        [
+            StatisticaGlobala(
+                tip=r["tip"],
+                moneda=r["moneda"],
+                felie=r["felie"],
+                total=r["suma"],
+                numar=r["cate"],
+            )
+            for r in randuri.iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finante', '0011_statistici_felii'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='statisticaglobala',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='statisticaglobala',
+            name='felie',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AlterUniqueTogether(
+            name='statisticaglobala',
+            unique_together={('tip', 'moneda', 'felie')},
+        ),
+        migrations.RunPython(umple_totaluri, migrations.RunPython.noop),
+    ]
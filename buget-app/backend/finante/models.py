@@ -1,8 +1,12 @@
+from datetime import date
+
 from django.db import models
 from django.contrib.auth.models import User
 from django.utils.timezone import now
 from django.utils import timezone
 
+from .utils import cheie_luna_bugetara
+
 
 class Moneda(models.TextChoices):
     EUR = "EUR", "Euro"
@@ -29,7 +33,47 @@ class TipVacanta(models.TextChoices):
     CHELTUIELI = "cheltuieli", "Cheltuieli"
 
 
-class Venit(models.Model):
+class TipRezumat(models.TextChoices):
+    VENIT = "venit", "Venit"
+    FIXA = "fixa", "Cheltuială fixă"
+    VARIABILA = "variabila", "Cheltuială variabilă"
+
+
+class TipStatistica(models.TextChoices):
+    USERI = "useri", "Useri înscriși"
+    USERI_ACTIVI = "useri_activi", "Useri activi (30 zile)"
+    VENIT = "venit", "Venit"
+    FIXA = "fixa", "Cheltuială fixă"
+    VARIABILA = "variabila", "Cheltuială variabilă"
+
+
+class CuLunaBugetara(models.Model):
+    """
+    Stochează luna bugetară (26 → 25) a rândului, derivată din `data` la salvare,
+    ca agregările pe luni să se poată grupa direct în SQL.
+    """
+
+    luna_bugetara = models.CharField(max_length=7, db_index=True, editable=False)  # ex: 2026-02
+
+    class Meta:
+        abstract = True
+
+    def seteaza_luna_bugetara(self):
+        # `data` e None la primul save pentru câmpurile auto_now_add;
+        # bulk_create nu trece prin save(), deci acolo se apelează explicit
+        self.luna_bugetara = cheie_luna_bugetara(self.data or date.today())
+
+    def save(self, *args, **kwargs):
+        self.seteaza_luna_bugetara()
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "data" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "luna_bugetara"}
+
+        super().save(*args, **kwargs)
+
+
+class Venit(CuLunaBugetara):
     user = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -44,12 +88,20 @@ class Venit(models.Model):
 
     class Meta:
         ordering = ["-created_at"]  # 👈 cheia problemei
+        # INCLUDE (suma) → index-only scan pentru sumele pe perioadă (doar PostgreSQL)
+        indexes = [
+            models.Index(fields=["user", "data"], include=["suma"], name="venit_user_data_idx"),
+            models.Index(
+                fields=["user", "luna_bugetara"], include=["suma"], name="venit_user_luna_idx"
+            ),
+            models.Index(fields=["user", "updated_at"], name="venit_user_upd_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user.username} | {self.suma} {self.moneda}"
 
 
-class CheltuialaFixa(models.Model):
+class CheltuialaFixa(CuLunaBugetara):
     user = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -65,12 +117,16 @@ class CheltuialaFixa(models.Model):
 
     class Meta:
         ordering = ["-data"]  # 👈 ordonăm după data aleasă, nu după momentul adăugării
+        indexes = [
+            models.Index(fields=["user", "data"], include=["suma"], name="fixa_user_data_idx"),
+            models.Index(fields=["user", "updated_at"], name="fixa_user_upd_idx"),
+        ]
 
     def __str__(self):
         return f"{self.descriere} | {self.suma} {self.moneda}"
 
 
-class CheltuialaVariabila(models.Model):
+class CheltuialaVariabila(CuLunaBugetara):
     user = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -89,12 +145,23 @@ class CheltuialaVariabila(models.Model):
 
     class Meta:
         ordering = ["-data"]  # 👈 ordonăm după data aleasă, nu după momentul adăugării
+        indexes = [
+            models.Index(
+                fields=["user", "data"], include=["suma"], name="variabila_user_data_idx"
+            ),
+            models.Index(
+                fields=["user", "categorie", "data"],
+                include=["suma"],
+                name="variabila_user_categ_idx",
+            ),
+            models.Index(fields=["user", "updated_at"], name="variabila_user_upd_idx"),
+        ]
 
     def __str__(self):
         return f"{self.categorie} | {self.suma} {self.moneda}"
 
 
-class EconomieVacanta(models.Model):
+class EconomieVacanta(CuLunaBugetara):
     user = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -107,9 +174,13 @@ class EconomieVacanta(models.Model):
     suma = models.DecimalField(max_digits=10, decimal_places=2)
     moneda = models.CharField(max_length=3, choices=Moneda.choices)
     data = models.DateField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)  # pentru /api/sync/
 
     class Meta:
         ordering = ["-data"]
+        indexes = [
+            models.Index(fields=["user", "updated_at"], name="vacanta_user_upd_idx"),
+        ]
 
     def __str__(self):
         return f"{self.tip} | {self.suma} {self.moneda}"
@@ -178,7 +249,7 @@ class Fond(models.Model):
 #     data = models.DateField(auto_now_add=True)
 
 
-class MiscareFond(models.Model):
+class MiscareFond(CuLunaBugetara):
     TIP = (
         ("adauga", "Adauga"),
         ("retrage", "Retrage"),
@@ -213,9 +284,18 @@ class MiscareFond(models.Model):
     )
     observatii = models.TextField(blank=True)
     data = models.DateField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)  # pentru /api/sync/
 
     class Meta:
         ordering = ["-data"]
+        indexes = [
+            models.Index(
+                fields=["user", "data"],
+                include=["suma_eur", "suma_ron"],
+                name="miscare_user_data_idx",
+            ),
+            models.Index(fields=["user", "updated_at"], name="miscare_user_upd_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user.username} | {self.tip} | EUR:{self.suma_eur} RON:{self.suma_ron}"
@@ -233,3 +313,153 @@ class UserBridge(models.Model):
     )
     accepted = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        # acoperă căutarea vecinilor din get_connected_user_ids
+        indexes = [
+            models.Index(fields=["accepted", "from_user"], name="bridge_accepted_from_idx"),
+            models.Index(fields=["accepted", "to_user"], name="bridge_accepted_to_idx"),
+        ]
+
+
+class RezumatLunar(models.Model):
+    """
+    Sume pre-agregate pe (user, lună bugetară, monedă, tip, categorie).
+    Ținut la zi de semnalele din signals.py; se reface cu
+    `manage.py reconstruieste_rezumat`.
+    """
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="rezumate_lunare",
+    )
+    luna = models.CharField(max_length=7)  # ex: 2026-02 (luna în care începe perioada)
+    moneda = models.CharField(max_length=3, choices=Moneda.choices)
+    tip = models.CharField(max_length=10, choices=TipRezumat.choices)
+    categorie = models.CharField(max_length=20, blank=True, default="")  # doar la variabile
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    numar = models.PositiveIntegerField(default=0)  # câte rânduri intră în total
+
+    class Meta:
+        unique_together = ("user", "luna", "moneda", "tip", "categorie")
+        ordering = ["luna"]
+
+    def __str__(self):
+        return f"{self.user_id} | {self.luna} | {self.tip} {self.categorie} → {self.total} {self.moneda}"
+
+
+class SoldFond(models.Model):
+    """
+    Soldul unei rubrici de fond (fond de urgență, Trading212, XTB, ...) pe
+    monedă: suma mișcărilor (retragerile sunt negative) și câte sunt.
+    Ținut la zi de semnalele din signals.py; se reface cu
+    `manage.py reconstruieste_solduri`.
+    """
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="solduri_fonduri",
+    )
+    rubrica = models.CharField(max_length=30, choices=MiscareFond.RUBRICI)
+    moneda = models.CharField(max_length=3, choices=Moneda.choices)
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    numar = models.PositiveIntegerField(default=0)  # câte mișcări intră în total
+
+    class Meta:
+        unique_together = ("user", "rubrica", "moneda")
+
+    def __str__(self):
+        return f"{self.user_id} | {self.rubrica} → {self.total} {self.moneda}"
+
+
+class CursValutar(models.Model):
+    """
+    1 `moneda` = `curs` `moneda_baza` la data `data`.
+    Pentru o zi fără curs se folosește cel mai recent curs anterior.
+    """
+
+    data = models.DateField()
+    moneda = models.CharField(max_length=3, choices=Moneda.choices)
+    moneda_baza = models.CharField(max_length=3, choices=Moneda.choices)
+    curs = models.DecimalField(max_digits=12, decimal_places=6)
+
+    class Meta:
+        # indexul unic acoperă căutarea „ultimul curs <= data” pe pereche
+        unique_together = ("moneda", "moneda_baza", "data")
+        ordering = ["-data"]
+
+    def __str__(self):
+        return f"{self.data} | 1 {self.moneda} = {self.curs} {self.moneda_baza}"
+
+
+class StatisticaGlobala(models.Model):
+    """
+    Totalurile platformei pe (tip, monedă), pe felii ca seria zilnică: ținute
+    la zi de signals.py odată cu ea, citite de admin_stats fără să adune tot
+    istoricul. Userii activi (felia 0) îi scrie doar
+    `manage.py reconciliaza_statistici`.
+    """
+
+    tip = models.CharField(max_length=12, choices=TipStatistica.choices)
+    moneda = models.CharField(max_length=3, blank=True, default="")  # "" la useri
+    felie = models.PositiveSmallIntegerField(default=0)  # user_id % FELII
+    total = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    numar = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ("tip", "moneda", "felie")
+
+    def __str__(self):
+        return f"{self.tip} {self.moneda} [{self.felie}] → {self.numar} / {self.total}"
+
+
+class StatisticaZilnica(models.Model):
+    """
+    Totalurile platformei pe (tip, monedă), pe ziua în care a fost creat
+    rândul (sau userul): seria zilnică pentru graficul de creștere. Ținute
+    la zi de signals.py; se reconciliază cu `manage.py reconciliaza_statistici`.
+    """
+
+    zi = models.DateField()
+    tip = models.CharField(max_length=12, choices=TipStatistica.choices)
+    moneda = models.CharField(max_length=3, blank=True, default="")
+    felie = models.PositiveSmallIntegerField(default=0)  # user_id % FELII
+    total = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    numar = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ("zi", "tip", "moneda", "felie")
+        ordering = ["zi"]
+
+    def __str__(self):
+        return f"{self.zi} | {self.tip} {self.moneda} → {self.numar} / {self.total}"
+
+
+class Stergere(models.Model):
+    """
+    Urma unui rând șters (venit, cheltuială, economie de vacanță, mișcare
+    de fond), ca /api/sync/ să poată spune clientului ce să scoată. Se
+    păstrează SETARI_SYNC["PASTRARE_ZILE"]; `manage.py curata_stergeri`
+    le scoate pe cele mai vechi.
+    """
+
+    model = models.CharField(max_length=30)  # cheia din utils_sync.MODELE_SYNC
+    obiect_id = models.BigIntegerField()
+    # fără constrângere: userul poate fi deja șters când se scrie urma
+    user = models.ForeignKey(
+        User,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+    )
+    sters_la = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "sters_la"], name="stergere_user_la_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.model} #{self.obiect_id} | {self.sters_la}"
@@ -0,0 +1,94 @@
+import base64
+import json
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginare după cheie (camp_cursor desc, id desc): pagina N costă cât prima,
+    fiindcă se filtrează după ultimul rând văzut, nu cu OFFSET.
+
+    Se activează doar când clientul trimite ?cursor= sau ?page_size=,
+    altfel lista se întoarce completă, ca înainte.
+    """
+
+    page_size = 50
+    max_page_size = 500
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if (
+            self.cursor_query_param not in params
+            and self.page_size_query_param not in params
+        ):
+            return None
+
+        self.request = request
+        self.camp = getattr(view, "camp_cursor", "data")
+        field = queryset.model._meta.get_field(self.camp)
+
+        marime = self.get_page_size(request)
+        queryset = queryset.order_by(f"-{self.camp}", "-id")
+
+        cursor = params.get(self.cursor_query_param)
+        if cursor:
+            valoare, ultimul_id = self.decode_cursor(cursor, field)
+            queryset = queryset.filter(
+                Q(**{f"{self.camp}__lt": valoare})
+                | Q(**{self.camp: valoare, "id__lt": ultimul_id})
+            )
+
+        rezultate = list(queryset[: marime + 1])
+        self.are_urmator = len(rezultate) > marime
+        rezultate = rezultate[:marime]
+
+        self.ultimul = rezultate[-1] if rezultate else None
+        return rezultate
+
+    def get_page_size(self, request):
+        try:
+            marime = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+
+        return min(max(marime, 1), self.max_page_size)
+
+    def decode_cursor(self, cursor, field):
+        try:
+            valoare, ultimul_id = json.loads(base64.urlsafe_b64decode(cursor))
+            return field.to_python(valoare), int(ultimul_id)
+        except Exception:
+            raise NotFound("Cursor invalid.")
+
+    def encode_cursor(self, obj):
+        valoare = getattr(obj, self.camp).isoformat()
+        return base64.urlsafe_b64encode(json.dumps([valoare, obj.id]).encode()).decode()
+
+    def get_next_link(self):
+        if not self.are_urmator:
+            return None
+
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.ultimul)
+        )
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
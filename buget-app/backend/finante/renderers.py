@@ -0,0 +1,140 @@
+import re
+from datetime import date
+from decimal import ROUND_HALF_UP, Decimal
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from .instrumentare import faza
+
+try:
+    import orjson
+except ImportError:  # fără orjson rămâne encoderul standard al DRF
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # fără msgpack, MessagePackRenderer nu e în settings
+    msgpack = None
+
+
+CHEIE_LUNA = re.compile(r"\d{4}-(0[1-9]|1[0-2])")
+
+
+class JSONRendererCronometrat(JSONRenderer):
+    """
+    JSONRenderer, cu timpul măsurat ca faza „randare” a requestului.
+    Cu orjson instalat, JSON-ul compact se scrie cu orjson: aceleași
+    valori ca DRF (tipurile pe care orjson nu le știe, plus datele, trec
+    prin encoderul DRF); doar floaturile extreme pot avea alt exponent.
+    """
+
+    OPTIUNI_ORJSON = (
+        orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME if orjson else 0
+    )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with faza("randare"):
+            if self._cu_orjson(data, accepted_media_type, renderer_context):
+                try:
+                    return self._render_orjson(data)
+                except orjson.JSONEncodeError:
+                    pass  # ex. întregi peste 64 de biți: encoderul DRF
+            return super().render(data, accepted_media_type, renderer_context)
+
+    def _cu_orjson(self, data, accepted_media_type, renderer_context):
+        return (
+            orjson is not None
+            and data is not None
+            and self.compact
+            and not self.ensure_ascii
+            and self.get_indent(accepted_media_type, renderer_context or {}) is None
+        )
+
+    def _render_orjson(self, data):
+        ret = orjson.dumps(
+            data, default=self.encoder_class().default, option=self.OPTIUNI_ORJSON
+        )
+        # ca DRF: U+2028 și U+2029 escapate, JSON-ul rămâne JavaScript valid
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028")
+            ret = ret.replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    `Accept: application/msgpack`: aceleași valori ca JSON-ul (Decimal ca
+    număr, datele ca text ISO, prin encoderul DRF), în format binar.
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        with faza("randare"):
+            return msgpack.packb(
+                data, default=JSONEncoder().default, use_bin_type=True
+            )
+
+
+def _centi(valoare):
+    return int(Decimal(str(valoare)).scaleb(2).to_integral_value(ROUND_HALF_UP))
+
+
+def _este_suma(valoare):
+    return isinstance(valoare, (Decimal, int, float)) and not isinstance(
+        valoare, bool
+    )
+
+
+def in_coloane(data):
+    """
+    Forma compactă a unui răspuns de grafic: listele de zile devin
+    {"zi0": "2026-01-01", "delta_zile": [...]}, cele de luni bugetare
+    {"luna0": "2026-01", "delta_luni": [...]}, iar cele de sume
+    {"centi": [...]} (întregi, null rămâne null). Restul nu se schimbă.
+    """
+
+    if isinstance(data, dict):
+        return {cheie: in_coloane(valoare) for cheie, valoare in data.items()}
+    if not isinstance(data, (list, tuple)) or not data:
+        return data
+
+    if all(type(v) is date for v in data):
+        zile = [v.toordinal() for v in data]
+        return {
+            "zi0": data[0].isoformat(),
+            "delta_zile": [b - a for a, b in zip(zile, zile[1:])],
+        }
+
+    if all(isinstance(v, str) and CHEIE_LUNA.fullmatch(v) for v in data):
+        luni = [int(v[:4]) * 12 + int(v[5:]) for v in data]
+        return {"luna0": data[0], "delta_luni": [b - a for a, b in zip(luni, luni[1:])]}
+
+    if any(_este_suma(v) for v in data) and all(
+        v is None or _este_suma(v) for v in data
+    ):
+        return {"centi": [None if v is None else _centi(v) for v in data]}
+
+    return [in_coloane(v) for v in data]
+
+
+class JSONColoaneRenderer(JSONRendererCronometrat):
+    """
+    `Accept: application/vnd.buget.coloane+json` pe endpointurile de
+    grafice: JSON cu datele delta-codate și sumele în cenți (in_coloane).
+    """
+
+    media_type = "application/vnd.buget.coloane+json"
+    format = "coloane"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is not None:
+            with faza("randare"):
+                data = in_coloane(data)
+        return super().render(data, accepted_media_type, renderer_context)
@@ -1,6 +1,11 @@
 from django.contrib.auth.models import User
 from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from .autentificare import RefreshTokenCuRevendicari
 from .models import Fond, MiscareFond
 
 from .models import (
@@ -34,12 +39,21 @@ class RegisterSerializer(serializers.ModelSerializer):
         return user
 
 
+# tokenurile de acces cu revendicări (autentificare.py), la login și refresh
+class TokenCuRevendicariSerializer(TokenObtainPairSerializer):
+    token_class = RefreshTokenCuRevendicari
+
+
+class TokenRefreshCuRevendicariSerializer(TokenRefreshSerializer):
+    token_class = RefreshTokenCuRevendicari
+
+
 class VenitSerializer(serializers.ModelSerializer):
     username = serializers.CharField(source="user.username", read_only=True)
 
     class Meta:
         model = Venit
-        exclude = ("user",)
+        exclude = ("user", "luna_bugetara")
         read_only_fields = ("created_at", "updated_at")
 
 
@@ -76,7 +90,7 @@ class CheltuialaVariabilaSerializer(serializers.ModelSerializer):
 class EconomieVacantaSerializer(serializers.ModelSerializer):
     class Meta:
         model = EconomieVacanta
-        exclude = ("user",)
+        exclude = ("user", "luna_bugetara")
         read_only_fields = ("data",)
 
 
@@ -121,9 +135,40 @@ class MiscareFondSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = MiscareFond
-        exclude = ("user",)
+        exclude = ("user", "luna_bugetara")
 
     def validate(self, data):
         if not data.get("suma_eur") and not data.get("suma_ron"):
             raise serializers.ValidationError("Trebuie completată suma în EUR sau RON")
         return data
+
+
+class ListaInBlocSerializer(serializers.ListSerializer):
+    """
+    `many=True` pentru acțiunea /bulk/ a ViewSet-urilor: erorile vin pe
+    element, în ordinea listei ({} pentru elementele bune). La actualizări,
+    `instance` e un dict id → rând, iar fiecare element se validează față de
+    rândul cu `id`-ul lui.
+    """
+
+    def run_child_validation(self, data):
+        if isinstance(self.instance, dict):
+            id_ = data.get("id") if isinstance(data, dict) else None
+            if type(id_) is not int or id_ not in self.instance:
+                raise serializers.ValidationError({"id": ["Rând inexistent."]})
+            self.child.instance = self.instance[id_]
+            self.child.initial_data = data
+        return super().run_child_validation(data)
+
+    def to_internal_value(self, data):
+        validate, erori = [], []
+        for element in data:
+            try:
+                validate.append(self.run_child_validation(element))
+                erori.append({})
+            except serializers.ValidationError as exc:
+                erori.append(exc.detail)
+
+        if any(erori):
+            raise serializers.ValidationError(erori)
+        return validate
@@ -0,0 +1,274 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db.models import QuerySet
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import (
+    Venit,
+    CheltuialaFixa,
+    CheltuialaVariabila,
+    EconomieVacanta,
+    EconomieLunara,
+    Fond,
+    MiscareFond,
+    UserBridge,
+    CursValutar,
+    TipStatistica,
+    Stergere,
+)
+from .utils_rezumat import SURSE_REZUMAT, aplica_delta, cheie_instanta, cheie_rezumat
+from .utils_statistici import inregistreaza, inregistreaza_in_bloc, zi_din
+from .autentificare import invalideaza_autentificare
+from .utils_users import invalideaza_bridge
+from .utils_curs import goleste_cache_cursuri
+from .utils_versiuni import creste_versiune, creste_versiune_cursuri
+from .utils_cache import invalideaza_raspunsuri
+from .utils_sync import inregistreaza_stergeri
+from .utils_solduri import aplica_solduri, sume_instanta, sume_miscare
+
+
+# modelele cu date ale userului (versiune / răspunsuri cache-uite)
+MODELE_DATE = (
+    Venit,
+    CheltuialaFixa,
+    CheltuialaVariabila,
+    EconomieVacanta,
+    EconomieLunara,
+    MiscareFond,
+    Fond,
+)
+
+
+def _sters_cu_userul(origin):
+    # `origin` (post_delete) = ce a pornit ștergerea: un user sau useri
+    return isinstance(origin, User) or (
+        isinstance(origin, QuerySet) and origin.model is User
+    )
+
+
+def _sters_in_bloc(origin):
+    # utils_scrieri.sterge_in_bloc: dupa_scriere_in_bloc face totul, grupat
+    return getattr(origin, "_sters_in_bloc", False)
+
+
+# ---------- rezumat lunar + statistici globale ----------
+
+
+def _suma(instance):
+    # suma poate fi atribuită ca float / text; în bază ajunge ca Decimal
+    return Decimal(str(instance.suma))
+
+
+@receiver(pre_save, sender=Venit)
+@receiver(pre_save, sender=CheltuialaFixa)
+@receiver(pre_save, sender=CheltuialaVariabila)
+def rezumat_retine_vechi(sender, instance, raw=False, **kwargs):
+    # la update ținem minte cheia și suma de dinainte, ca să le scădem
+    instance._rezumat_vechi = None
+    if raw or instance.pk is None:
+        return
+
+    campuri = ["user_id", "luna_bugetara", "moneda", "suma"]
+    if sender is CheltuialaVariabila:
+        campuri.append("categorie")
+
+    vechi = sender.objects.filter(pk=instance.pk).values(*campuri).first()
+    if vechi:
+        cheie = cheie_rezumat(
+            sender,
+            vechi["user_id"],
+            vechi["luna_bugetara"],
+            vechi["moneda"],
+            vechi.get("categorie", ""),
+        )
+        instance._rezumat_vechi = (cheie, vechi["suma"])
+
+
+@receiver(post_save, sender=Venit)
+@receiver(post_save, sender=CheltuialaFixa)
+@receiver(post_save, sender=CheltuialaVariabila)
+def rezumat_dupa_salvare(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+
+    cheie = cheie_instanta(instance)
+    vechi = getattr(instance, "_rezumat_vechi", None)
+    instance._rezumat_vechi = None
+
+    tip = SURSE_REZUMAT[sender]
+    zi = zi_din(instance.created_at)
+    suma = _suma(instance)
+
+    if vechi and vechi[0] == cheie:
+        aplica_delta(cheie, suma - vechi[1], 0)
+        inregistreaza(tip, instance.moneda, zi, suma - vechi[1], 0, instance.user_id)
+        return
+
+    if vechi:
+        aplica_delta(vechi[0], -vechi[1], -1)
+        inregistreaza(tip, vechi[0][2], zi, -vechi[1], -1, vechi[0][0])
+    aplica_delta(cheie, suma, 1)
+    inregistreaza(tip, instance.moneda, zi, suma, 1, instance.user_id)
+
+
+@receiver(post_delete, sender=Venit)
+@receiver(post_delete, sender=CheltuialaFixa)
+@receiver(post_delete, sender=CheltuialaVariabila)
+def rezumat_dupa_stergere(sender, instance, origin=None, **kwargs):
+    if _sters_in_bloc(origin):
+        return
+    if _sters_cu_userul(origin):
+        # rezumatul userului pleacă în cascadă; statisticile se scad o singură
+        # dată, grupat, la ștergerea userului (user_sters)
+        origin.__dict__.setdefault("_randuri_sterse", []).append(instance)
+        return
+
+    aplica_delta(cheie_instanta(instance), -_suma(instance), -1)
+    inregistreaza(
+        SURSE_REZUMAT[sender],
+        instance.moneda,
+        zi_din(instance.created_at),
+        -_suma(instance),
+        -1,
+        instance.user_id,
+    )
+
+
+# ---------- soldurile fondurilor pe rubrici ----------
+
+
+@receiver(pre_save, sender=MiscareFond)
+def sold_retine_vechi(sender, instance, raw=False, **kwargs):
+    # la update ținem minte rubrica și sumele de dinainte, ca să le scădem
+    instance._sold_vechi = {}
+    if raw or instance.pk is None:
+        return
+
+    vechi = (
+        MiscareFond.objects.filter(pk=instance.pk)
+        .values_list("user_id", "rubrica", "suma_eur", "suma_ron")
+        .first()
+    )
+    if vechi:
+        instance._sold_vechi = sume_miscare(*vechi)
+
+
+@receiver(post_save, sender=MiscareFond)
+def sold_dupa_salvare(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+
+    vechi = getattr(instance, "_sold_vechi", {})
+    instance._sold_vechi = {}
+    aplica_solduri(vechi, sume_instanta(instance))
+
+
+@receiver(post_delete, sender=MiscareFond)
+def sold_dupa_stergere(sender, instance, origin=None, **kwargs):
+    # soldurile userului șters se șterg și ele, în cascadă
+    if not _sters_cu_userul(origin):
+        aplica_solduri(sume_instanta(instance), {})
+
+
+# ---------- statistici globale (userii înscriși) ----------
+
+
+@receiver(post_save, sender=User)
+def user_creat(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        zi = zi_din(instance.date_joined)
+        inregistreaza(TipStatistica.USERI, "", zi, 0, 1, instance.id)
+
+
+@receiver(post_delete, sender=User)
+def user_sters(sender, instance, origin=None, **kwargs):
+    zi = zi_din(instance.date_joined)
+    inregistreaza(TipStatistica.USERI, "", zi, 0, -1, instance.id)
+    Stergere.objects.filter(user_id=instance.id).delete()
+
+    # rândurile șterse în cascadă (rezumat_dupa_stergere le-a strâns)
+    sterse = getattr(origin, "__dict__", {}).pop("_randuri_sterse", [])
+    inregistreaza_in_bloc(sterse, semn=-1)
+    creste_versiune(instance.id)
+    for model in MODELE_DATE:
+        invalideaza_raspunsuri(model, instance.id)
+
+
+# ---------- versiunea datelor (ETag) ----------
+
+
+@receiver(post_save, sender=Venit)
+@receiver(post_save, sender=CheltuialaFixa)
+@receiver(post_save, sender=CheltuialaVariabila)
+@receiver(post_save, sender=EconomieVacanta)
+@receiver(post_save, sender=EconomieLunara)
+@receiver(post_save, sender=MiscareFond)
+@receiver(post_save, sender=Fond)
+@receiver(post_delete, sender=Venit)
+@receiver(post_delete, sender=CheltuialaFixa)
+@receiver(post_delete, sender=CheltuialaVariabila)
+@receiver(post_delete, sender=EconomieVacanta)
+@receiver(post_delete, sender=EconomieLunara)
+@receiver(post_delete, sender=MiscareFond)
+@receiver(post_delete, sender=Fond)
+def date_modificate(sender, instance, raw=False, origin=None, **kwargs):
+    # cu userul, o singură dată în user_sters
+    if not raw and not _sters_cu_userul(origin) and not _sters_in_bloc(origin):
+        creste_versiune(instance.user_id)
+        invalideaza_raspunsuri(sender, instance.user_id)
+
+
+@receiver(post_save, sender=User)
+def user_modificat(sender, instance, raw=False, **kwargs):
+    # username-ul apare în listele userilor conectați
+    if not raw:
+        creste_versiune(instance.id)
+        invalideaza_raspunsuri(sender, instance.id)
+
+
+# ---------- sincronizare (urmele rândurilor șterse) ----------
+
+
+@receiver(post_delete, sender=Venit)
+@receiver(post_delete, sender=CheltuialaFixa)
+@receiver(post_delete, sender=CheltuialaVariabila)
+@receiver(post_delete, sender=EconomieVacanta)
+@receiver(post_delete, sender=MiscareFond)
+def rand_sters(sender, instance, origin=None, **kwargs):
+    # cu userul dispare și bridge-ul: partenerii primesc oricum sync complet
+    if not _sters_cu_userul(origin) and not _sters_in_bloc(origin):
+        inregistreaza_stergeri([instance])
+
+
+# ---------- autentificare (revendicările din token) ----------
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_schimbat(sender, instance, raw=False, **kwargs):
+    # update_user / delete_user / parole: tokenurile emise recitesc userul
+    if not raw:
+        invalideaza_autentificare(instance.id)
+
+
+# ---------- bridge-uri ----------
+
+
+@receiver(post_save, sender=UserBridge)
+@receiver(post_delete, sender=UserBridge)
+def bridge_modificat(sender, instance, **kwargs):
+    invalideaza_bridge(instance.from_user_id, instance.to_user_id)
+    invalideaza_autentificare(instance.from_user_id, instance.to_user_id)
+    creste_versiune(instance.from_user_id, instance.to_user_id)
+
+
+# ---------- cursuri valutare ----------
+
+
+@receiver(post_save, sender=CursValutar)
+@receiver(post_delete, sender=CursValutar)
+def curs_modificat(sender, **kwargs):
+    goleste_cache_cursuri()
+    creste_versiune_cursuri()
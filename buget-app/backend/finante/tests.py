@@ -1,3 +1,2009 @@
-from django.test import TestCase
+import csv
+import gzip
+import io
+import json
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from importlib import import_module
+from random import Random
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import (
+    LiveServerTestCase,
+    RequestFactory,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+from django.utils import timezone
+from django.utils.http import http_date, parse_http_date_safe
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .models import (
+    Venit,
+    CheltuialaFixa,
+    CheltuialaVariabila,
+    CategorieVariabila,
+    CursValutar,
+    EconomieVacanta,
+    EconomieLunara,
+    Fond,
+    MiscareFond,
+    RezumatLunar,
+    SoldFond,
+    StatisticaGlobala,
+    StatisticaZilnica,
+    Stergere,
+    UserBridge,
+)
+from .instrumentare import (
+    HISTOGRAME,
+    Histograma,
+    buget_parte,
+    buget_pentru_view,
+    numara_interogari,
+)
+from .utils import (
+    cheie_luna_bugetara,
+    cu_ani_in_urma,
+    get_luna_bugetara,
+    perioada_din_cheie,
+)
+from . import autentificare
+from .autentificare import (
+    CHEIE_SCHIMBARE,
+    JWTAuthenticationCronometrat,
+    access_token_pentru,
+    principal_din_token,
+)
+from .checks import verifica_cache_autentificare, verifica_cache_versiuni
+from .compresie import accepta, brotli
+from .renderers import JSONRendererCronometrat, msgpack
+from .serializers import (
+    CheltuialaFixaSerializer,
+    CheltuialaVariabilaSerializer,
+    EconomieVacantaSerializer,
+    FondSerializer,
+    MiscareFondSerializer,
+    VenitSerializer,
+)
+from .utils_benchmark import SCENARII, Sesiune
+from .utils_curs import curs_la, totaluri_convertite_pe_luni
+from .utils_economii import ultima_luna_incheiata
+from .utils_export import COLOANE_EXPORT, SURSE_EXPORT
+from .utils_import import (
+    _salveaza_lot,
+    _suma,
+    _taguri_ofx,
+    importa_extras,
+    randuri_ofx,
+)
+from .utils_rezumat import (
+    aplica_delta,
+    diferente_rezumat,
+    reconstruieste_rezumat,
+    rezumat_existent,
+)
+from .utils_serializare import serializeaza
+from .utils_solduri import diferente_solduri
+from .utils_sync import MODELE_SYNC
+from .utils_sintetic import genereaza, sterge_sintetice, useri_sintetici
+from .utils_statistici import FELII, diferente_statistici
+from .utils_users import CHEIE_BRIDGE, get_connected_user_ids, vecini_pentru
+from .utils_versiuni import CHEIE_VERSIUNE, CHEIE_VERSIUNE_CURSURI
+
+
+# tabelele care cresc cu istoricul; pe ele nu acceptăm Seq Scan
+TABELE_MARI = (
+    "finante_venit",
+    "finante_cheltuialafixa",
+    "finante_cheltuialavariabila",
+    "finante_miscarefond",
+    "finante_rezumatlunar",
+)
+
+
+@skipUnless(
+    connection.vendor == "postgresql", "planurile EXPLAIN sunt verificate pe PostgreSQL"
+)
+class PlanInterogariTests(TestCase):
+    """
+    Populează multe date pentru mulți useri și verifică, prin EXPLAIN,
+    că interogările fiecărui endpoint folosesc indexuri, nu Seq Scan.
+    """
+
+    USERI = 200
+    RANDURI_PE_USER = 100
+
+    @classmethod
+    def setUpTestData(cls):
+        rnd = Random(42)
+        azi = date.today()
+
+        useri = User.objects.bulk_create(
+            [
+                User(username=f"user{i}", email=f"user{i}@test.ro")
+                for i in range(cls.USERI)
+            ]
+        )
+        cls.user, partener = useri[0], useri[1]
+        UserBridge.objects.create(from_user=cls.user, to_user=partener, accepted=True)
+
+        def zi():
+            return azi - timedelta(days=rnd.randint(0, 730))
+
+        def suma():
+            return Decimal(rnd.randint(100, 500000)) / 100
+
+        venituri, fixe, variabile, miscari = [], [], [], []
+        categorii = [c for c, _ in CategorieVariabila.choices]
+
+        # bulk_create nu trece prin save(), deci luna bugetară se pune explicit
+        for u in useri:
+            for _ in range(cls.RANDURI_PE_USER):
+                d = zi()
+                luna = cheie_luna_bugetara(d)
+                venituri.append(
+                    Venit(user=u, suma=suma(), moneda="EUR", data=d, luna_bugetara=luna)
+                )
+                fixe.append(
+                    CheltuialaFixa(
+                        user=u,
+                        descriere="chirie",
+                        suma=suma(),
+                        moneda="RON",
+                        data=d,
+                        luna_bugetara=luna,
+                    )
+                )
+                variabile.append(
+                    CheltuialaVariabila(
+                        user=u,
+                        categorie=rnd.choice(categorii),
+                        suma=suma(),
+                        moneda="EUR",
+                        data=d,
+                        luna_bugetara=luna,
+                    )
+                )
+                miscari.append(
+                    MiscareFond(
+                        user=u,
+                        tip="adauga",
+                        suma_eur=suma(),
+                        luna_bugetara=luna,
+                    )
+                )
+
+        Venit.objects.bulk_create(venituri, batch_size=2000)
+        CheltuialaFixa.objects.bulk_create(fixe, batch_size=2000)
+        CheltuialaVariabila.objects.bulk_create(variabile, batch_size=2000)
+        MiscareFond.objects.bulk_create(miscari, batch_size=2000)
+
+        # MiscareFond.data e auto_now_add: o împrăștiem în timp după inserare
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "UPDATE finante_miscarefond SET data = data - (id % 730)::int"
+            )
+
+        reconstruieste_rezumat()
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def explain(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN " + sql)
+            return "\n".join(r[0] for r in cursor.fetchall())
+
+    def assert_fara_seq_scan(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            raspuns = self.client.get(url)
+
+        self.assertEqual(raspuns.status_code, 200, url)
+
+        for query in ctx.captured_queries:
+            sql = query["sql"]
+            if not sql.lstrip().upper().startswith("SELECT"):
+                continue
+
+            plan = self.explain(sql)
+            for tabela in TABELE_MARI:
+                self.assertNotIn(f"Seq Scan on {tabela}", plan, f"{url}\n{sql}\n{plan}")
+
+    def test_endpointuri_fara_seq_scan(self):
+        luna_trecuta = date.today() - timedelta(days=31)
+
+        endpointuri = [
+            "/api/buget/lunar/",
+            "/api/grafice/luna/",
+            "/api/venit/total/",
+            "/api/venit/status/",
+            "/api/economii/vacanta/",
+            "/api/fonduri/",
+            "/api/fonduri/grafic/",
+            "/api/fonduri/grafic/timeline/",
+            "/api/fonduri/grafic/timeline/extended/",
+            "/api/venituri/?page_size=50",
+            "/api/cheltuieli-fixe/?page_size=50",
+            "/api/cheltuieli-variabile/?page_size=50&categorie=alimente",
+            f"/api/cheltuieli-variabile/?de_la={luna_trecuta}&pana_la={date.today()}",
+        ]
+
+        for url in endpointuri:
+            with self.subTest(url=url):
+                self.assert_fara_seq_scan(url)
+
+
+class BugetInterogariMixin:
+    """
+    `self.cere(...)` face requestul și verifică numărul de interogări
+    față de bugetul declarat al endpointului (@buget_interogari).
+    """
+
+    def cere(self, metoda, url, **kwargs):
+        with numara_interogari() as contor:
+            raspuns = getattr(self.client, metoda)(url, **kwargs)
+
+        buget = buget_pentru_view(resolve(url.split("?")[0]).func, metoda)
+        self.assertIsNotNone(buget, f"{url} nu are buget de interogări declarat")
+        self.assertLessEqual(
+            contor.numar, buget, f"{metoda.upper()} {url}: {contor.numar} > {buget}"
+        )
+
+        return raspuns, contor.numar
+
+
+class BugetInterogariTests(BugetInterogariMixin, TestCase):
+    LISTE = [
+        "/api/venituri/",
+        "/api/cheltuieli-fixe/",
+        "/api/cheltuieli-variabile/",
+        "/api/economii-vacanta/",
+        "/api/fonduri/",
+        "/api/bridge/requests/",
+    ]
+
+    def setUp(self):
+        cache.clear()
+        caches["raspunsuri"].clear()
+        self.user = User.objects.create_user("ana", "ana@test.ro", "parola123")
+        self.partener = User.objects.create_user("ion", "ion@test.ro", "parola123")
+        UserBridge.objects.create(
+            from_user=self.user, to_user=self.partener, accepted=True
+        )
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def adauga_randuri(self, numar):
+        for i in range(numar):
+            for user in (self.user, self.partener):
+                Venit.objects.create(user=user, suma=100, moneda="EUR")
+                CheltuialaFixa.objects.create(
+                    user=user, descriere="chirie", suma=50, moneda="EUR"
+                )
+                CheltuialaVariabila.objects.create(
+                    user=user, categorie="alimente", suma=10, moneda="RON"
+                )
+                EconomieVacanta.objects.create(
+                    user=user, tip="economii", suma=5, moneda="EUR"
+                )
+                MiscareFond.objects.create(user=user, tip="adauga", suma_eur=20)
+
+            strain = User.objects.create_user(f"strain{numar}_{i}")
+            UserBridge.objects.create(from_user=strain, to_user=self.user)
+
+    def test_listele_au_numar_constant_de_interogari(self):
+        self.adauga_randuri(1)
+        putine = {url: self.cere("get", url)[1] for url in self.LISTE}
+
+        self.adauga_randuri(10)
+        multe = {url: self.cere("get", url)[1] for url in self.LISTE}
+
+        self.assertEqual(putine, multe)
+
+    def test_toate_rutele_finante_au_buget(self):
+        from . import urls
+
+        for pattern in urls.urlpatterns:
+            callback = getattr(pattern, "callback", None)
+            if callback is None:
+                continue  # include(router.urls) — verificat mai jos
+
+            with self.subTest(ruta=str(pattern.pattern)):
+                self.assertIsNotNone(
+                    getattr(callback, "buget_interogari", None)
+                    or getattr(getattr(callback, "cls", None), "buget_interogari", None)
+                )
+
+        for pattern in urls.router.urls:
+            cls = getattr(pattern.callback, "cls", None)
+            if cls is None or not hasattr(cls, "queryset"):
+                continue  # rădăcina API-ului generată de router
+
+            for metoda in pattern.callback.actions:
+                with self.subTest(ruta=str(pattern.pattern), metoda=metoda):
+                    self.assertIsNotNone(buget_pentru_view(pattern.callback, metoda))
+
+
+class RezumatLunarTests(BugetInterogariMixin, TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("ana")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_scrierile_prin_api_tin_rezumatul_egal_cu_reconstructia(self):
+        raspuns, _ = self.cere(
+            "post",
+            "/api/venituri/",
+            data={"suma": "100.00", "moneda": "EUR", "data": "2026-03-10"},
+        )
+        venit = raspuns.data["id"]
+        raspuns, _ = self.cere(
+            "post",
+            "/api/cheltuieli-variabile/",
+            data={
+                "categorie": "alimente",
+                "suma": "25.00",
+                "moneda": "RON",
+                "data": "2026-03-27",
+            },
+        )
+        bon = raspuns.data["id"]
+        self.cere(
+            "post",
+            "/api/cheltuieli-fixe/",
+            data={
+                "descriere": "chirie",
+                "suma": "400.00",
+                "moneda": "EUR",
+                "data": "2026-03-01",
+            },
+        )
+        self.assertEqual(diferente_rezumat(), [])
+
+        # altă lună bugetară, altă monedă, altă categorie
+        self.cere(
+            "patch",
+            f"/api/venituri/{venit}/",
+            data={"data": "2026-04-02", "moneda": "RON"},
+        )
+        self.cere(
+            "put",
+            f"/api/cheltuieli-variabile/{bon}/",
+            data={
+                "categorie": "auto",
+                "suma": "30.00",
+                "moneda": "RON",
+                "data": "2026-03-27",
+            },
+        )
+        self.assertEqual(diferente_rezumat(), [])
+
+        self.cere("delete", f"/api/cheltuieli-variabile/{bon}/")
+        self.assertEqual(diferente_rezumat(), [])
+
+        stocat = rezumat_existent()
+        reconstruieste_rezumat()
+        self.assertEqual(rezumat_existent(), stocat)
+        self.assertEqual(
+            stocat,
+            {
+                (self.user.id, "2026-03", "RON", "venit", ""): (Decimal("100"), 1),
+                (self.user.id, "2026-02", "EUR", "fixa", ""): (Decimal("400"), 1),
+            },
+        )
+
+    def test_suma_atribuita_ca_float(self):
+        venit = Venit.objects.create(user=self.user, suma="10.00", moneda="EUR")
+        venit.suma = 12.5
+        venit.save()
+        venit.suma = 12.5
+        venit.data = date(2026, 3, 30)  # altă lună bugetară
+        venit.save()
+
+        fixa = CheltuialaFixa.objects.create(
+            user=self.user, descriere="apă", suma=7.1, moneda="RON"
+        )
+        fixa.suma = 8.3
+        fixa.save()
+        self.assertEqual(diferente_rezumat(), [])
+        # userii activi îi scrie doar reconcilierea
+        self.assertEqual(
+            [d for d in diferente_statistici() if d[0][1] != "useri_activi"], []
+        )
+
+    def test_aplica_delta_si_reconstruirea(self):
+        cheie = (self.user.id, "2026-03", "EUR", "venit", "")
+
+        # scăderile nu creează rânduri
+        aplica_delta(cheie, Decimal("-5"), -1)
+        self.assertFalse(RezumatLunar.objects.exists())
+
+        aplica_delta(cheie, Decimal("7.50"), 1)
+        aplica_delta(cheie, Decimal("2.50"), 1)
+        self.assertEqual(rezumat_existent(), {cheie: (Decimal("10"), 2)})
+
+        # rezumat fără rânduri brute în spate
+        with self.assertRaises(CommandError):
+            call_command("reconstruieste_rezumat", verifica=True, stdout=io.StringIO())
+        call_command("reconstruieste_rezumat", stdout=io.StringIO())
+        self.assertEqual(rezumat_existent(), {})
+
+    def test_migratia_umple_rezumatul_din_tabele(self):
+        migratie = import_module("finante.migrations.0003_rezumatlunar")
+
+        for zi in (date(2026, 3, 26), date(2026, 4, 25)):
+            Venit.objects.create(user=self.user, suma=100, moneda="EUR", data=zi)
+        for categorie in ("alimente", "auto"):
+            CheltuialaVariabila.objects.create(
+                user=self.user,
+                categorie=categorie,
+                suma=10,
+                moneda="RON",
+                data=date(2026, 4, 26),
+            )
+        asteptat = rezumat_existent()
+
+        RezumatLunar.objects.all().delete()
+        migratie.umple_rezumat(apps, None)
+
+        self.assertEqual(rezumat_existent(), asteptat)
+        self.assertEqual(
+            asteptat[(self.user.id, "2026-03", "EUR", "venit", "")],
+            (Decimal("200"), 2),
+        )
+        self.assertEqual(len(asteptat), 3)
+
+
+class LunaBugetaraTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("ana")
+
+    def test_salvarea_seteaza_luna_bugetara(self):
+        venit = Venit.objects.create(
+            user=self.user, suma=1, moneda="EUR", data=date(2026, 3, 25)
+        )
+        self.assertEqual(venit.luna_bugetara, "2026-02")
+
+        # 26 deschide luna bugetară următoare, și peste an
+        venit.data = date(2026, 12, 26)
+        venit.save(update_fields=["data"])
+        venit.refresh_from_db()
+        self.assertEqual(venit.luna_bugetara, "2026-12")
+
+        # `data` auto_now_add: luna zilei de azi
+        vacanta = EconomieVacanta.objects.create(user=self.user, tip="economii", suma=5)
+        self.assertEqual(vacanta.luna_bugetara, cheie_luna_bugetara(date.today()))
+
+    def test_migratia_umple_luna_bugetara(self):
+        migratie = import_module("finante.migrations.0004_luna_bugetara")
+
+        zile = [date(2025, 12, 26), date(2026, 1, 25), date(2026, 2, 26)]
+        for zi in zile:
+            Venit.objects.create(user=self.user, suma=1, moneda="EUR", data=zi)
+            CheltuialaVariabila.objects.create(
+                user=self.user, categorie="auto", suma=1, moneda="EUR", data=zi
+            )
+        MiscareFond.objects.create(user=self.user, tip="adauga", suma_eur=1)
+        for model in (Venit, CheltuialaVariabila, MiscareFond):
+            model.objects.update(luna_bugetara="")
+
+        migratie.umple_luna_bugetara(apps, None)
+
+        for model in (Venit, CheltuialaVariabila):
+            self.assertEqual(
+                sorted(model.objects.values_list("luna_bugetara", flat=True)),
+                ["2025-12", "2025-12", "2026-02"],
+            )
+        self.assertEqual(
+            MiscareFond.objects.get().luna_bugetara, cheie_luna_bugetara(date.today())
+        )
+
+
+class TimelineFonduriTests(BugetInterogariMixin, TestCase):
+    def setUp(self):
+        caches["raspunsuri"].clear()
+        self.user = User.objects.create_user("ana")
+        self.partener = User.objects.create_user("ion")
+        self.fara_miscari = User.objects.create_user("vlad")
+        for altul in (self.partener, self.fara_miscari):
+            UserBridge.objects.create(from_user=self.user, to_user=altul, accepted=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def miscare(self, user, zi, eur=None, ron=None):
+        miscare = MiscareFond.objects.create(
+            user=user, tip="adauga", suma_eur=eur, suma_ron=ron
+        )
+        MiscareFond.objects.filter(pk=miscare.pk).update(data=zi)
+
+    def test_soldurile_cumulate_pe_zile(self):
+        z1, z2, z3 = date(2026, 1, 5), date(2026, 1, 6), date(2026, 2, 1)
+        self.miscare(self.user, z1, eur=100)
+        self.miscare(self.user, z1, eur=-30, ron=50)
+        self.miscare(self.user, z2, ron=20)
+        self.miscare(self.partener, z2, eur=10)
+        self.miscare(self.partener, z3, eur=5, ron=-5)
+
+        raspuns, _ = self.cere("get", "/api/fonduri/grafic/timeline/extended/")
+        total, per_user = raspuns.data["total"], raspuns.data["per_user"]
+
+        # o zi pe etichetă, cu soldul de la sfârșitul zilei
+        self.assertEqual(total["labels"], [z1, z2, z3])
+        self.assertEqual(total["datasets"][0]["data"], [70, 80, 85])
+        self.assertEqual(total["datasets"][1]["data"], [50, 70, 65])
+
+        self.assertEqual(list(per_user), ["ana", "ion", "vlad"])
+        self.assertEqual(per_user["ana"]["labels"], [z1, z2])
+        self.assertEqual(per_user["ana"]["datasets"][0]["data"], [70, 70])
+        self.assertEqual(per_user["ana"]["datasets"][1]["data"], [50, 70])
+        self.assertEqual(per_user["ion"]["labels"], [z2, z3])
+        self.assertEqual(per_user["ion"]["datasets"][0]["data"], [10, 15])
+        self.assertEqual(per_user["ion"]["datasets"][1]["data"], [0, -5])
+        self.assertEqual(per_user["vlad"]["labels"], [])
+
+
+class BridgeTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.ana = User.objects.create_user("ana")
+        self.ion = User.objects.create_user("ion")
+
+    def test_memo_pe_request_si_cache_comun(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(get_connected_user_ids(self.ana), [self.ana.id])
+        with self.assertNumQueries(0):
+            get_connected_user_ids(self.ana)
+            # alt obiect pentru același user (alt request): din cache
+            get_connected_user_ids(User(id=self.ana.id))
+
+    def test_schimbarile_bridge_ului_invalideaza(self):
+        get_connected_user_ids(self.ana)
+
+        bridge = UserBridge.objects.create(from_user=self.ana, to_user=self.ion)
+        self.assertEqual(get_connected_user_ids(self.ana), [self.ana.id])
+
+        client = APIClient()
+        client.force_authenticate(self.ion)
+        client.post(f"/api/bridge/accept/{bridge.id}/")
+        self.assertEqual(get_connected_user_ids(self.ana), [self.ana.id, self.ion.id])
+        self.assertEqual(
+            get_connected_user_ids(User(id=self.ion.id)), [self.ion.id, self.ana.id]
+        )
+        self.assertEqual(
+            vecini_pentru([self.ana.id, self.ion.id]),
+            {self.ana.id: [self.ion.id], self.ion.id: [self.ana.id]},
+        )
+
+        bridge.delete()
+        self.assertEqual(get_connected_user_ids(self.ana), [self.ana.id])
+
+    def test_invalidarea_se_reface_la_commit(self):
+        bridge = UserBridge.objects.create(from_user=self.ana, to_user=self.ion)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bridge.accepted = True
+            bridge.save()
+            # o cerere concurentă, înainte de commit, vede încă bridge-ul vechi
+            cache.set(CHEIE_BRIDGE.format(self.ana.id), [])
+
+        self.assertEqual(
+            get_connected_user_ids(User(id=self.ana.id)), [self.ana.id, self.ion.id]
+        )
+
+
+class PaginareTests(BugetInterogariMixin, TestCase):
+    URL = "/api/cheltuieli-variabile/"
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("ana")
+        partener = User.objects.create_user("ion")
+        UserBridge.objects.create(from_user=self.user, to_user=partener, accepted=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        # zile repetate: ordinea se decide și după id
+        self.randuri = [
+            CheltuialaVariabila.objects.create(
+                user=(self.user, partener)[i % 2],
+                categorie=("alimente", "auto", "sanatate")[i % 3],
+                suma=i + 1,
+                moneda="RON",
+                data=date(2026, 1, 1 + i // 2),
+            )
+            for i in range(8)
+        ]
+
+    def test_paginile_urmeaza_cheia_fara_dubluri(self):
+        ordonate = sorted(self.randuri, key=lambda r: (r.data, r.id), reverse=True)
+        asteptat = [r.id for r in ordonate]
+
+        vazute, numere = [], []
+        url = f"{self.URL}?page_size=3"
+        while url:
+            raspuns, numar = self.cere("get", url.replace("http://testserver", ""))
+            self.assertEqual(raspuns.status_code, 200)
+            vazute += [r["id"] for r in raspuns.data["results"]]
+            numere.append(numar)
+            url = raspuns.data["next"]
+
+        self.assertEqual(vazute, asteptat)
+        self.assertEqual(len(numere), 3)
+        # pagina de după cursor costă cât cea dinainte (fără OFFSET)
+        self.assertEqual(len(set(numere[1:])), 1)
+
+        # fără ?cursor= / ?page_size=, lista completă ca înainte
+        raspuns, _ = self.cere("get", self.URL)
+        self.assertEqual(len(raspuns.data), 8)
+
+        raspuns = self.client.get(f"{self.URL}?cursor=gresit")
+        self.assertEqual(raspuns.status_code, 404)
+
+    def test_filtre_pe_perioada_si_categorie(self):
+        raspuns, _ = self.cere(
+            "get",
+            f"{self.URL}?de_la=2026-01-02&pana_la=2026-01-03"
+            "&categorie=alimente&categorie=auto",
+        )
+        self.assertEqual(
+            sorted(r["id"] for r in raspuns.data),
+            sorted(
+                r.id
+                for r in self.randuri
+                if date(2026, 1, 2) <= r.data <= date(2026, 1, 3)
+                and r.categorie in ("alimente", "auto")
+            ),
+        )
+
+        raspuns = self.client.get(f"{self.URL}?de_la=ieri")
+        self.assertEqual(raspuns.status_code, 400)
+        self.assertIn("de_la", raspuns.data)
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("ana")
+        partener = User.objects.create_user("ion")
+        UserBridge.objects.create(from_user=self.user, to_user=partener, accepted=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        for i in range(30):
+            zi = date(2026, 1, 1) + timedelta(days=i)
+            Venit.objects.create(user=self.user, suma=100 + i, moneda="EUR", data=zi)
+            CheltuialaVariabila.objects.create(
+                user=partener, categorie="alimente", suma=i, moneda="RON", data=zi
+            )
+        MiscareFond.objects.create(user=self.user, tip="adauga", suma_eur=20)
+
+    def descarca(self, url):
+        raspuns = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip, br")
+        self.assertEqual(raspuns.status_code, 200)
+        self.assertTrue(raspuns.streaming)
+        # în flux: gzip, bucată cu bucată (brotli doar pe răspunsuri întregi)
+        self.assertEqual(raspuns["Content-Encoding"], "gzip")
+
+        # rândurile se citesc abia la trimitere, un query pe tabelă
+        with self.assertNumQueries(len(SURSE_EXPORT)):
+            continut = b"".join(raspuns.streaming_content)
+        return gzip.decompress(continut).decode()
+
+    def test_csv_in_flux_prin_gzip(self):
+        text = self.descarca("/api/export/?fisier=csv&pana_la=2026-01-10")
+
+        randuri = list(csv.DictReader(io.StringIO(text)))
+        self.assertEqual(list(randuri[0]), COLOANE_EXPORT)
+        self.assertEqual([r["tip"] for r in randuri].count("cheltuiala_variabila"), 10)
+        venituri = [r for r in randuri if r["tip"] == "venit"]
+        self.assertEqual(len(venituri), 10)
+        self.assertEqual(
+            (venituri[0]["data"], venituri[0]["suma"], venituri[0]["username"]),
+            ("2026-01-01", "100.00", "ana"),
+        )
+
+    def test_ndjson_in_flux_prin_gzip(self):
+        text = self.descarca(
+            "/api/export/?fisier=ndjson&de_la=2026-01-30&pana_la=2026-01-30"
+        )
+
+        randuri = [json.loads(linie) for linie in text.splitlines()]
+        self.assertEqual([r["tip"] for r in randuri], ["venit", "cheltuiala_variabila"])
+        self.assertEqual(randuri[0]["suma"], "129.00")
+
+        raspuns = self.client.get("/api/export/?fisier=xml")
+        self.assertEqual(raspuns.status_code, 400)
+
+
+class ConversieValutaraTests(BugetInterogariMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("ana")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.azi = date.today()
+
+    def curs(self, zi, curs, moneda="RON", baza="EUR"):
+        CursValutar.objects.create(data=zi, moneda=moneda, moneda_baza=baza, curs=curs)
+
+    def test_soldul_lunii_nu_se_salveaza_fara_curs(self):
+        Venit.objects.create(user=self.user, suma=100, moneda="EUR", data=self.azi)
+        CheltuialaVariabila.objects.create(
+            user=self.user, categorie="auto", suma=50, moneda="RON", data=self.azi
+        )
+
+        raspuns, _ = self.cere("post", "/api/economii/calculeaza/")
+        self.assertEqual(raspuns.status_code, 409)
+        self.assertEqual(raspuns.data["fara_curs"], 1)
+        self.assertEqual(raspuns.data["zile_fara_curs"], [self.azi])
+        self.assertFalse(EconomieLunara.objects.exists())
+
+        # cursul cel mai recent de dinainte acoperă ziua
+        self.curs(self.azi - timedelta(days=3), "0.2")
+        raspuns, _ = self.cere("post", "/api/economii/calculeaza/")
+        self.assertEqual(raspuns.status_code, 200)
+        self.assertEqual(raspuns.data["economie"], Decimal("90"))
+        self.assertEqual(EconomieLunara.objects.get().sold, Decimal("90"))
+
+    def test_totaluri_convertite_cu_si_fara_curs(self):
+        start, _ = get_luna_bugetara()
+        z0, z1 = start, start + timedelta(days=1)
+        Venit.objects.create(user=self.user, suma=100, moneda="EUR", data=z1)
+        Venit.objects.create(user=self.user, suma=500, moneda="RON", data=z1)
+        CheltuialaVariabila.objects.create(
+            user=self.user, categorie="auto", suma=50, moneda="RON", data=z0
+        )
+        self.curs(z1, "0.2")
+        self.curs(z0, "5", moneda="EUR", baza="RON")
+
+        # RON → EUR doar de la z1: cheltuiala din z0 rămâne pe dinafară
+        raspuns, _ = self.cere("get", "/api/buget/lunar/?moneda=EUR")
+        self.assertEqual(
+            (raspuns.data["venit"], raspuns.data["fara_curs"]), (Decimal("200"), 1)
+        )
+        self.assertEqual(raspuns.data["variabile"], 0)
+
+        # EUR → RON de la z0: totul se convertește; RON rămâne cum e
+        raspuns, _ = self.cere("get", "/api/buget/lunar/?moneda=RON")
+        self.assertEqual(
+            (raspuns.data["venit"], raspuns.data["fara_curs"]), (Decimal("1000"), 0)
+        )
+        self.assertEqual(raspuns.data["variabile"], Decimal("50"))
+
+        luna = cheie_luna_bugetara(start)
+        pe_luni, fara_curs = totaluri_convertite_pe_luni("EUR", ["2000-01", luna])
+        self.assertEqual(fara_curs, 1)
+        self.assertEqual(pe_luni["2000-01"]["venit"], 0)
+        self.assertEqual(pe_luni[luna]["venit"], Decimal("200"))
+
+    def test_cache_ul_de_cursuri_vede_importurile_altui_proces(self):
+        ieri = self.azi - timedelta(days=1)
+        self.assertIsNone(curs_la("RON", "EUR", self.azi))
+
+        # bulk_create / update fără signals, ca `importa_cursuri` în alt proces
+        CursValutar.objects.bulk_create(
+            [CursValutar(data=ieri, moneda="RON", moneda_baza="EUR", curs="0.2")]
+        )
+        self.assertEqual(curs_la("RON", "EUR", self.azi), Decimal("0.2"))
+
+        CursValutar.objects.update(curs="0.25")
+        self.assertEqual(curs_la("RON", "EUR", self.azi), Decimal("0.2"))
+        # ...până crește versiunea cursurilor din cache-ul comun
+        cache.set(CHEIE_VERSIUNE_CURSURI, 1)
+        self.assertEqual(curs_la("RON", "EUR", self.azi), Decimal("0.25"))
+
+
+class StatisticiGlobaleTests(BugetInterogariMixin, TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser("admin", "admin@test.ro", "parola")
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_actualizarile_incrementale_egaleaza_reconcilierea(self):
+        user = User.objects.create_user("ana")
+        venit = Venit.objects.create(user=user, suma=100, moneda="EUR")
+        venit.suma, venit.moneda = 80, "RON"
+        venit.save()
+        CheltuialaFixa.objects.create(
+            user=user, descriere="chirie", suma=50, moneda="EUR"
+        )
+        CheltuialaVariabila.objects.create(
+            user=user, categorie="alimente", suma=10, moneda="EUR"
+        )
+        ion = User.objects.create_user("ion")
+        felie_ion = ion.id % FELII
+        ion.delete()
+
+        # userii activi se numără doar la reconciliere
+        diferente = [d for d in diferente_statistici() if d[0][1] != "useri_activi"]
+        self.assertEqual(diferente, [])
+        # scrierile nu ating un rând comun, doar felia userului (din zi și
+        # din totaluri)
+        felii = {user.id % FELII, felie_ion, self.admin.id % FELII}
+        for model in (StatisticaZilnica, StatisticaGlobala):
+            self.assertEqual(set(model.objects.values_list("felie", flat=True)), felii)
+
+        # instantaneul citește doar totalurile, nu seria zilnică
+        with CaptureQueriesContext(connection) as interogari:
+            raspuns, _ = self.cere("get", "/api/admin/stats/")
+        self.assertFalse(
+            [q for q in interogari if "statisticazilnica" in q["sql"].lower()]
+        )
+        self.assertEqual(raspuns.data["useri"], 2)
+        self.assertEqual(raspuns.data["total_venit"], Decimal("80"))
+        self.assertEqual(raspuns.data["pe_moneda"]["EUR"]["cheltuieli"], Decimal("60"))
+
+        # după reconciliere, scăderile nimeresc aceleași felii
+        call_command("reconciliaza_statistici", stdout=io.StringIO())
+        venit.delete()
+        self.assertEqual(diferente_statistici(), [])
+
+        user.delete()
+        self.assertEqual(
+            [d for d in diferente_statistici() if d[0][1] != "useri_activi"], []
+        )
+
+    def test_stergerea_userului_scade_statisticile_o_data(self):
+        user = User.objects.create_user("ana")
+        partener = User.objects.create_user("ion")
+        UserBridge.objects.create(from_user=user, to_user=partener, accepted=True)
+        for i in range(20):
+            Venit.objects.create(user=user, suma=100 + i, moneda="EUR")
+            CheltuialaVariabila.objects.create(
+                user=user, categorie="alimente", suma=10, moneda=("EUR", "RON")[i % 2]
+            )
+            EconomieVacanta.objects.create(user=user, tip="economii", suma=5)
+            MiscareFond.objects.create(user=user, tip="adauga", suma_eur=20)
+
+        # bugetul nu crește cu rândurile userului: rezumatul pleacă în
+        # cascadă, statisticile se scad grupat, o singură dată
+        raspuns, _ = self.cere("delete", f"/api/admin/users/{user.id}/delete/")
+
+        self.assertEqual(raspuns.status_code, 200)
+        self.assertEqual(diferente_rezumat(), [])
+        self.assertEqual(diferente_solduri(), [])
+        self.assertEqual(
+            [d for d in diferente_statistici() if d[0][1] != "useri_activi"], []
+        )
+        self.assertFalse(Stergere.objects.exists())
+
+    def test_istoric_are_toate_zilele(self):
+        User.objects.create_user("ana")
+        raspuns, _ = self.cere("get", "/api/admin/stats/istoric/")
+
+        self.assertEqual(len(raspuns.data["labels"]), 90)
+        self.assertEqual(raspuns.data["labels"][-1], date.today().isoformat())
+        self.assertEqual(raspuns.data["serii"]["useri"][-1], 2)
+
+
+class GetConditionatTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches["raspunsuri"].clear()
+        self.user = User.objects.create_user("ana")
+        self.partener = User.objects.create_user("ion")
+        UserBridge.objects.create(
+            from_user=self.user, to_user=self.partener, accepted=True
+        )
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_304_fara_interogari_pana_la_o_scriere(self):
+        for url in ("/api/buget/lunar/", "/api/venituri/"):
+            with self.subTest(url=url):
+                etag = self.client.get(url)["ETag"]
+
+                with numara_interogari() as contor:
+                    raspuns = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(raspuns.status_code, 304)
+                self.assertEqual(contor.numar, 0)
+
+                # o scriere a partenerului schimbă versiunea
+                with self.captureOnCommitCallbacks(execute=True):
+                    Venit.objects.create(user=self.partener, suma=10, moneda="EUR")
+
+                raspuns = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(raspuns.status_code, 200)
+                self.assertNotEqual(raspuns["ETag"], etag)
+
+    def test_last_modified_nu_e_mai_vechi_decat_ziua(self):
+        # date neschimbate de o săptămână: răspunsul de azi e totuși altul
+        veche = timezone.now() - timedelta(days=7)
+        cache.set_many(
+            {
+                CHEIE_VERSIUNE.format(uid): int(veche.timestamp()) * 1_000_000_000
+                for uid in (self.user.id, self.partener.id)
+            }
+            | {CHEIE_VERSIUNE_CURSURI: int(veche.timestamp()) * 1_000_000_000},
+            None,
+        )
+
+        raspuns = self.client.get(
+            "/api/buget/lunar/", HTTP_IF_MODIFIED_SINCE=http_date(veche.timestamp())
+        )
+        self.assertEqual(raspuns.status_code, 200)
+
+        inceput_zi = time.mktime(date.today().timetuple())
+        modificat = parse_http_date_safe(raspuns["Last-Modified"])
+        self.assertGreaterEqual(modificat, inceput_zi)
+
+        raspuns = self.client.get(
+            "/api/buget/lunar/", HTTP_IF_MODIFIED_SINCE=raspuns["Last-Modified"]
+        )
+        self.assertEqual(raspuns.status_code, 304)
+
+    def test_verifica_cache_local(self):
+        self.assertEqual(
+            [e.id for e in verifica_cache_versiuni(None)], ["finante.E001"]
+        )
+
+        comun = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": "/tmp/buget-cache",
+            }
+        }
+        with override_settings(CACHES=comun):
+            self.assertEqual(verifica_cache_versiuni(None), [])
+
+
+class CacheRaspunsuriTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches["raspunsuri"].clear()
+        self.user = User.objects.create_user("ana")
+        self.partener = User.objects.create_user("ion")
+        UserBridge.objects.create(
+            from_user=self.user, to_user=self.partener, accepted=True
+        )
+
+        self.client = APIClient()
+
+    def get(self, user, url="/api/grafice/luna/"):
+        self.client.force_authenticate(user)
+        with numara_interogari() as contor:
+            raspuns = self.client.get(url)
+        self.assertEqual(raspuns.status_code, 200)
+        return raspuns.data, contor.numar
+
+    def scrie(self, model, **campuri):
+        with self.captureOnCommitCallbacks(execute=True):
+            model.objects.create(user=self.partener, **campuri)
+
+    def test_partenerii_impart_intrarea_si_scrierile_o_invalideaza(self):
+        self.get(self.user)
+        get_connected_user_ids(self.partener)  # bridge-urile, deja în cache
+
+        # partenerul nimerește intrarea: nicio interogare pe rezumat
+        _, interogari = self.get(self.partener)
+        self.assertEqual(interogari, 0)
+
+        # o mișcare de fond nu privește graficul lunii
+        self.scrie(MiscareFond, tip="adauga", suma_eur=10)
+        _, interogari = self.get(self.user)
+        self.assertEqual(interogari, 0)
+
+        self.scrie(Venit, suma=100, moneda="EUR")
+        data, interogari = self.get(self.user)
+        self.assertGreater(interogari, 0)
+        self.assertEqual(data["venit"], Decimal("100"))
+
+        self.client.force_authenticate(User.objects.create_superuser("admin"))
+        contoare = self.client.get("/api/admin/cache/").data["grafice_luna"]
+        self.assertEqual((contoare["hit"], contoare["miss"]), (2, 2))
+
+
+class DashboardTests(BugetInterogariMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        caches["raspunsuri"].clear()
+        self.user = User.objects.create_user("ana")
+        partener = User.objects.create_user("ion")
+        UserBridge.objects.create(from_user=self.user, to_user=partener, accepted=True)
+
+        azi = date.today()
+        for user in (self.user, partener):
+            for zile in (0, 40, 80):
+                d = azi - timedelta(days=zile)
+                Venit.objects.create(user=user, suma=1000, moneda="EUR", data=d)
+                CheltuialaFixa.objects.create(
+                    user=user, descriere="chirie", suma=300, moneda="EUR", data=d
+                )
+                for categorie in ("alimente", "vacanta"):
+                    CheltuialaVariabila.objects.create(
+                        user=user, categorie=categorie, suma=25, moneda="EUR", data=d
+                    )
+            EconomieVacanta.objects.create(
+                user=user, tip="economii", suma=200, moneda="EUR"
+            )
+            MiscareFond.objects.create(user=user, tip="adauga", suma_eur=50)
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_dashboard_egal_cu_endpointurile_separate(self):
+        raspuns, _ = self.cere("get", "/api/dashboard/")
+        dashboard = raspuns.json()
+
+        separate = {
+            "buget_lunar": "/api/buget/lunar/",
+            "grafice_luna": "/api/grafice/luna/",
+            "venit_status": "/api/venit/status/",
+            "economii_vacanta": "/api/economii/vacanta/",
+            "fonduri": "/api/fonduri/",
+        }
+        for cheie, url in separate.items():
+            with self.subTest(cheie=cheie):
+                self.assertEqual(dashboard[cheie], self.client.get(url).json())
+
+    def test_seria_pe_luni_contine_luna_curenta_si_lunile_goale(self):
+        curenta = cheie_luna_bugetara()
+        an = int(curenta[:4]) - 1
+        de_la = f"{an}-{curenta[5:]}"  # 13 luni, cu goluri între rânduri
+
+        for url, simplu in (
+            ("/api/buget/lunar/", "/api/buget/lunar/"),
+            ("/api/grafice/luna/", "/api/grafice/luna/"),
+        ):
+            with self.subTest(url=url):
+                raspuns, _ = self.cere("get", f"{url}?de_la={de_la}")
+                luni = raspuns.json()["luni"]
+
+                self.assertEqual(len(luni), 13)
+                self.assertEqual(luni[0]["cheie"], de_la)
+                self.assertEqual(luni[-1].pop("cheie"), curenta)
+                self.assertEqual(luni[-1], self.client.get(simplu).json())
+
+
+class InchideLuniTests(TestCase):
+    def test_inchide_lunile_gospodariei_cu_goluri(self):
+        ana = User.objects.create_user("ana")
+        ion = User.objects.create_user("ion")
+        singur = User.objects.create_user("singur")
+        UserBridge.objects.create(from_user=ana, to_user=ion, accepted=True)
+
+        ultima = ultima_luna_incheiata()
+        an, luna = map(int, ultima.split("-"))
+        prima = f"{an - 1}-{luna:02d}"  # 13 luni, doar prima și ultima cu date
+
+        for cheie, user, suma in ((prima, ana, 100), (ultima, ion, 40)):
+            start, _ = perioada_din_cheie(cheie)
+            Venit.objects.create(user=user, suma=suma, moneda="EUR", data=start)
+        CheltuialaFixa.objects.create(
+            user=ion,
+            descriere="chirie",
+            suma=15,
+            moneda="EUR",
+            data=perioada_din_cheie(prima)[0],
+        )
+        # luna curentă nu se închide
+        Venit.objects.create(user=ana, suma=999, moneda="EUR")
+
+        iesire = io.StringIO()
+        call_command("inchide_luni", procese=1, stdout=iesire)
+        call_command("inchide_luni", procese=1, stdout=iesire)  # upsert, nu dubluri
+
+        for user in (ana, ion):
+            solduri = dict(
+                EconomieLunara.objects.filter(user=user).values_list("luna", "sold")
+            )
+            self.assertEqual(len(solduri), 13)
+            self.assertEqual(solduri[prima], Decimal("85"))
+            self.assertEqual(solduri[ultima], Decimal("40"))
+            self.assertEqual(sum(solduri.values()), Decimal("125"))
+
+        self.assertFalse(EconomieLunara.objects.filter(user=singur).exists())
+
+    def test_sare_lunile_fara_curs_si_le_raporteaza(self):
+        ana = User.objects.create_user("ana")
+        ion = User.objects.create_user("ion")
+        UserBridge.objects.create(from_user=ana, to_user=ion, accepted=True)
+
+        ultima = ultima_luna_incheiata()
+        an, luna = map(int, ultima.split("-"))
+        penultima = f"{an - (luna == 1)}-{(luna - 2) % 12 + 1:02d}"
+
+        Venit.objects.create(
+            user=ana, suma=100, moneda="EUR", data=perioada_din_cheie(penultima)[0]
+        )
+        Venit.objects.create(
+            user=ana, suma=50, moneda="EUR", data=perioada_din_cheie(ultima)[0]
+        )
+        # fără curs RON pentru ultima lună: soldul gospodăriei ar fi parțial
+        CheltuialaFixa.objects.create(
+            user=ion,
+            descriere="chirie",
+            suma=300,
+            moneda="RON",
+            data=perioada_din_cheie(ultima)[0],
+        )
+
+        erori = io.StringIO()
+        with self.assertRaises(CommandError):
+            call_command(
+                "inchide_luni", procese=1, stdout=io.StringIO(), stderr=erori
+            )
+
+        for user in (ana, ion):
+            solduri = dict(
+                EconomieLunara.objects.filter(user=user).values_list("luna", "sold")
+            )
+            self.assertEqual(solduri, {penultima: Decimal("100")})
+            self.assertIn(
+                f"user {user.id}, {ultima}: 1 rânduri fără curs", erori.getvalue()
+            )
+
+
+class ViewsAsyncTests(TransactionTestCase):
+    # firele views_async au conexiunile lor: datele trebuie să fie commit-uite
+
+    def setUp(self):
+        cache.clear()
+        caches["raspunsuri"].clear()
+        self.user = User.objects.create_user("ana")
+        partener = User.objects.create_user("ion")
+        UserBridge.objects.create(from_user=self.user, to_user=partener, accepted=True)
+
+        for user in (self.user, partener):
+            Venit.objects.create(user=user, suma=1000, moneda="EUR")
+            CheltuialaFixa.objects.create(
+                user=user, descriere="chirie", suma=300, moneda="RON"
+            )
+            CheltuialaVariabila.objects.create(
+                user=user, categorie="vacanta", suma=25, moneda="EUR"
+            )
+            EconomieVacanta.objects.create(user=user, tip="economii", suma=200)
+            MiscareFond.objects.create(user=user, tip="adauga", suma_eur=50)
+
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+
+    def test_variantele_async_raspund_la_fel(self):
+        for url in (
+            "/api/buget/lunar/",
+            "/api/buget/lunar/?moneda=EUR",
+            "/api/grafice/luna/",
+            f"/api/grafice/luna/?de_la={cheie_luna_bugetara()}",
+            "/api/venit/status/",
+            "/api/economii/vacanta/",
+            "/api/fonduri/",
+            "/api/dashboard/",
+        ):
+            with self.subTest(url=url):
+                sincron = self.client.get(url)
+                asincron = self.client.get(url.replace("/api/", "/api/async/", 1))
+
+                self.assertEqual(asincron.status_code, 200)
+                self.assertEqual(asincron.json(), sincron.json())
+
+    def test_fara_token_401(self):
+        raspuns = APIClient().get("/api/async/buget/lunar/")
+        self.assertEqual(raspuns.status_code, 401)
+        self.assertIn("detail", raspuns.json())
+
+
+class DateSinteticeTests(TestCase):
+    def test_generarea_e_reproductibila_si_agregatele_corecte(self):
+        scrise = genereaza(useri=6, ani=1, gospodarii=1, seed=7)
+
+        self.assertEqual(useri_sintetici().count(), 6)
+        self.assertEqual(UserBridge.objects.filter(accepted=True).count(), 3)
+        self.assertGreater(scrise["CheltuialaVariabila"], 6 * 12 * 10)
+        self.assertEqual(diferente_rezumat(), [])
+
+        # datele istorice își păstrează data (nu „acum”)
+        self.assertLess(
+            MiscareFond.objects.order_by("data").first().data,
+            date.today() - timedelta(days=180),
+        )
+
+        sume = list(
+            CheltuialaVariabila.objects.order_by("user__username", "data", "suma")
+            .values_list("suma", flat=True)
+        )
+        self.assertEqual(sterge_sintetice(), 6)
+        self.assertFalse(CheltuialaVariabila.objects.exists())
+
+        genereaza(useri=6, ani=1, gospodarii=1, seed=7)
+        self.assertEqual(
+            list(
+                CheltuialaVariabila.objects.order_by("user__username", "data", "suma")
+                .values_list("suma", flat=True)
+            ),
+            sume,
+        )
+
+    def test_29_februarie(self):
+        bisect = date(2024, 2, 29)
+        self.assertEqual(cu_ani_in_urma(bisect, 1), date(2023, 2, 28))
+        self.assertEqual(cu_ani_in_urma(bisect, 4), date(2020, 2, 29))
+        self.assertEqual(cu_ani_in_urma(date(2024, 3, 1), 1), date(2023, 3, 1))
+
+        self.assertEqual(
+            Sesiune("http://test", [], azi=bisect).variabile,
+            {"luna": "2024-02", "an_trecut": "2023-02"},
+        )
+
+        genereaza(useri=2, ani=1, gospodarii=0, azi=bisect)
+        self.assertEqual(MiscareFond.objects.order_by("data").first().data.year, 2023)
+
+
+class BenchmarkTests(LiveServerTestCase):
+    def test_scenariile_acopera_toate_rutele(self):
+        from . import urls
+
+        asteptate = set()
+        for pattern in [*urls.urlpatterns, *urls.router.urls]:
+            callback = getattr(pattern, "callback", None)
+            if callback is None or pattern.name == "api-root":
+                continue  # include(), rădăcina generată de router
+            if "format" in str(pattern.pattern):
+                continue  # sufixele .json ale routerului
+
+            if getattr(callback, "actions", None):
+                metode = callback.actions
+            elif hasattr(callback, "cls"):
+                metode = [m for m in callback.cls.http_method_names if m != "options"]
+                metode = [m for m in metode if hasattr(callback.cls, m)]
+            else:
+                metode = ["get"]  # views_async
+            asteptate.update((callback, m) for m in metode if m != "head")
+
+        sesiune = Sesiune("http://test", [])
+        acoperite = {
+            (
+                resolve(
+                    "/api/" + s.cale.format(id=1, **sesiune.variabile).split("?")[0]
+                ).func,
+                s.metoda.lower(),
+            )
+            for s in SCENARII
+        }
+
+        self.assertEqual(asteptate - acoperite, set())
+
+    def test_toate_scenariile_merg_pe_un_server(self):
+        caches["raspunsuri"].clear()
+        genereaza(useri=4, ani=1)
+        User.objects.create_superuser("admin", "admin@test.ro", "parola")
+
+        call_command(
+            "benchmark",
+            baza=self.live_server_url,
+            clienti=2,
+            admin="admin",
+            cereri=2,
+            concurenta=1,
+            incalzire=0,
+            stdout=io.StringIO(),
+        )
+
+        # scrierile scenariilor s-au făcut prin API și s-au șters la final
+        self.assertFalse(User.objects.filter(username__startswith="bench_").exists())
+        self.assertFalse(CheltuialaFixa.objects.filter(descriere="bench").exists())
+        self.assertEqual(diferente_rezumat(), [])
+
+
+@override_settings(FINANTE_PROFILARE={"ESANTION": 1, "PRAG_LENT_MS": None})
+class ProfilareTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches["raspunsuri"].clear()
+        HISTOGRAME.goleste()
+
+        self.user = User.objects.create_user("ana")
+        Venit.objects.create(user=self.user, suma=1000, moneda="EUR")
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+
+    def test_server_timing_si_histograme_pe_ruta(self):
+        raspuns = self.client.get("/api/dashboard/")
+
+        faze = {
+            parte.split(";")[0]: parte
+            for parte in raspuns["Server-Timing"].split(", ")
+        }
+        self.assertLessEqual(
+            {"auth", "bridge", "sql", "randare", "app", "total"}, set(faze)
+        )
+        self.assertIn(f'desc="{raspuns["X-Query-Count"]} interogari"', faze["sql"])
+
+        admin = User.objects.create_superuser("admin", "admin@test.ro", "parola")
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(admin)}"
+        )
+        perf = self.client.get("/api/admin/perf/").json()
+        rute = {r["ruta"]: r for r in perf["rute"]}
+
+        dashboard = rute["GET /api/dashboard/"]
+        self.assertEqual((dashboard["numar"], dashboard["esantioane"]), (1, 1))
+        self.assertIn("sql", dashboard["faze_medie_ms"])
+
+    @override_settings(FINANTE_PROFILARE={"ESANTION": 0, "MAX_RUTE": 2})
+    def test_fara_esantion_doar_histograme_limitate(self):
+        for url in ("/api/me/", "/api/buget/lunar/", "/api/venit/status/"):
+            self.assertNotIn("Server-Timing", self.client.get(url))
+
+        rute = {r["ruta"]: r for r in HISTOGRAME.instantaneu()}
+        self.assertEqual(
+            set(rute), {"GET /api/me/", "GET /api/buget/lunar/", "(altele)"}
+        )
+        self.assertEqual(rute["(altele)"]["esantioane"], 0)
+
+    def test_percentilele_din_galeti(self):
+        h = Histograma((10, 100))
+        for ms in [5] * 90 + [50] * 9 + [700]:
+            h.adauga(ms)
+
+        self.assertEqual((h.percentila(50), h.percentila(95)), (10, 100))
+        self.assertEqual(h.percentila(100), 700)
+
+
+class SerializareRapidaTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches["raspunsuri"].clear()
+        self.user = User.objects.create_user("ana")
+        partener = User.objects.create_user("ion")
+        UserBridge.objects.create(from_user=self.user, to_user=partener, accepted=True)
+
+        azi = date.today()
+        for user in (self.user, partener):
+            for zile in range(3):
+                d = azi - timedelta(days=zile)
+                Venit.objects.create(user=user, suma="1000.5", moneda="RON", data=d)
+                CheltuialaFixa.objects.create(
+                    user=user, descriere="chirie\u2028ș", suma=300, moneda="EUR", data=d
+                )
+                CheltuialaVariabila.objects.create(
+                    user=user, categorie="alimente", suma="0.1", moneda="EUR", data=d
+                )
+            EconomieVacanta.objects.create(user=user, tip="economii", suma=200)
+            MiscareFond.objects.create(user=user, tip="adauga", suma_eur=50)
+            MiscareFond.objects.create(user=user, tip="retrage", suma_ron="-12.30")
+            Fond.objects.create(user=user, suma_eur=10, observatii="x")
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_codorul_e_identic_cu_serializerul(self):
+        for serializer_class in (
+            VenitSerializer,
+            CheltuialaFixaSerializer,
+            CheltuialaVariabilaSerializer,
+            EconomieVacantaSerializer,
+            FondSerializer,
+            MiscareFondSerializer,
+        ):
+            qs = serializer_class.Meta.model.objects.order_by("id")
+            for fus in ("UTC", "Europe/Bucharest"):
+                with self.subTest(serializer=serializer_class.__name__, fus=fus):
+                    with timezone.override(fus):
+                        rapid = serializeaza(serializer_class, qs)
+                        drf = serializer_class(qs, many=True).data
+
+                    self.assertEqual(rapid, drf)
+                    self.assertEqual(list(rapid[0]), list(drf[0]))
+
+    def test_listele_si_paginarea_ca_inainte(self):
+        vazute = []
+        url = "/api/venituri/?page_size=4"
+        while url:
+            pagina = self.client.get(url).json()
+            vazute += pagina["results"]
+            url = pagina["next"]
+
+        venituri = Venit.objects.order_by("-created_at", "-id")
+        self.assertEqual(vazute, VenitSerializer(venituri, many=True).data)
+
+        raspuns = self.client.get("/api/cheltuieli-fixe/")
+        self.assertEqual(
+            raspuns.content,
+            JSONRenderer().render(
+                CheltuialaFixaSerializer(
+                    CheltuialaFixa.objects.all(), many=True
+                ).data
+            ),
+        )
+
+    def test_dashboard_fara_codor_trece_prin_drf(self):
+        rapid = self.client.get("/api/dashboard/").json()
+
+        cache.clear()
+        caches["raspunsuri"].clear()
+        with mock.patch("finante.views.codor_pentru", return_value=None):
+            drf = self.client.get("/api/dashboard/").json()
+
+        self.assertEqual(rapid, drf)
+
+    def test_rendererul_scrie_ca_drf(self):
+        date_ = {
+            "suma": Decimal("12.30"),
+            "moment": timezone.now(),
+            "zi": date.today(),
+            "text": gettext_lazy("Trebuie completată suma"),
+            "separator": "a\u2028b\u2029c",
+            1: [None, True, 0.5, ("x", "ț")],
+        }
+
+        self.assertEqual(
+            JSONRendererCronometrat().render(date_), JSONRenderer().render(date_)
+        )
+
+
+class FormateCompacteTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches["raspunsuri"].clear()
+        self.user = User.objects.create_user("ana")
+        azi = date.today()
+        for zile in range(0, 400, 3):
+            miscare = MiscareFond.objects.create(
+                user=self.user, tip="adauga", suma_eur="10.05", suma_ron="-0.5"
+            )
+            MiscareFond.objects.filter(id=miscare.id).update(
+                data=azi - timedelta(days=zile)
+            )
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = "/api/fonduri/grafic/timeline/"
+
+    def test_coloane_delta_si_centi(self):
+        raspuns = self.client.get(self.url)
+        compact = self.client.get(
+            self.url, HTTP_ACCEPT="application/vnd.buget.coloane+json"
+        )
+        json_, coloane = raspuns.json(), compact.json()
+
+        zi = date.fromisoformat(coloane["labels"]["zi0"])
+        zile = [zi]
+        for delta in coloane["labels"]["delta_zile"]:
+            zi += timedelta(days=delta)
+            zile.append(zi)
+        self.assertEqual([z.isoformat() for z in zile], json_["labels"])
+
+        for simplu, compactat in zip(json_["datasets"], coloane["datasets"]):
+            self.assertEqual(
+                [round(v * 100) for v in simplu["data"]], compactat["data"]["centi"]
+            )
+        self.assertLess(len(compact.content), len(raspuns.content))
+        self.assertNotEqual(raspuns["ETag"], compact["ETag"])
+
+        status = self.client.get(
+            "/api/venit/status/", HTTP_ACCEPT="application/vnd.buget.coloane+json"
+        )
+        self.assertEqual(status.json(), {"labels": [], "data": []})
+
+    def test_compresie_peste_prag(self):
+        simplu = self.client.get(self.url)
+        raspuns = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip, br;q=0")
+
+        self.assertEqual(raspuns["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", raspuns["Vary"])
+        self.assertEqual(gzip.decompress(raspuns.content), simplu.content)
+        self.assertEqual(
+            self.client.get(
+                self.url, HTTP_IF_NONE_MATCH=raspuns["ETag"]
+            ).status_code,
+            304,
+        )
+
+        mic = self.client.get("/api/me/", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertFalse(mic.has_header("Content-Encoding"))
+
+        self.assertTrue(accepta("gzip;q=0.5, *", "br"))
+        self.assertFalse(accepta("gzip, br;q=0", "br"))
+
+    @skipUnless(brotli, "brotli nu e instalat")
+    def test_brotli(self):
+        simplu = self.client.get(self.url)
+        raspuns = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip, br")
+
+        self.assertEqual(raspuns["Content-Encoding"], "br")
+        self.assertEqual(brotli.decompress(raspuns.content), simplu.content)
+
+    @skipUnless(msgpack, "msgpack nu e instalat")
+    def test_msgpack(self):
+        simplu = self.client.get(self.url).json()
+        raspuns = self.client.get(self.url, HTTP_ACCEPT="application/msgpack")
+
+        self.assertEqual(raspuns["Content-Type"], "application/msgpack")
+        self.assertEqual(msgpack.unpackb(raspuns.content), simplu)
+
+
+class AutentificareTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("ana", "ana@test.ro", "parola123")
+        self.partener = User.objects.create_user("ion")
+        self.bridge = UserBridge.objects.create(
+            from_user=self.user, to_user=self.partener, accepted=True
+        )
+        self.auth = JWTAuthenticationCronometrat()
+
+    def autentifica(self, token):
+        request = RequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        return self.auth.authenticate(request)[0]
+
+    def login(self):
+        raspuns = APIClient().post(
+            "/api/token/", {"username": "ana", "password": "parola123"}
+        )
+        return raspuns.json()["access"]
+
+    def test_fara_interogari_cu_revendicari(self):
+        token = self.login()
+
+        with self.assertNumQueries(0):
+            user = self.autentifica(token)
+            conectati = get_connected_user_ids(user)
+        self.assertEqual((user.id, user.username), (self.user.id, "ana"))
+        self.assertEqual(conectati, [self.user.id, self.partener.id])
+
+        with self.assertNumQueries(1):  # câmpurile din afara tokenului, la cerere
+            self.assertEqual(user.email, "ana@test.ro")
+
+    def test_schimbarile_invalideaza_revendicarile(self):
+        token = self.login()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.bridge.delete()
+        with self.assertNumQueries(2):  # userul + bridge-urile, din baza de date
+            user = self.autentifica(token)
+            self.assertEqual(get_connected_user_ids(user), [self.user.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.get(id=self.user.id).delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.autentifica(token)
+
+    def test_tokenuri_vechi_prin_cache_scurt(self):
+        token = AccessToken.for_user(self.user)
+
+        with self.assertNumQueries(1):
+            self.autentifica(token)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.autentifica(token).username, "ana")
+
+        self.user.username = "ana2"
+        self.user.save()  # update_user
+        self.assertEqual(self.autentifica(token).username, "ana2")
+
+    def test_cache_scurt_vede_schimbarile_din_alt_worker(self):
+        User.objects.filter(id=self.user.id).update(is_staff=True)
+        token = AccessToken.for_user(self.user)
+        self.assertTrue(self.autentifica(token).is_staff)
+
+        # alt worker retrogradează, apoi dezactivează userul: _useri de aici
+        # rămâne plin, doar cheia din cache-ul comun se schimbă
+        User.objects.filter(id=self.user.id).update(is_staff=False)
+        cache.set(CHEIE_SCHIMBARE.format(self.user.id), time.time())
+        self.assertFalse(self.autentifica(token).is_staff)
+
+        User.objects.filter(id=self.user.id).update(is_active=False)
+        cache.set(CHEIE_SCHIMBARE.format(self.user.id), time.time())
+        with self.assertRaises(AuthenticationFailed):
+            self.autentifica(token)
+
+    def test_schimbarea_din_alt_worker_bate_cea_locala(self):
+        token = self.login()
+        rev_la = AccessToken(token)["rev_la"]
+
+        # procesul a văzut o schimbare mai veche, alt worker una după login
+        autentificare._schimbari[self.user.id] = rev_la - 10
+        self.addCleanup(autentificare._schimbari.pop, self.user.id, None)
+        cache.set(CHEIE_SCHIMBARE.format(self.user.id), rev_la + 1)
+
+        self.assertIsNone(principal_din_token(AccessToken(token)))
+        with self.assertNumQueries(1):  # userul, din baza de date
+            self.autentifica(token)
+
+    def test_userul_inactiv_nu_trece_prin_revendicari(self):
+        # dezactivat fără signals: doar revendicările îl mai pot lăsa să treacă
+        User.objects.filter(id=self.user.id).update(is_active=False)
+        with self.assertLogs("rest_framework_simplejwt", "WARNING"):
+            token = access_token_pentru(User.objects.get(id=self.user.id))
+
+        self.assertFalse(AccessToken(token)["is_active"])
+        self.assertIsNone(principal_din_token(AccessToken(token)))
+        with self.assertRaises(AuthenticationFailed):
+            self.autentifica(token)
+
+    def test_verifica_cache_autentificare(self):
+        self.assertEqual(
+            [e.id for e in verifica_cache_autentificare(None)], ["finante.E002"]
+        )
+
+        fara_jwt = {
+            "DEFAULT_AUTHENTICATION_CLASSES": (
+                "rest_framework.authentication.SessionAuthentication",
+            )
+        }
+        with override_settings(REST_FRAMEWORK=fara_jwt):
+            self.assertEqual(verifica_cache_autentificare(None), [])
+
+
+class ImportExtrasTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches["raspunsuri"].clear()
+        self.user = User.objects.create_user("ana")
+
+    def importa(self, text, **kwargs):
+        return importa_extras(io.BytesIO(text.encode()), self.user, **kwargs)
+
+    def test_sume_ro_si_en(self):
+        for text, suma in (
+            ("1.234,56", "1234.56"),
+            ("1,234.56", "1234.56"),
+            ("1.234.567,8", "1234567.8"),
+            ("-12,50", "-12.50"),
+            ("12.5", "12.5"),
+            ("1.234", "1234"),
+            ("1,234", "1234"),
+            ("1.234.567", "1234567"),
+            ("0.123", "0.123"),
+            ("1\xa0234,5", "1234.5"),
+            ("", "0"),
+        ):
+            with self.subTest(text=text):
+                self.assertEqual(_suma(text), Decimal(suma))
+
+        with self.assertRaises(ValueError):
+            _suma("12,3x")
+
+    def test_randurile_gresite_apar_in_raport(self):
+        text = (
+            "Data;Suma;Moneda;Descriere\n"
+            "15.01.2024;1.234,50;RON;salariu\n"
+            "31.02.2024;-10;EUR;lidl\n"
+            "16.01.2024;0;EUR;nimic\n"
+            "\n"
+            "17.01.2024;-25,40;USD;netflix\n"
+            "18.01.2024;-25,40;EUR;Netflix\n"
+        )
+
+        rezultat = self.importa(text)
+
+        self.assertEqual(rezultat["venituri"], 1)
+        self.assertEqual(rezultat["cheltuieli"], 1)
+        self.assertEqual(rezultat["erori_total"], 3)
+        self.assertEqual([e["rand"] for e in rezultat["erori"]], [3, 4, 6])
+        self.assertIn("dată invalidă", rezultat["erori"][0]["eroare"])
+
+        self.assertEqual(Venit.objects.get().suma, Decimal("1234.50"))
+        cheltuiala = CheltuialaVariabila.objects.get()
+        self.assertEqual(cheltuiala.suma, Decimal("25.40"))
+        self.assertEqual(cheltuiala.categorie, "divertisment")
+
+    def test_loturi_in_tranzactii_separate(self):
+        text = "date,debit,credit\n" + "".join(
+            f"2024-01-{zi:02d},{zi},\n" if zi % 2 else f"2024-01-{zi:02d},,{zi}\n"
+            for zi in range(1, 8)
+        )
+
+        loturi = []
+
+        def salveaza(lot):
+            loturi.append(len(lot))
+            return _salveaza_lot(lot)
+
+        with mock.patch("finante.utils_import.MARIME_LOT", 3), mock.patch(
+            "finante.utils_import._salveaza_lot", salveaza
+        ), self.assertNoLogs("finante.interogari", "WARNING"):
+            rezultat = self.importa(text)
+
+        self.assertEqual(loturi, [3, 3, 1])
+        self.assertEqual((rezultat["venituri"], rezultat["cheltuieli"]), (3, 4))
+        self.assertEqual(diferente_rezumat([self.user.id]), [])
+
+    def test_bugetul_pe_lot(self):
+        text = "data,suma,descriere\n" + "".join(
+            f"2024-01-{1 + i % 28:02d},-{i + 1},lidl\n" for i in range(60)
+        )
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        # fiecare lot se verifică singur, iar requestul primește bugetele lor
+        with mock.patch("finante.utils_import.MARIME_LOT", 25), self.assertNoLogs(
+            "finante.interogari", "WARNING"
+        ):
+            raspuns = client.post(
+                "/api/import/extras/",
+                {"fisier": SimpleUploadedFile("extras.csv", text.encode())},
+            )
+        self.assertEqual(raspuns.status_code, 201)
+        self.assertEqual(raspuns.data["cheltuieli"], 60)
+
+        # scrieri rând cu rând într-un lot depășesc bugetul lui
+        with numara_interogari() as cerere, self.assertLogs(
+            "finante.interogari", "WARNING"
+        ):
+            with buget_parte("lot", 2):
+                for _ in range(3):
+                    User.objects.exists()
+        self.assertEqual(cerere.buget_extra, 2)
+
+    def test_ofx_citit_in_flux(self):
+        ofx = (
+            "OFXHEADER:100\nDATA:OFXSGML\n\n<OFX><BANKMSGSRSV1><STMTRS>"
+            "<CURDEF>RON<BANKTRANLIST>"
+            "<STMTTRN><DTPOSTED>20240115120000[+2:EET]<TRNAMT>-45.90"
+            "<NAME>LIDL<MEMO>card</STMTTRN>"
+            "<STMTTRN><DTPOSTED>20240116<TRNAMT>3000.00<CURRENCY>EUR"
+            "<NAME>Salariu</STMTTRN>"
+            "</BANKTRANLIST></STMTRS></BANKMSGSRSV1></OFX>"
+        )
+
+        # bucăți mici: tagurile se taie între citiri
+        for marime in (1, 7, 64 * 1024):
+            with self.subTest(marime=marime):
+                taguri = list(_taguri_ofx(io.StringIO(ofx), marime))
+                self.assertEqual(taguri, list(_taguri_ofx(io.StringIO(ofx))))
+
+        self.assertEqual(
+            list(randuri_ofx(io.StringIO(ofx))),
+            [
+                {
+                    "rand": 1,
+                    "moneda": "RON",
+                    "data": "20240115120000[+2:EET]",
+                    "suma": "-45.90",
+                    "descriere": "LIDL card",
+                },
+                {
+                    "rand": 2,
+                    "moneda": "EUR",
+                    "data": "20240116",
+                    "suma": "3000.00",
+                    "descriere": "Salariu",
+                },
+            ],
+        )
+
+        rezultat = self.importa(ofx, format="ofx")
+        self.assertEqual((rezultat["venituri"], rezultat["cheltuieli"]), (1, 1))
+        cheltuiala = CheltuialaVariabila.objects.get()
+        self.assertEqual(
+            (cheltuiala.suma, cheltuiala.moneda, cheltuiala.categorie),
+            (Decimal("45.90"), "RON", "alimente"),
+        )
+
+
+@override_settings(FINANTE_SYNC={"SUPRAPUNERE_S": 0})
+class SyncTests(BugetInterogariMixin, TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("ana")
+        self.partener = User.objects.create_user("ion")
+        self.bridge = UserBridge.objects.create(
+            from_user=self.user, to_user=self.partener, accepted=True
+        )
+        self.venit = Venit.objects.create(user=self.user, suma=100, moneda="EUR")
+        self.miscare = MiscareFond.objects.create(
+            user=self.partener, tip="adauga", suma_eur=10
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def sync(self, token=None):
+        url = "/api/sync/" + (f"?since={token}" if token else "")
+        raspuns, _ = self.cere("get", url)
+        self.assertEqual(raspuns.status_code, 200)
+        return raspuns.data
+
+    def test_doar_schimbarile_de_la_token(self):
+        complet = self.sync()
+        self.assertTrue(complet["complet"])
+        self.assertEqual(
+            [r["id"] for r in complet["venituri"]["modificate"]], [self.venit.id]
+        )
+
+        self.venit.suma = 90
+        self.venit.save()
+        miscare_id = self.miscare.id
+        self.miscare.delete()
+        noua = CheltuialaVariabila.objects.create(
+            user=self.partener, categorie="alimente", suma=5, moneda="RON"
+        )
+
+        delta = self.sync(complet["token"])
+        self.assertFalse(delta["complet"])
+        self.assertEqual(delta["venituri"]["modificate"][0]["suma"], "90.00")
+        self.assertEqual(
+            [r["id"] for r in delta["cheltuieli_variabile"]["modificate"]], [noua.id]
+        )
+        self.assertEqual(delta["miscari_fonduri"]["sterse"], [miscare_id])
+        self.assertEqual(delta["cheltuieli_fixe"], {"modificate": [], "sterse": []})
+
+        gol = self.sync(delta["token"])
+        for cheie in MODELE_SYNC:
+            self.assertEqual(gol[cheie], {"modificate": [], "sterse": []})
+
+    def test_sync_complet_la_alta_gospodarie_sau_token_invalid(self):
+        token = self.sync()["token"]
+
+        self.bridge.delete()
+        raspuns = self.sync(token)
+        self.assertTrue(raspuns["complet"])
+        self.assertEqual(raspuns["miscari_fonduri"]["modificate"], [])
+
+        self.assertEqual(self.client.get("/api/sync/?since=xyz").status_code, 400)
+
+    def test_stergerea_userului_nu_lasa_urme(self):
+        Venit.objects.create(user=self.partener, suma=1, moneda="EUR").delete()
+        self.assertEqual(Stergere.objects.filter(user=self.partener).count(), 1)
+
+        self.partener.delete()
+        self.assertFalse(Stergere.objects.filter(user_id=self.partener.id).exists())
+
+
+class ScriereInBlocTests(BugetInterogariMixin, TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("ana")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.bon = CheltuialaVariabila.objects.create(
+            user=self.user, categorie="alimente", suma=10, moneda="RON"
+        )
+        self.gresit = CheltuialaVariabila.objects.create(
+            user=self.user, categorie="alimente", suma=99, moneda="RON"
+        )
+
+    def test_creari_actualizari_si_stergeri_intr_o_cerere(self):
+        corp = {
+            "create": [
+                {"categorie": "alimente", "suma": f"{10 + i}.50", "moneda": "RON"}
+                for i in range(7)
+            ],
+            "update": [{"id": self.bon.id, "suma": "12.00", "moneda": "EUR"}],
+            "delete": [self.gresit.id],
+        }
+        raspuns, _ = self.cere(
+            "post", "/api/cheltuieli-variabile/bulk/", data=corp, format="json"
+        )
+
+        self.assertEqual(raspuns.status_code, 200)
+        self.assertEqual(len(raspuns.data["create"]), 7)
+        self.assertEqual(raspuns.data["update"][0]["moneda"], "EUR")
+        self.assertEqual(raspuns.data["delete"], [self.gresit.id])
+        self.assertEqual(CheltuialaVariabila.objects.filter(user=self.user).count(), 8)
+        # urma vine o singură dată (din dupa_scriere_in_bloc, nu și din signals)
+        self.assertEqual(Stergere.objects.filter(obiect_id=self.gresit.id).count(), 1)
+
+        # rezumatul și statisticile: ca după scrieri una câte una
+        self.assertEqual(diferente_rezumat(), [])
+        self.assertEqual(
+            [d for d in diferente_statistici() if d[0][1] != "useri_activi"], []
+        )
+
+    def test_stergerile_nu_cresc_cu_randurile(self):
+        def sterge(ids):
+            raspuns, numar = self.cere(
+                "post",
+                "/api/cheltuieli-variabile/bulk/",
+                data={"delete": ids},
+                format="json",
+            )
+            self.assertEqual(raspuns.status_code, 200)
+            return numar
+
+        ids = [
+            CheltuialaVariabila.objects.create(
+                user=self.user, categorie="alimente", suma=i + 1, moneda="RON"
+            ).id
+            for i in range(10)
+        ]
+
+        self.assertEqual(sterge([self.gresit.id]), sterge(ids))
+        self.assertEqual(Stergere.objects.count(), 11)
+        self.assertEqual(diferente_rezumat(), [])
+        self.assertEqual(
+            [d for d in diferente_statistici() if d[0][1] != "useri_activi"], []
+        )
+
+    def test_un_element_invalid_nu_scrie_nimic(self):
+        corp = {
+            "create": [
+                {"categorie": "alimente", "suma": "5.00", "moneda": "RON"},
+                {"categorie": "alimente", "suma": "nu", "moneda": "RON"},
+            ],
+            "update": [{"id": 10**9, "suma": "1.00"}],
+            "delete": [self.gresit.id],
+        }
+        raspuns = self.client.post(
+            "/api/cheltuieli-variabile/bulk/", corp, format="json"
+        )
+
+        self.assertEqual(raspuns.status_code, 400)
+        self.assertEqual(raspuns.data["create"][0], {})
+        self.assertIn("suma", raspuns.data["create"][1])
+        self.assertIn("id", raspuns.data["update"][0])
+        self.assertEqual(raspuns.data["delete"], [{}])
+        self.assertEqual(CheltuialaVariabila.objects.filter(user=self.user).count(), 2)
+
+
+class SolduriFonduriTests(BugetInterogariMixin, TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("ana")
+        self.partener = User.objects.create_user("ion")
+        UserBridge.objects.create(
+            from_user=self.user, to_user=self.partener, accepted=True
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def miscare(self, **date):
+        raspuns, _ = self.cere("post", "/api/fonduri/miscare/", data=date)
+        self.assertEqual(raspuns.status_code, 201)
+        return raspuns.data["id"]
+
+    def sold(self, rubrica):
+        raspuns, _ = self.cere("get", "/api/fonduri/solduri/")
+        return next(r for r in raspuns.data["rubrici"] if r["rubrica"] == rubrica)
+
+    def test_soldurile_urmeaza_miscarile(self):
+        self.miscare(tip="adauga", rubrica="xtb", suma_eur="100.00")
+        retragere = self.miscare(tip="retrage", rubrica="xtb", suma_eur="30.00")
+        MiscareFond.objects.create(
+            user=self.partener, tip="adauga", rubrica="xtb", suma_ron="50.00"
+        )
+        self.assertEqual(
+            (self.sold("xtb")["sold_eur"], self.sold("xtb")["sold_ron"]),
+            (Decimal("70"), Decimal("50")),
+        )
+
+        # mutată pe altă rubrică, apoi ștearsă
+        raspuns, _ = self.cere(
+            "put",
+            f"/api/fonduri/miscare/{retragere}/",
+            data={"rubrica": "revolut", "suma_eur": "30.00"},
+        )
+        self.assertEqual(raspuns.data["suma_eur"], "-30.00")
+        self.assertEqual(self.sold("xtb")["sold_eur"], Decimal("100"))
+        self.assertEqual(self.sold("revolut")["sold_eur"], Decimal("-30"))
+        self.assertEqual(diferente_solduri(), [])
+
+        self.cere("delete", f"/api/fonduri/miscare/{retragere}/")
+        self.assertEqual(self.sold("revolut")["sold_eur"], 0)
+        self.assertEqual(diferente_solduri(), [])
+
+        raspuns, _ = self.cere("get", "/api/fonduri/")
+        self.assertEqual(
+            (raspuns.data["total_eur"], raspuns.data["total_ron"]),
+            (Decimal("100"), Decimal("50")),
+        )
+
+    def test_reconstruieste_solduri(self):
+        self.miscare(tip="adauga", rubrica="trading212", suma_ron="10.00")
+        SoldFond.objects.update(total=0)
+
+        with self.assertRaises(CommandError):
+            call_command("reconstruieste_solduri", verifica=True, stdout=io.StringIO())
+        call_command("reconstruieste_solduri", stdout=io.StringIO())
+        self.assertEqual(self.sold("trading212")["sold_ron"], Decimal("10"))
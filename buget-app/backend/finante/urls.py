@@ -6,6 +6,7 @@ from rest_framework_simplejwt.views import (
 )
 
 
+from . import views_async
 from .views import (
     # auth / user
     RegisterView,
@@ -26,11 +27,16 @@ from .views import (
     miscare_fond,
     miscare_fond_detail,
     fonduri_grafic,
+    fonduri_solduri,
     fonduri_grafic_timeline,
     venit_status_lunar,
+    dashboard,
     lista_utilizatori,
     update_user,
     admin_stats,
+    admin_stats_istoric,
+    admin_cache,
+    admin_perf,
     delete_user,
     lista_useri_simpli,
     send_bridge,
@@ -38,6 +44,10 @@ from .views import (
     accept_bridge,
     fonduri_grafic_timeline_extended,
     FondViewSet,
+    import_extras,
+    export_date,
+    curs_valutar,
+    sync,
 )
 
 router = DefaultRouter()
@@ -63,6 +73,7 @@ urlpatterns = [
     path("venit/status/", venit_status_lunar, name="venit-status"),
     path("buget/lunar/", buget_lunar, name="buget-lunar"),
     path("grafice/luna/", grafice_luna, name="grafice-luna"),
+    path("dashboard/", dashboard, name="dashboard"),
     # economii
     path("economii/calculeaza/", calculeaza_economii_luna, name="economii-calculeaza"),
     path("economii/istoric/", istoric_economii, name="economii-istoric"),
@@ -73,6 +84,7 @@ urlpatterns = [
     path("fonduri/miscare/", miscare_fond, name="miscare-fond"),
     path("fonduri/miscare/<int:pk>/", miscare_fond_detail, name="miscare-fond-detail"),
     path("fonduri/grafic/", fonduri_grafic, name="fonduri-grafic"),
+    path("fonduri/solduri/", fonduri_solduri, name="fonduri-solduri"),
     path(
         "fonduri/grafic/timeline/",
         fonduri_grafic_timeline,
@@ -81,6 +93,9 @@ urlpatterns = [
     path("admin/users/", lista_utilizatori),
     path("admin/users/<int:pk>/", update_user),
     path("admin/stats/", admin_stats),
+    path("admin/stats/istoric/", admin_stats_istoric),
+    path("admin/cache/", admin_cache),
+    path("admin/perf/", admin_perf),
     path("admin/users/<int:pk>/", update_user),
     path("admin/users/<int:pk>/delete/", delete_user),
     path("users/list/", lista_useri_simpli),
@@ -88,4 +103,15 @@ urlpatterns = [
     path("bridge/requests/", bridge_requests),
     path("bridge/accept/<int:pk>/", accept_bridge),
     path("fonduri/grafic/timeline/extended/", fonduri_grafic_timeline_extended),
+    path("import/extras/", import_extras, name="import-extras"),
+    path("export/", export_date, name="export"),
+    path("curs/", curs_valutar, name="curs-valutar"),
+    path("sync/", sync, name="sync"),
+    # variantele async (ASGI) ale endpointurilor de citire
+    path("async/buget/lunar/", views_async.buget_lunar),
+    path("async/grafice/luna/", views_async.grafice_luna),
+    path("async/venit/status/", views_async.venit_status_lunar),
+    path("async/economii/vacanta/", views_async.economii_vacanta_sumar),
+    path("async/fonduri/", views_async.fonduri),
+    path("async/dashboard/", views_async.dashboard),
 ]
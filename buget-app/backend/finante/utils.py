@@ -28,3 +28,46 @@ def get_luna_bugetara(ref_date=None):
             start = date(end.year, end.month - 1, 26)
 
     return start, end
+
+
+def cheie_luna_bugetara(ref_date=None):
+    """
+    Cheia lunii bugetare, ex: "2026-02" pentru perioada 26.02 – 25.03.
+    """
+
+    start, _ = get_luna_bugetara(ref_date)
+    return f"{start.year}-{start.month:02d}"
+
+
+def perioada_din_cheie(cheie):
+    """
+    Perioada (start, end) a lunii bugetare cu cheia dată, ex: "2026-02".
+    """
+
+    an, luna = map(int, cheie.split("-"))
+    return get_luna_bugetara(date(an, luna, 26))
+
+
+def luni_bugetare(de_la, pana_la):
+    """
+    Cheile lunilor bugetare de la `de_la` până la `pana_la` inclusiv, în ordine.
+    """
+
+    an, luna = map(int, de_la.split("-"))
+    luni = []
+    while f"{an}-{luna:02d}" <= pana_la:
+        luni.append(f"{an}-{luna:02d}")
+        an, luna = (an + 1, 1) if luna == 12 else (an, luna + 1)
+    return luni
+
+
+def cu_ani_in_urma(ref_date, ani):
+    """
+    Aceeași zi cu `ani` ani în urmă; 29 februarie devine 28 februarie
+    într-un an care nu e bisect.
+    """
+
+    try:
+        return ref_date.replace(year=ref_date.year - ani)
+    except ValueError:
+        return ref_date.replace(year=ref_date.year - ani, day=28)
@@ -0,0 +1,454 @@
+"""
+Măsurători de latență prin HTTP (doar stdlib), comune comenzilor
+`benchmark` și `compara_latenta`.
+"""
+
+import json
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from django.contrib.auth.models import User
+
+from .autentificare import access_token_pentru
+from .models import (
+    CheltuialaFixa,
+    CheltuialaVariabila,
+    EconomieVacanta,
+    MiscareFond,
+    UserBridge,
+    Venit,
+)
+from .utils import cheie_luna_bugetara, cu_ani_in_urma
+
+
+def cerere(url, token=None, metoda="GET", corp=None, timeout=30):
+    """
+    O cerere HTTP. `corp` e un dict (trimis ca JSON) sau (bytes, content_type).
+    Returnează (corpul răspunsului, ms, X-Query-Count sau None).
+    Răspunsurile 4xx / 5xx ridică urllib.error.HTTPError.
+    """
+
+    antete = {"Accept": "application/json"}
+    if token:
+        antete["Authorization"] = f"Bearer {token}"
+
+    trimis = None
+    if isinstance(corp, tuple):
+        trimis, antete["Content-Type"] = corp
+    elif corp is not None:
+        trimis = json.dumps(corp).encode()
+        antete["Content-Type"] = "application/json"
+
+    inceput = time.perf_counter()
+    with urllib.request.urlopen(
+        urllib.request.Request(url, data=trimis, headers=antete, method=metoda),
+        timeout=timeout,
+    ) as raspuns:
+        continut = raspuns.read()
+        interogari = raspuns.headers.get("X-Query-Count")
+    ms = (time.perf_counter() - inceput) * 1000
+
+    return continut, ms, int(interogari) if interogari else None
+
+
+def multipart(campuri, fisiere):
+    """
+    Corp multipart/form-data pentru `cerere`: fisiere = {camp: (nume, bytes)}.
+    """
+
+    limita = uuid.uuid4().hex
+    parti = []
+    for camp, valoare in campuri.items():
+        parti.append(
+            f'--{limita}\r\nContent-Disposition: form-data; name="{camp}"\r\n\r\n'
+            f"{valoare}\r\n".encode()
+        )
+    for camp, (nume, continut) in fisiere.items():
+        parti.append(
+            f"--{limita}\r\nContent-Disposition: form-data; "
+            f'name="{camp}"; filename="{nume}"\r\n'
+            "Content-Type: application/octet-stream\r\n\r\n".encode()
+            + continut
+            + b"\r\n"
+        )
+    parti.append(f"--{limita}--\r\n".encode())
+
+    return b"".join(parti), f"multipart/form-data; boundary={limita}"
+
+
+def masoara(functie, cereri, concurenta):
+    """
+    Apelează `functie(i)` pentru i în range(cereri), de pe `concurenta` fire
+    simultan; `functie` face o cerere și returnează rezultatul lui `cerere`.
+    Returnează (rezultate reușite, erori, durata totală în secunde).
+    """
+
+    reusite, erori = [], []
+    lacat = threading.Lock()
+
+    def una(i):
+        try:
+            rezultat = functie(i)
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            with lacat:
+                erori.append(str(e))
+            return
+
+        with lacat:
+            reusite.append(rezultat)
+
+    inceput = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurenta) as pool:
+        list(pool.map(una, range(cereri)))
+
+    return reusite, erori, time.perf_counter() - inceput
+
+
+def _percentila(sortate, p):
+    # nearest-rank, ca să nu inventăm valori între măsurători
+    index = max(0, min(len(sortate) - 1, round(p / 100 * len(sortate) + 0.5) - 1))
+    return sortate[index]
+
+
+def rezumat(reusite, erori, durata):
+    """
+    Latențe (medie, p50 / p90 / p95 / p99, max), req/s și interogări SQL
+    pe cerere (din X-Query-Count) pentru rezultatul lui `masoara`.
+    """
+
+    latente = sorted(ms for _, ms, _ in reusite)
+    interogari = [q for _, _, q in reusite if q is not None]
+
+    rezultat = {
+        "cereri": len(reusite) + len(erori),
+        "erori": len(erori),
+        "rps": round(len(reusite) / durata, 1) if durata else None,
+    }
+    if erori:
+        rezultat["exemplu_eroare"] = erori[0]
+    if latente:
+        rezultat.update(
+            {
+                "medie_ms": round(statistics.fmean(latente), 2),
+                "p50_ms": round(_percentila(latente, 50), 2),
+                "p90_ms": round(_percentila(latente, 90), 2),
+                "p95_ms": round(_percentila(latente, 95), 2),
+                "p99_ms": round(_percentila(latente, 99), 2),
+                "max_ms": round(latente[-1], 2),
+            }
+        )
+    if interogari:
+        rezultat.update(
+            {
+                "interogari_medie": round(statistics.fmean(interogari), 2),
+                "interogari_max": max(interogari),
+            }
+        )
+    return rezultat
+
+
+# ---------- scenarii (cel puțin unul pentru fiecare rută din urls.py) ----------
+
+
+class Sesiune:
+    """
+    Starea unei rulări: URL-ul de bază, clienții (user_id, token), tokenul de
+    admin și grupurile de id-uri create pe parcurs (ex: veniturile adăugate
+    de POST, care apoi se modifică și se șterg).
+    """
+
+    def __init__(self, baza, clienti, admin=None, azi=None):
+        self.baza = baza.rstrip("/") + "/api/"
+        self.clienti = clienti
+        self.admin = admin
+        self.grupuri = defaultdict(list)  # nume → [(token, id)]
+        # userii creați de /register/ în rularea asta
+        self.prefix_noi = f"bench_{uuid.uuid4().hex[:8]}_"
+
+        azi = azi or date.today()
+        self.variabile = {
+            "luna": cheie_luna_bugetara(azi),
+            "an_trecut": cheie_luna_bugetara(cu_ani_in_urma(azi, 1)),
+        }
+
+
+class Scenariu:
+    """
+    Cererile unui endpoint. `cale` e relativă la /api/ și poate conține {id}
+    (luat din grupul `din`, cu tokenul celui care l-a creat) și variabilele
+    sesiunii. `corp` e un dict sau `corp(sesiune, i, id)`. `colecteaza` pune
+    id-urile din răspunsuri (rândul creat sau, la /bulk/, lista "create")
+    într-un grup; `consuma` scoate id-urile folosite.
+    `dupa(sesiune)` rulează după măsurătoare (ex: umple un grup din baza de date).
+    """
+
+    def __init__(
+        self,
+        metoda,
+        cale,
+        corp=None,
+        din=None,
+        consuma=False,
+        colecteaza=None,
+        admin=False,
+        dupa=None,
+    ):
+        self.metoda = metoda
+        self.cale = cale
+        self.corp = corp
+        self.din = din
+        self.consuma = consuma
+        self.colecteaza = colecteaza
+        self.admin = admin
+        self.dupa = dupa
+        self.nume = f"{metoda} {cale}"
+        self.scriere = metoda != "GET"
+
+    def cereri(self, sesiune, n):
+        """
+        [(token, url, corp)] pentru cel mult `n` cereri (mai puține dacă
+        grupul `din` are mai puține id-uri).
+        """
+
+        if self.din:
+            grup = sesiune.grupuri[self.din]
+            if self.consuma:
+                elemente = [grup.pop() for _ in range(min(n, len(grup)))]
+            else:
+                elemente = [grup[i % len(grup)] for i in range(n)] if grup else []
+        else:
+            elemente = [
+                (sesiune.clienti[i % len(sesiune.clienti)][1], None) for i in range(n)
+            ]
+
+        rezultat = []
+        for i, (token, id_) in enumerate(elemente):
+            corp = self.corp(sesiune, i, id_) if callable(self.corp) else self.corp
+            url = sesiune.baza + self.cale.format(id=id_, **sesiune.variabile)
+            rezultat.append((sesiune.admin if self.admin else token, url, corp))
+        return rezultat
+
+
+def _inregistrare(sesiune, i, _):
+    username = f"{sesiune.prefix_noi}{i}"
+    return {
+        "username": username,
+        "email": f"{username}@example.com",
+        "password": "parola123",
+    }
+
+
+def _dupa_inregistrare(sesiune):
+    useri = list(
+        User.objects.filter(username__startswith=sesiune.prefix_noi).order_by("id")
+    )
+    noi = [(access_token_pentru(u), u.id) for u in useri]
+    sesiune.grupuri["useri_noi"] = noi
+    # fiecare user nou trimite o cerere de bridge următorului
+    sesiune.grupuri["perechi_noi"] = [
+        (token, urmator) for (token, _), (_, urmator) in zip(noi, noi[1:])
+    ]
+
+
+def _dupa_cereri_bridge(sesiune):
+    tokenuri = {id_: token for token, id_ in sesiune.grupuri["useri_noi"]}
+    sesiune.grupuri["bridge_primite"] = [
+        (tokenuri[to_user_id], pk)
+        for pk, to_user_id in UserBridge.objects.filter(
+            to_user_id__in=tokenuri, accepted=False
+        ).values_list("id", "to_user_id")
+    ]
+
+
+def _extras(sesiune, i, _):
+    randuri = ["data,suma,descriere"] + [
+        f"{date.today().isoformat()},{'-' if j % 3 else ''}{10 + j}.50,bench {j}"
+        for j in range(20)
+    ]
+    return multipart(
+        {"format": "csv", "moneda": "RON"},
+        {"fisier": ("extras.csv", "\n".join(randuri).encode())},
+    )
+
+
+def _crud(resursa, creare, modificare, in_bloc=False):
+    # create → list → retrieve → PATCH → PUT → [bulk] → DELETE, pe rândurile
+    # create aici
+    scenarii = [
+        Scenariu("POST", f"{resursa}/", creare, colecteaza=resursa),
+        Scenariu("GET", f"{resursa}/"),
+        Scenariu("GET", f"{resursa}/{{id}}/", din=resursa),
+        Scenariu("PATCH", f"{resursa}/{{id}}/", modificare, din=resursa),
+        Scenariu("PUT", f"{resursa}/{{id}}/", creare, din=resursa),
+        Scenariu("DELETE", f"{resursa}/{{id}}/", din=resursa, consuma=True),
+    ]
+    if in_bloc:
+        # o săptămână de bonuri deodată, plus o corectură
+        scenarii.insert(
+            -1,
+            Scenariu(
+                "POST",
+                f"{resursa}/bulk/",
+                lambda sesiune, i, id_: {
+                    "create": [creare] * 7,
+                    "update": [{"id": id_, **modificare}],
+                },
+                din=resursa,
+                colecteaza=resursa,
+            ),
+        )
+    return scenarii
+
+
+SCENARII = [
+    # histogramele serverului (/admin/perf/) pornesc de la zero pentru rularea asta
+    Scenariu("DELETE", "admin/perf/", admin=True),
+    # citiri
+    Scenariu("GET", "me/"),
+    Scenariu("GET", "venit/total/"),
+    Scenariu("GET", "venit/status/"),
+    Scenariu("GET", "buget/lunar/"),
+    Scenariu("GET", "buget/lunar/?moneda=EUR"),
+    Scenariu("GET", "buget/lunar/?de_la={an_trecut}&pana_la={luna}"),
+    Scenariu("GET", "grafice/luna/"),
+    Scenariu("GET", "grafice/luna/?de_la={an_trecut}&pana_la={luna}"),
+    Scenariu("GET", "dashboard/"),
+    Scenariu("GET", "economii/istoric/"),
+    Scenariu("GET", "economii/vacanta/"),
+    Scenariu("GET", "fonduri/"),
+    Scenariu("GET", "fonduri/grafic/"),
+    Scenariu("GET", "fonduri/solduri/"),
+    Scenariu("GET", "fonduri/grafic/timeline/"),
+    Scenariu("GET", "fonduri/grafic/timeline/extended/"),
+    Scenariu("GET", "users/list/"),
+    Scenariu("GET", "curs/"),
+    Scenariu("GET", "sync/"),
+    Scenariu("GET", "export/"),
+    Scenariu("GET", "async/buget/lunar/"),
+    Scenariu("GET", "async/grafice/luna/"),
+    Scenariu("GET", "async/venit/status/"),
+    Scenariu("GET", "async/economii/vacanta/"),
+    Scenariu("GET", "async/fonduri/"),
+    Scenariu("GET", "async/dashboard/"),
+    Scenariu("GET", "admin/users/", admin=True),
+    Scenariu("GET", "admin/stats/", admin=True),
+    Scenariu("GET", "admin/stats/?moneda=EUR", admin=True),
+    Scenariu("GET", "admin/stats/istoric/", admin=True),
+    Scenariu("GET", "admin/cache/", admin=True),
+    Scenariu("GET", "admin/perf/", admin=True),
+    # scrieri (ce se creează aici se și șterge)
+    *_crud(
+        "venituri",
+        {"suma": "2500.00", "moneda": "RON"},
+        {"suma": "2600.00"},
+        in_bloc=True,
+    ),
+    *_crud(
+        "cheltuieli-fixe",
+        {"descriere": "bench", "suma": "120.00", "moneda": "RON"},
+        {"suma": "130.00"},
+        in_bloc=True,
+    ),
+    *_crud(
+        "cheltuieli-variabile",
+        {"categorie": "alimente", "suma": "45.50", "moneda": "RON"},
+        {"suma": "47.00"},
+        in_bloc=True,
+    ),
+    *_crud(
+        "economii-vacanta",
+        {"tip": "economii", "suma": "50.00", "moneda": "EUR"},
+        {"suma": "55.00"},
+    ),
+    Scenariu(
+        "POST",
+        "fonduri/miscare/",
+        {"tip": "adauga", "rubrica": "xtb", "suma_eur": "25.00"},
+        colecteaza="miscari",
+    ),
+    Scenariu("PUT", "fonduri/miscare/{id}/", {"suma_eur": "30.00"}, din="miscari"),
+    Scenariu("DELETE", "fonduri/miscare/{id}/", din="miscari", consuma=True),
+    Scenariu("POST", "economii/calculeaza/"),
+    # useri noi: înregistrare, import, bridge, administrare, ștergere
+    Scenariu("POST", "register/", _inregistrare, dupa=_dupa_inregistrare),
+    Scenariu("POST", "import/extras/", _extras, din="useri_noi"),
+    Scenariu(
+        "POST",
+        "bridge/send/",
+        lambda sesiune, i, id_: {"user_id": id_},
+        din="perechi_noi",
+        consuma=True,
+        dupa=_dupa_cereri_bridge,
+    ),
+    Scenariu("GET", "bridge/requests/", din="useri_noi"),
+    Scenariu("POST", "bridge/accept/{id}/", din="bridge_primite", consuma=True),
+    Scenariu("PUT", "admin/users/{id}/", {}, din="useri_noi", admin=True),
+    Scenariu(
+        "DELETE", "admin/users/{id}/delete/", din="useri_noi", consuma=True, admin=True
+    ),
+]
+
+# grupurile cu rânduri create de scenarii, pentru curățenia de la final
+MODELE_GRUPURI = {
+    "venituri": Venit,
+    "cheltuieli-fixe": CheltuialaFixa,
+    "cheltuieli-variabile": CheltuialaVariabila,
+    "economii-vacanta": EconomieVacanta,
+    "miscari": MiscareFond,
+}
+
+
+def ruleaza_scenariu(sesiune, scenariu, cereri, concurenta, incalzire=0):
+    """
+    Măsoară un scenariu; None dacă nu se poate rula (fără admin / fără id-uri).
+    """
+
+    if scenariu.admin and not sesiune.admin:
+        return None
+
+    if incalzire and not scenariu.scriere:
+        # conexiuni, cache-uri, planurile bazei de date
+        lista = scenariu.cereri(sesiune, incalzire)
+        masoara(lambda i: cerere(lista[i][1], lista[i][0]), len(lista), concurenta)
+
+    lista = scenariu.cereri(sesiune, cereri)
+    if not lista:
+        return None
+
+    def una(i):
+        token, url, corp = lista[i]
+        rezultat = cerere(url, token, scenariu.metoda, corp)
+        if scenariu.colecteaza:
+            # cu tokenul celui care a creat rândul, ca să-l poată modifica
+            raspuns = json.loads(rezultat[0])
+            for rand in raspuns["create"] if "create" in raspuns else [raspuns]:
+                sesiune.grupuri[scenariu.colecteaza].append((token, rand["id"]))
+        return rezultat
+
+    reusite, erori, durata = masoara(una, len(lista), concurenta)
+
+    if scenariu.dupa:
+        scenariu.dupa(sesiune)
+
+    return rezumat(reusite, erori, durata)
+
+
+def curata(sesiune):
+    """
+    Șterge ce a rămas de la scenariile de scriere (ex: după erori).
+    """
+
+    for grup, model in MODELE_GRUPURI.items():
+        ids = [id_ for _, id_ in sesiune.grupuri.pop(grup, [])]
+        for obj in model.objects.filter(pk__in=ids):
+            obj.delete()  # cu signals: rezumatul și statisticile rămân corecte
+
+    for user in User.objects.filter(username__startswith=sesiune.prefix_noi):
+        user.delete()
@@ -0,0 +1,140 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+from .utils import get_luna_bugetara
+from .utils_users import get_connected_user_ids
+
+
+ALIAS_CACHE = "raspunsuri"  # din settings.CACHES; LocMem sau fișiere merg fără server
+
+CHEIE_GENERATIE = "finante:gen:{}:{}"  # (user_id, model) → crește la orice scriere
+CHEIE_RASPUNS = "finante:raspuns:{}:{}"  # (endpoint, hash)
+CHEIE_CONTOR = "finante:cache:{}:{}"  # (endpoint, hit / miss)
+
+# endpointurile cache-uite, pentru contoare
+ENDPOINTURI = []
+
+
+def _cache():
+    return caches[ALIAS_CACHE]
+
+
+def _generatie_noua():
+    # timestamp în ns: o generație pierdută din cache se recreează mai nouă
+    return time.time_ns()
+
+
+def invalideaza_raspunsuri(model, *user_ids):
+    """
+    Invalidează răspunsurile cache-uite care depind de rândurile `model`
+    ale userilor dați (după commit, ca să nu se cache-uiască date vechi).
+    """
+
+    chei = [CHEIE_GENERATIE.format(uid, model._meta.model_name) for uid in set(user_ids)]
+
+    def aplica():
+        _cache().set_many(dict.fromkeys(chei, _generatie_noua()), None)
+
+    transaction.on_commit(aplica)
+
+
+def _generatii(user_ids, modele):
+    chei = [
+        CHEIE_GENERATIE.format(uid, model._meta.model_name)
+        for uid in user_ids
+        for model in modele
+    ]
+
+    gasite = _cache().get_many(chei)
+    lipsa = {cheie: _generatie_noua() for cheie in chei if cheie not in gasite}
+    if lipsa:
+        _cache().set_many(lipsa, None)
+        gasite.update(lipsa)
+
+    return [gasite[cheie] for cheie in chei]
+
+
+def _numara(endpoint, rezultat):
+    cheie = CHEIE_CONTOR.format(endpoint, rezultat)
+    try:
+        _cache().incr(cheie)
+    except ValueError:
+        # primul acces (sau cheia a ieșit din cache)
+        if not _cache().add(cheie, 1, None):
+            _cache().incr(cheie)
+
+
+def contoare_cache():
+    """
+    {endpoint: {"hit", "miss", "rata"}} pentru endpointurile cache-uite.
+    """
+
+    chei = [
+        CHEIE_CONTOR.format(e, r) for e in ENDPOINTURI for r in ("hit", "miss")
+    ]
+    valori = _cache().get_many(chei)
+
+    rezultat = {}
+    for endpoint in ENDPOINTURI:
+        hit = valori.get(CHEIE_CONTOR.format(endpoint, "hit"), 0)
+        miss = valori.get(CHEIE_CONTOR.format(endpoint, "miss"), 0)
+        rezultat[endpoint] = {
+            "hit": hit,
+            "miss": miss,
+            "rata": round(hit / (hit + miss), 4) if hit + miss else None,
+        }
+    return rezultat
+
+
+def cache_raspuns(modele, doar_userul=False):
+    """
+    Cache-aside pentru un endpoint GET. Cheia: endpointul, query string-ul,
+    userii (conectați, sortați – partenerii au aceeași intrare), perioada
+    bugetară și generațiile lui `modele` pentru acești useri.
+    Se pune sub @get_conditionat, direct pe funcție.
+    """
+
+    def decorator(view):
+        endpoint = view.__name__
+        ENDPOINTURI.append(endpoint)
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if doar_userul:
+                user_ids = [request.user.id]
+            else:
+                user_ids = sorted(get_connected_user_ids(request.user))
+
+            start, _ = get_luna_bugetara()
+            semnatura = "|".join(
+                [
+                    request.META.get("QUERY_STRING", ""),
+                    ",".join(map(str, user_ids)),
+                    start.isoformat(),
+                    ",".join(map(str, _generatii(user_ids, modele))),
+                ]
+            )
+            cheie = CHEIE_RASPUNS.format(
+                endpoint, hashlib.md5(semnatura.encode()).hexdigest()
+            )
+
+            data = _cache().get(cheie)
+            if data is not None:
+                _numara(endpoint, "hit")
+                return Response(data)
+
+            _numara(endpoint, "miss")
+            response = view(request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                _cache().set(cheie, response.data)
+            return response
+
+        return wrapper
+
+    return decorator
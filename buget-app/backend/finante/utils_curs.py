@@ -0,0 +1,192 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db.models import (
+    Case,
+    Count,
+    DecimalField,
+    F,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    When,
+)
+
+from .models import CursValutar
+from .utils_rezumat import SURSE_REZUMAT
+from .utils_versiuni import CHEIE_VERSIUNE_CURSURI
+
+
+# (moneda, baza, data) → curs, valabil cât timp versiunea cursurilor din
+# cache-ul comun nu se schimbă: un import din alt proces (importa_cursuri)
+# o crește și golește astfel și cache-ul din workeri; signals.py îl golește
+# imediat în procesul care scrie
+_cache_cursuri = {}
+_versiune_cursuri = None
+MAX_CACHE_CURSURI = 10000
+
+
+def _verifica_versiunea():
+    global _versiune_cursuri
+
+    versiune = cache.get(CHEIE_VERSIUNE_CURSURI)
+    if versiune != _versiune_cursuri:
+        _cache_cursuri.clear()
+        _versiune_cursuri = versiune
+
+
+def curs_la(moneda, baza, data):
+    """
+    Cursul valabil la `data` (ultimul publicat până atunci), sau None.
+    Lipsa cursului nu se ține minte: poate apărea la următorul import.
+    """
+
+    if moneda == baza:
+        return Decimal("1")
+
+    _verifica_versiunea()
+
+    cheie = (moneda, baza, data)
+    curs = _cache_cursuri.get(cheie)
+    if curs is None:
+        curs = (
+            CursValutar.objects.filter(moneda=moneda, moneda_baza=baza, data__lte=data)
+            .order_by("-data")
+            .values_list("curs", flat=True)
+            .first()
+        )
+        if curs is not None:
+            if len(_cache_cursuri) >= MAX_CACHE_CURSURI:
+                _cache_cursuri.clear()
+            _cache_cursuri[cheie] = curs
+
+    return curs
+
+
+def goleste_cache_cursuri():
+    _cache_cursuri.clear()
+
+
+def suma_in_moneda(baza, camp_suma="suma", camp_moneda="moneda", camp_data="data"):
+    """
+    Expresie SQL: suma rândului convertită în `baza`, cu cursul de la data lui.
+    NULL dacă lipsește cursul.
+    """
+
+    curs = (
+        CursValutar.objects.filter(
+            moneda=OuterRef(camp_moneda),
+            moneda_baza=baza,
+            data__lte=OuterRef(camp_data),
+        )
+        .order_by("-data")
+        .values("curs")[:1]
+    )
+
+    return Case(
+        When(**{camp_moneda: baza}, then=F(camp_suma)),
+        default=F(camp_suma) * Subquery(curs),
+        output_field=DecimalField(max_digits=24, decimal_places=8),
+    )
+
+
+def total_convertit(qs, baza):
+    """
+    Totalul lui `qs` în `baza`, într-un singur query.
+    Returnează (total, câte rânduri nu au avut curs).
+    """
+
+    rezultat = qs.annotate(convertit=suma_in_moneda(baza)).aggregate(
+        total=Sum("convertit"),
+        fara_curs=Count("id", filter=Q(convertit__isnull=True)),
+    )
+
+    total = (rezultat["total"] or Decimal("0")).quantize(Decimal("0.01"))
+    return total, rezultat["fara_curs"]
+
+
+def totaluri_convertite(baza, **filtre):
+    """
+    Totalurile venit / fixe / variabile (după `filtre`) convertite în `baza`,
+    câte un query pe tabelă. Returnează ({tip: total}, rânduri fără curs).
+    """
+
+    totaluri = {}
+    fara_curs = 0
+
+    for model, tip in SURSE_REZUMAT.items():
+        totaluri[tip], lipsa = total_convertit(model.objects.filter(**filtre), baza)
+        fara_curs += lipsa
+
+    return totaluri, fara_curs
+
+
+def zile_fara_curs(baza, **filtre):
+    """
+    Zilele (în ordine) cu rânduri venit / fixe / variabile (după `filtre`)
+    care nu au curs spre `baza`; câte un query pe tabelă.
+    """
+
+    zile = set()
+    for model in SURSE_REZUMAT:
+        zile.update(
+            model.objects.filter(**filtre)
+            .annotate(convertit=suma_in_moneda(baza))
+            .filter(convertit__isnull=True)
+            .values_list("data", flat=True)
+            .distinct()
+        )
+
+    return sorted(zile)
+
+
+def totaluri_convertite_grupate(baza, campuri, **filtre):
+    """
+    Ca `totaluri_convertite`, grupat pe `campuri` (un query pe tabelă).
+    Returnează ({valori: {tip: total}}, {valori: rânduri fără curs});
+    `valori` e tuplul câmpurilor, doar pentru grupurile cu rânduri
+    (respectiv cu rânduri fără curs).
+    """
+
+    totaluri = defaultdict(
+        lambda: dict.fromkeys(SURSE_REZUMAT.values(), Decimal("0"))
+    )
+    fara_curs = defaultdict(int)
+
+    for model, tip in SURSE_REZUMAT.items():
+        randuri = (
+            model.objects.filter(**filtre)
+            .annotate(convertit=suma_in_moneda(baza))
+            .values_list(*campuri)
+            .annotate(
+                total=Sum("convertit"),
+                fara_curs=Count("id", filter=Q(convertit__isnull=True)),
+            )
+            .order_by()
+        )
+        for *valori, total, lipsa in randuri:
+            total = total or Decimal("0")
+            totaluri[tuple(valori)][tip] = total.quantize(Decimal("0.01"))
+            if lipsa:
+                fara_curs[tuple(valori)] += lipsa
+
+    return dict(totaluri), dict(fara_curs)
+
+
+def totaluri_convertite_pe_luni(baza, luni, **filtre):
+    """
+    Ca `totaluri_convertite`, grupat pe luna bugetară (un query pe tabelă).
+    Returnează ({luna: {tip: total}}, rânduri fără curs), cu toate lunile.
+    """
+
+    grupate, fara_curs = totaluri_convertite_grupate(
+        baza, ["luna_bugetara"], luna_bugetara__range=(luni[0], luni[-1]), **filtre
+    )
+    zero = dict.fromkeys(SURSE_REZUMAT.values(), Decimal("0"))
+
+    return (
+        {luna: grupate.get((luna,), zero) for luna in luni},
+        sum(fara_curs.values()),
+    )
@@ -0,0 +1,168 @@
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+import multiprocessing
+
+import django
+from django.contrib.auth.models import User
+from django.db import connections, transaction
+
+from .models import EconomieLunara, Moneda, TipRezumat
+from .utils import cheie_luna_bugetara, get_luna_bugetara, luni_bugetare
+from .utils_cache import invalideaza_raspunsuri
+from .utils_curs import totaluri_convertite_grupate
+from .utils_users import vecini_pentru
+from .utils_versiuni import creste_versiune
+
+
+MARIME_BUCATA = 200  # useri pe bucată de lucru (un set de query-uri grupate)
+
+
+def ultima_luna_incheiata():
+    # perioada de dinaintea celei curente
+    start, _ = get_luna_bugetara()
+    return cheie_luna_bugetara(start.replace(day=1))
+
+
+def solduri_pe_luni(user_ids, de_la=None, pana_la=None):
+    """
+    Soldul în EUR (venit − cheltuieli ale userilor conectați) al fiecărei luni
+    bugetare, pentru fiecare user. Câte un query grupat pe tabelă, indiferent
+    de numărul de useri și de luni.
+    Returnează ({user_id: {luna: sold}}, {(user_id, luna): rânduri fără curs});
+    fără `de_la`, lunile pornesc de la prima lună cu date a gospodăriei și
+    merg până la `pana_la` (inclusiv golurile). Lunile în care gospodăria are
+    rânduri fără curs lipsesc din solduri (un sold parțial ar fi greșit).
+    """
+
+    pana_la = pana_la or ultima_luna_incheiata()
+    vecini = vecini_pentru(user_ids)
+    gospodarii = {uid: [uid, *vecini[uid]] for uid in user_ids}
+
+    filtre = {"luna_bugetara__lte": pana_la}
+    if de_la:
+        filtre["luna_bugetara__gte"] = de_la
+
+    totaluri, lipsa = totaluri_convertite_grupate(
+        Moneda.EUR,
+        ["user_id", "luna_bugetara"],
+        user_id__in={uid for membri in gospodarii.values() for uid in membri},
+        **filtre,
+    )
+
+    # soldul fiecărui user, pe luni
+    pe_user = defaultdict(dict)
+    for (uid, luna), t in totaluri.items():
+        cheltuieli = t[TipRezumat.FIXA] + t[TipRezumat.VARIABILA]
+        pe_user[uid][luna] = t[TipRezumat.VENIT] - cheltuieli
+
+    # rândurile fără curs ale fiecărui user, pe luni
+    lipsa_pe_user = defaultdict(dict)
+    for (uid, luna), numar in lipsa.items():
+        lipsa_pe_user[uid][luna] = numar
+
+    solduri = {}
+    fara_curs = {}
+    for uid, membri in gospodarii.items():
+        luni_cu_date = [luna for m in membri for luna in pe_user[m]]
+        if not luni_cu_date and not de_la:
+            solduri[uid] = {}
+            continue
+
+        solduri[uid] = {}
+        for luna in luni_bugetare(de_la or min(luni_cu_date), pana_la):
+            lipsesc = sum(lipsa_pe_user[m].get(luna, 0) for m in membri)
+            if lipsesc:
+                fara_curs[(uid, luna)] = lipsesc
+                continue
+            solduri[uid][luna] = sum(
+                (pe_user[m].get(luna, Decimal("0")) for m in membri), Decimal("0")
+            )
+
+    return solduri, fara_curs
+
+
+@transaction.atomic
+def scrie_solduri(solduri):
+    """
+    Scrie {user_id: {luna: sold}} în EconomieLunara, cu un singur upsert
+    în bloc. Returnează nr. de rânduri scrise.
+    """
+
+    randuri = [
+        EconomieLunara(user_id=uid, luna=luna, sold=sold)
+        for uid, luni in solduri.items()
+        for luna, sold in luni.items()
+    ]
+
+    EconomieLunara.objects.bulk_create(
+        randuri,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=["user", "luna"],
+        update_fields=["sold"],
+    )
+
+    # bulk_create nu trimite signals
+    scrisi = {r.user_id for r in randuri}
+    if scrisi:
+        creste_versiune(*scrisi)
+        invalideaza_raspunsuri(EconomieLunara, *scrisi)
+
+    return len(randuri)
+
+
+def inchide_luni(user_ids, de_la=None, pana_la=None):
+    """
+    Închide lunile bugetare încheiate ale userilor dați.
+    Returnează (nr. de rânduri EconomieLunara scrise, {(user_id, luna):
+    rânduri fără curs} pentru lunile sărite).
+    """
+
+    solduri, fara_curs = solduri_pe_luni(user_ids, de_la, pana_la)
+    return scrie_solduri(solduri), fara_curs
+
+
+def _solduri_bucata(argumente):
+    # rulează în procesele din pool: doar citiri, scrierea o face procesul părinte
+    try:
+        return solduri_pe_luni(*argumente)
+    finally:
+        connections.close_all()
+
+
+def inchide_luni_toti(
+    user_ids=None, de_la=None, pana_la=None, procese=1, marime=MARIME_BUCATA
+):
+    """
+    Închide lunile pentru toți userii (sau cei dați), pe bucăți de `marime`
+    useri. Cu `procese` > 1, soldurile bucăților se calculează în paralel
+    într-un pool de procese, iar upsert-urile se fac aici, pe rând
+    (fără blocaje între scriitori).
+    Generator: dă (rânduri scrise, luni sărite fără curs) pe fiecare bucată
+    terminată, ca `inchide_luni`.
+    """
+
+    if user_ids is None:
+        user_ids = list(User.objects.order_by("id").values_list("id", flat=True))
+
+    bucati = [
+        (user_ids[i : i + marime], de_la, pana_la)
+        for i in range(0, len(user_ids), marime)
+    ]
+
+    if procese <= 1:
+        for bucata in bucati:
+            yield inchide_luni(*bucata)
+        return
+
+    # procesele noi (spawn) pornesc Django de la zero, cu conexiunile lor;
+    # inițializatorul trebuie să nu importe modele (django.setup le încarcă)
+    connections.close_all()
+    with ProcessPoolExecutor(
+        max_workers=procese,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=django.setup,
+    ) as pool:
+        for solduri, fara_curs in pool.map(_solduri_bucata, bucati):
+            yield scrie_solduri(solduri), fara_curs
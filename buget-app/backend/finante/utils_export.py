@@ -0,0 +1,97 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Venit, CheltuialaFixa, CheltuialaVariabila, MiscareFond
+
+
+MARIME_BUCATA = 2000  # rânduri aduse o dată din cursorul de pe server
+
+COLOANE_EXPORT = [
+    "tip",
+    "id",
+    "username",
+    "data",
+    "suma",
+    "moneda",
+    "categorie",
+    "descriere",
+    "operatie",
+    "rubrica",
+    "suma_eur",
+    "suma_ron",
+    "observatii",
+]
+
+# tip → (model, {coloană din export: câmp din model})
+SURSE_EXPORT = {
+    "venit": (Venit, {"suma": "suma", "moneda": "moneda"}),
+    "cheltuiala_fixa": (
+        CheltuialaFixa,
+        {"suma": "suma", "moneda": "moneda", "descriere": "descriere"},
+    ),
+    "cheltuiala_variabila": (
+        CheltuialaVariabila,
+        {"suma": "suma", "moneda": "moneda", "categorie": "categorie"},
+    ),
+    "miscare_fond": (
+        MiscareFond,
+        {
+            "operatie": "tip",
+            "rubrica": "rubrica",
+            "suma_eur": "suma_eur",
+            "suma_ron": "suma_ron",
+            "observatii": "observatii",
+        },
+    ),
+}
+
+
+def randuri_export(user_ids, de_la=None, pana_la=None):
+    """
+    Generator de dict-uri (COLOANE_EXPORT) cu toate tranzacțiile userilor.
+    Se citește cu .iterator(), deci memoria nu crește cu istoricul.
+    """
+
+    for tip, (model, campuri) in SURSE_EXPORT.items():
+        qs = model.objects.filter(user_id__in=user_ids)
+        if de_la:
+            qs = qs.filter(data__gte=de_la)
+        if pana_la:
+            qs = qs.filter(data__lte=pana_la)
+
+        surse = ["id", "user__username", "data", *campuri.values()]
+        qs = qs.order_by("data", "id").values_list(*surse)
+
+        for valori in qs.iterator(chunk_size=MARIME_BUCATA):
+            rand = dict.fromkeys(COLOANE_EXPORT, "")
+            rand["tip"] = tip
+            rand["id"], rand["username"], rand["data"] = valori[:3]
+            for coloana, valoare in zip(campuri, valori[3:]):
+                rand[coloana] = "" if valoare is None else valoare
+            yield rand
+
+
+class _Ecou:
+    # csv.writer scrie în "fișier"; noi vrem doar textul rândului
+    def write(self, valoare):
+        return valoare
+
+
+def export_csv(randuri):
+    writer = csv.writer(_Ecou())
+    yield writer.writerow(COLOANE_EXPORT)
+    for rand in randuri:
+        yield writer.writerow([rand[c] for c in COLOANE_EXPORT])
+
+
+def export_ndjson(randuri):
+    for rand in randuri:
+        yield json.dumps(rand, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
+
+
+FORMATE_EXPORT = {
+    "csv": (export_csv, "text/csv; charset=utf-8"),
+    "ndjson": (export_ndjson, "application/x-ndjson; charset=utf-8"),
+}
@@ -0,0 +1,72 @@
+from django.contrib.auth.models import User
+from django.db.models import F, Sum, Window
+
+from .models import MiscareFond
+
+
+def _timeline():
+    return {
+        "labels": [],
+        "datasets": [
+            {"label": "EUR", "data": []},
+            {"label": "RON", "data": []},
+        ],
+    }
+
+
+def _adauga_zi(timeline, zi, eur, ron):
+    timeline["labels"].append(zi)
+    timeline["datasets"][0]["data"].append(eur or 0)
+    timeline["datasets"][1]["data"].append(ron or 0)
+
+
+def timeline_fonduri(user_ids):
+    """
+    Soldurile cumulate EUR / RON pe zile, pentru toți userii dați (total)
+    și separat pe fiecare user, dintr-un singur query cu SUM(...) OVER (...).
+    Returnează (total, per_user) cu per_user = {username: timeline}.
+    """
+
+    pe_user = {"partition_by": [F("user_id")], "order_by": F("data").asc()}
+    pe_total = {"order_by": F("data").asc()}
+
+    # cadrul implicit (RANGE ... CURRENT ROW) include toată ziua curentă,
+    # deci rândurile din aceeași zi au același sold → DISTINCT le comprimă
+    randuri = (
+        MiscareFond.objects.filter(user_id__in=user_ids)
+        .values("user_id", "user__username", "data")
+        .annotate(
+            sold_eur=Window(Sum("suma_eur"), **pe_user),
+            sold_ron=Window(Sum("suma_ron"), **pe_user),
+            total_eur=Window(Sum("suma_eur"), **pe_total),
+            total_ron=Window(Sum("suma_ron"), **pe_total),
+        )
+        .distinct()
+        .order_by("data", "user_id")
+    )
+
+    total = _timeline()
+    per_user = {}
+
+    for r in randuri:
+        if not total["labels"] or total["labels"][-1] != r["data"]:
+            _adauga_zi(total, r["data"], r["total_eur"], r["total_ron"])
+
+        timeline = per_user.setdefault(
+            (r["user_id"], r["user__username"]), _timeline()
+        )
+        _adauga_zi(timeline, r["data"], r["sold_eur"], r["sold_ron"])
+
+    # userii conectați fără nicio mișcare apar cu un grafic gol
+    if len(per_user) < len(set(user_ids)):
+        gasiti = {user_id for user_id, _ in per_user}
+        for user_id, username in User.objects.filter(id__in=user_ids).exclude(
+            id__in=gasiti
+        ).values_list("id", "username"):
+            per_user[(user_id, username)] = _timeline()
+
+    per_user = {
+        username: per_user[(user_id, username)] for user_id, username in sorted(per_user)
+    }
+
+    return total, per_user
@@ -0,0 +1,339 @@
+import csv
+import io
+import itertools
+import math
+import re
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+
+from .instrumentare import buget_parte
+from .models import Venit, CheltuialaVariabila, CategorieVariabila, Moneda
+from .utils_rezumat import SURSE_REZUMAT, cheie_instanta
+from .utils_scrieri import dupa_scriere_in_bloc
+from .utils_statistici import felie, zi_din
+
+
+MARIME_LOT = 1000  # rânduri pe bulk_create / tranzacție
+MAX_ERORI_RAPORTATE = 500
+
+FORMATE_DATA = ("%Y-%m-%d", "%d.%m.%Y", "%d/%m/%Y", "%d-%m-%Y", "%Y%m%d")
+# lungimea fiecărui format; restul (ora, fusul din OFX) se ignoră
+_LUNGIMI_DATA = {fmt: len(date(2000, 1, 1).strftime(fmt)) for fmt in FORMATE_DATA}
+
+# numele de coloane acceptate în CSV-urile băncilor → câmpul nostru
+COLOANE = {
+    "data": {"data", "date", "data tranzactiei", "booking date", "transaction date"},
+    "suma": {"suma", "sumă", "amount", "valoare"},
+    "debit": {"debit"},
+    "credit": {"credit"},
+    "moneda": {"moneda", "monedă", "currency", "valuta"},
+    "descriere": {"descriere", "description", "detalii", "details", "name", "memo"},
+    "categorie": {"categorie", "category"},
+}
+
+# cuvânt din descriere → categorie (se pot suprascrie din settings)
+REGULI_CATEGORII = getattr(
+    settings,
+    "FINANTE_REGULI_CATEGORII",
+    {
+        "lidl": "alimente",
+        "kaufland": "alimente",
+        "carrefour": "alimente",
+        "mega image": "alimente",
+        "profi": "alimente",
+        "auchan": "alimente",
+        "farmacia": "sanatate",
+        "catena": "sanatate",
+        "dr.max": "sanatate",
+        "omv": "auto",
+        "petrom": "auto",
+        "rompetrol": "auto",
+        "mol ": "auto",
+        "netflix": "divertisment",
+        "spotify": "divertisment",
+        "cinema": "cultura",
+        "librarie": "cultura",
+        "emag": "shopping",
+        "zara": "shopping",
+        "booking": "vacanta",
+        "airbnb": "vacanta",
+        "trading212": "investitii",
+        "xtb": "investitii",
+    },
+)
+CATEGORIE_IMPLICITA = "neprevazute"
+
+
+def _data(text):
+    text = text.strip()
+    for fmt, lungime in _LUNGIMI_DATA.items():
+        try:
+            return datetime.strptime(text[:lungime], fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"dată invalidă: {text!r}")
+
+
+# doar separatori de mii, fără zecimale: 1.234 / 1,234 / 1.234.567
+_DOAR_MII = re.compile(r"[-+]?[1-9]\d{0,2}([.,])\d{3}(?:\1\d{3})*")
+
+
+def _suma(text):
+    text = (text or "").strip().replace(" ", "").replace("\xa0", "")
+    if not text:
+        return Decimal("0")
+
+    # 1.234,56 (RO) sau 1,234.56 (EN)
+    if "," in text and "." in text:
+        if text.rfind(",") > text.rfind("."):
+            text = text.replace(".", "").replace(",", ".")
+        else:
+            text = text.replace(",", "")
+    elif mii := _DOAR_MII.fullmatch(text):
+        # extrasele au cel mult două zecimale: trei cifre după separator = mii
+        text = text.replace(mii.group(1), "")
+    elif "," in text:
+        text = text.replace(",", ".")
+
+    try:
+        return Decimal(text)
+    except InvalidOperation:
+        raise ValueError(f"sumă invalidă: {text!r}")
+
+
+def categorie_pentru(descriere, categorie=""):
+    categorie = (categorie or "").strip().lower()
+    if categorie in CategorieVariabila.values:
+        return categorie
+
+    descriere = (descriere or "").lower()
+    for cuvant, din_regula in REGULI_CATEGORII.items():
+        if cuvant in descriere:
+            return din_regula
+
+    return CATEGORIE_IMPLICITA
+
+
+# ---------- citire (în flux, rând cu rând) ----------
+
+
+def randuri_csv(text):
+    """
+    Generator de dict-uri normalizate dintr-un CSV; delimitatorul se ghicește
+    din antet. Fișierul nu se încarcă niciodată întreg în memorie.
+    """
+
+    antet = text.readline()
+    if not antet:
+        return
+
+    try:
+        dialect = csv.Sniffer().sniff(antet, delimiters=",;\t")
+    except csv.Error:
+        dialect = csv.excel
+
+    reader = csv.reader(itertools.chain([antet], text), dialect)
+    coloane = {}
+    for i, nume in enumerate(next(reader)):
+        nume = nume.strip().lower()
+        for camp, alias in COLOANE.items():
+            if nume in alias:
+                coloane.setdefault(camp, i)
+
+    if "data" not in coloane or not ({"suma", "debit", "credit"} & set(coloane)):
+        raise ValueError(
+            "CSV-ul trebuie să aibă coloanele data și suma (sau debit/credit)"
+        )
+
+    for nr, valori in enumerate(reader, start=2):
+        if not any(v.strip() for v in valori):
+            continue
+
+        rand = {
+            camp: valori[i] if i < len(valori) else "" for camp, i in coloane.items()
+        }
+        rand["rand"] = nr
+        yield rand
+
+
+_TAG_OFX = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+
+
+def _taguri_ofx(text, marime_bucata=64 * 1024):
+    rest = ""
+    for bucata in iter(lambda: text.read(marime_bucata), ""):
+        rest += bucata
+        # ultimul tag poate fi tăiat la jumătate → îl păstrăm pentru bucata următoare
+        ultim = rest.rfind("<")
+        if ultim < 0:
+            rest = ""  # antetul OFX de dinaintea primului tag
+            continue
+
+        for m in _TAG_OFX.finditer(rest, 0, ultim):
+            yield m.group(1) == "/", m.group(2).upper(), m.group(3).strip()
+        rest = rest[ultim:]
+
+    for m in _TAG_OFX.finditer(rest):
+        yield m.group(1) == "/", m.group(2).upper(), m.group(3).strip()
+
+
+def randuri_ofx(text):
+    """
+    Generator de dict-uri normalizate din <STMTTRN>-urile unui OFX (SGML sau XML).
+    """
+
+    moneda = ""
+    curent = None
+    nr = 0
+
+    for inchis, tag, valoare in _taguri_ofx(text):
+        if tag == "CURDEF" and not inchis:
+            moneda = valoare
+        elif tag == "STMTTRN":
+            if not inchis:
+                nr += 1
+                curent = {"rand": nr, "moneda": moneda}
+            elif curent is not None:
+                yield curent
+                curent = None
+        elif curent is not None and not inchis:
+            if tag == "DTPOSTED":
+                curent["data"] = valoare
+            elif tag == "TRNAMT":
+                curent["suma"] = valoare
+            elif tag == "CURRENCY":
+                curent["moneda"] = valoare
+            elif tag in ("NAME", "MEMO"):
+                curent["descriere"] = f"{curent.get('descriere', '')} {valoare}".strip()
+
+
+# ---------- import ----------
+
+
+def _tranzactie(rand, user, moneda_implicita):
+    if rand.get("suma", "").strip():
+        suma = _suma(rand["suma"])
+    else:
+        suma = _suma(rand.get("credit")) - abs(_suma(rand.get("debit")))
+
+    if not suma:
+        raise ValueError("sumă lipsă sau zero")
+
+    moneda = (rand.get("moneda") or moneda_implicita).strip().upper()
+    if moneda not in Moneda.values:
+        raise ValueError(f"monedă necunoscută: {moneda!r}")
+
+    data = _data(rand.get("data", ""))
+
+    # intrările sunt venituri, ieșirile cheltuieli variabile
+    if suma > 0:
+        obj = Venit(user=user, suma=suma, moneda=moneda, data=data)
+    else:
+        obj = CheltuialaVariabila(
+            user=user,
+            suma=-suma,
+            moneda=moneda,
+            data=data,
+            categorie=categorie_pentru(rand.get("descriere"), rand.get("categorie")),
+        )
+
+    obj.seteaza_luna_bugetara()
+    obj.full_clean(exclude=["user"], validate_unique=False)
+    return obj
+
+
+def buget_lot(lot):
+    """
+    Interogările permise pentru scrierea unui lot: tranzacția, bulk_create-urile
+    (pe bucăți, după limita de parametri a bazei) și, pe fiecare cheie de
+    rezumat / statistici atinsă (ca în aplica_in_bloc / inregistreaza_in_bloc),
+    un UPDATE plus SAVEPOINT, INSERT, RELEASE la prima scriere pe cheie.
+    """
+
+    inserari = 0
+    for model in (Venit, CheltuialaVariabila):
+        obiecte = [o for o in lot if isinstance(o, model)]
+        if obiecte:
+            campuri = model._meta.concrete_fields
+            bucata = connection.ops.bulk_batch_size(campuri, obiecte)
+            inserari += math.ceil(len(obiecte) / bucata)
+
+    chei = set()
+    for obj in lot:
+        tip, f = SURSE_REZUMAT[type(obj)], felie(obj.user_id)
+        chei.add(cheie_instanta(obj))
+        chei.add((zi_din(obj.created_at), tip, obj.moneda, f))
+        chei.add((tip, obj.moneda, f))
+
+    return 2 + inserari + 4 * len(chei)
+
+
+@transaction.atomic
+def _salveaza_lot(lot):
+    venituri = [o for o in lot if isinstance(o, Venit)]
+    cheltuieli = [o for o in lot if isinstance(o, CheltuialaVariabila)]
+
+    Venit.objects.bulk_create(venituri)
+    CheltuialaVariabila.objects.bulk_create(cheltuieli)
+
+    # bulk_create nu trimite signals → rezumatul și statisticile se actualizează pe chei
+    dupa_scriere_in_bloc(venituri)
+    dupa_scriere_in_bloc(cheltuieli)
+
+    return len(venituri), len(cheltuieli)
+
+
+def format_din_nume(nume):
+    return "ofx" if str(nume).lower().endswith((".ofx", ".qfx")) else "csv"
+
+
+def importa_extras(fisier, user, format="csv", moneda=Moneda.EUR):
+    """
+    Importă un extras de cont (fișier binar, CSV sau OFX) pentru `user`.
+    Rândurile se citesc în flux și se scriu în loturi de MARIME_LOT, fiecare
+    lot în tranzacția lui. Rândurile greșite nu opresc importul, ci apar în
+    raportul de erori.
+    """
+
+    text = io.TextIOWrapper(fisier, encoding="utf-8-sig", errors="replace", newline="")
+    randuri = randuri_ofx(text) if format == "ofx" else randuri_csv(text)
+
+    rezultat = {"venituri": 0, "cheltuieli": 0, "erori_total": 0, "erori": []}
+    lot = []
+
+    def scrie():
+        with buget_parte(f"import extras, lot de {len(lot)}", buget_lot(lot)):
+            venituri, cheltuieli = _salveaza_lot(lot)
+        rezultat["venituri"] += venituri
+        rezultat["cheltuieli"] += cheltuieli
+        lot.clear()
+
+    try:
+        for rand in randuri:
+            try:
+                lot.append(_tranzactie(rand, user, moneda))
+            except (ValueError, ValidationError) as e:
+                rezultat["erori_total"] += 1
+                if len(rezultat["erori"]) < MAX_ERORI_RAPORTATE:
+                    rezultat["erori"].append({"rand": rand["rand"], "eroare": _mesaj(e)})
+
+            if len(lot) >= MARIME_LOT:
+                scrie()
+
+        if lot:
+            scrie()
+    finally:
+        text.detach()
+
+    return rezultat
+
+
+def _mesaj(eroare):
+    mesaje = getattr(eroare, "message_dict", None)
+    if mesaje:
+        return "; ".join(f"{camp}: {' '.join(m)}" for camp, m in mesaje.items())
+    return str(eroare)
@@ -0,0 +1,247 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+
+from .models import (
+    Venit,
+    CheltuialaFixa,
+    CheltuialaVariabila,
+    RezumatLunar,
+    TipRezumat,
+)
+
+
+# modelele care alimentează rezumatul și tipul lor
+SURSE_REZUMAT = {
+    Venit: TipRezumat.VENIT,
+    CheltuialaFixa: TipRezumat.FIXA,
+    CheltuialaVariabila: TipRezumat.VARIABILA,
+}
+
+
+def cheie_rezumat(model, user_id, luna, moneda, categorie=""):
+    """
+    Cheia (user, lună, monedă, tip, categorie) în care intră un rând.
+    """
+
+    tip = SURSE_REZUMAT[model]
+    if tip != TipRezumat.VARIABILA:
+        categorie = ""
+
+    return (user_id, luna, moneda, tip, categorie)
+
+
+def cheie_instanta(instance):
+    return cheie_rezumat(
+        type(instance),
+        instance.user_id,
+        instance.luna_bugetara,
+        instance.moneda,
+        getattr(instance, "categorie", ""),
+    )
+
+
+def incrementeaza(model, chei, total, numar):
+    """
+    Adaugă `total` / `numar` la rândul lui `model` identificat de `chei`,
+    printr-un UPDATE cu F() (fără citire). Scăderile nu creează rânduri noi
+    (ex: la ștergerea unui user în cascadă).
+    """
+
+    total = Decimal(str(total))
+    rand = model.objects.filter(**chei)
+
+    if rand.update(total=F("total") + total, numar=F("numar") + numar):
+        return
+
+    if numar <= 0:
+        return
+
+    try:
+        with transaction.atomic():
+            model.objects.create(**chei, total=total, numar=numar)
+    except IntegrityError:
+        # creat între timp de altă cerere
+        rand.update(total=F("total") + total, numar=F("numar") + numar)
+
+
+def aplica_delta(cheie, suma, numar):
+    """
+    Adaugă `suma` / `numar` la rândul de rezumat al cheii.
+    """
+
+    user_id, luna, moneda, tip, categorie = cheie
+    incrementeaza(
+        RezumatLunar,
+        dict(user_id=user_id, luna=luna, moneda=moneda, tip=tip, categorie=categorie),
+        suma,
+        numar,
+    )
+
+
+def aplica_in_bloc(obiecte, semn=1, inlocuite=()):
+    """
+    Aplică în rezumat rânduri scrise fără signals (bulk_create, ștergeri în bloc):
+    o singură actualizare pe cheie, nu una pe rând. `semn=-1` pentru scoatere;
+    `inlocuite`: rândurile de dinainte de un bulk_update, scăzute în același pas.
+    """
+
+    delte = defaultdict(lambda: (Decimal("0"), 0))
+    for obj, s in [*((o, semn) for o in obiecte), *((o, -semn) for o in inlocuite)]:
+        cheie = cheie_instanta(obj)
+        total, numar = delte[cheie]
+        delte[cheie] = (total + s * Decimal(str(obj.suma)), numar + s)
+
+    for cheie, (total, numar) in delte.items():
+        if total or numar:
+            aplica_delta(cheie, total, numar)
+
+
+def rezumat_luna(user_ids, luna, tipuri=None):
+    """
+    Totalurile lunii grupate pe (tip, categorie), pentru toți userii dați.
+    Returnează {(tip, categorie): total}.
+    """
+
+    qs = RezumatLunar.objects.filter(user_id__in=user_ids, luna=luna, numar__gt=0)
+    if tipuri:
+        qs = qs.filter(tip__in=tipuri)
+
+    randuri = (
+        qs.values("tip", "categorie")
+        .annotate(suma=Sum("total"))
+        .order_by("tip", "categorie")
+    )
+
+    return {(r["tip"], r["categorie"]): r["suma"] for r in randuri}
+
+
+def rezumat_luni(user_ids, luni, tipuri=None):
+    """
+    Ca `rezumat_luna`, pentru mai multe luni bugetare, dintr-un singur query
+    grupat. Returnează {luna: {(tip, categorie): total}}, cu toate lunile
+    cerute (și cele goale).
+    """
+
+    qs = RezumatLunar.objects.filter(
+        user_id__in=user_ids, luna__range=(luni[0], luni[-1]), numar__gt=0
+    )
+    if tipuri:
+        qs = qs.filter(tip__in=tipuri)
+
+    randuri = (
+        qs.values("luna", "tip", "categorie")
+        .annotate(suma=Sum("total"))
+        .order_by("luna", "tip", "categorie")
+    )
+
+    rezultat = {luna: {} for luna in luni}
+    for r in randuri:
+        rezultat[r["luna"]][(r["tip"], r["categorie"])] = r["suma"]
+
+    return rezultat
+
+
+def total_tip(rezumat, tip):
+    return sum((v for (t, _), v in rezumat.items() if t == tip), 0)
+
+
+def calculeaza_din_sursa(user_ids=None):
+    """
+    Recalculează rezumatul direct din tabelele brute.
+    Returnează {cheie: (total, numar)}.
+    """
+
+    rezultat = defaultdict(lambda: (Decimal("0"), 0))
+
+    for model in SURSE_REZUMAT:
+        qs = model.objects.all()
+        if user_ids is not None:
+            qs = qs.filter(user_id__in=user_ids)
+
+        campuri = ["user_id", "luna_bugetara", "moneda"]
+        if model is CheltuialaVariabila:
+            campuri.append("categorie")
+
+        randuri = (
+            qs.values(*campuri)
+            .annotate(suma=Sum("suma"), cate=Count("id"))
+            .order_by()
+        )
+
+        for r in randuri.iterator():
+            cheie = cheie_rezumat(
+                model,
+                r["user_id"],
+                r["luna_bugetara"],
+                r["moneda"],
+                r.get("categorie", ""),
+            )
+            total, numar = rezultat[cheie]
+            rezultat[cheie] = (total + r["suma"], numar + r["cate"])
+
+    return dict(rezultat)
+
+
+def rezumat_existent(user_ids=None):
+    qs = RezumatLunar.objects.filter(numar__gt=0)
+    if user_ids is not None:
+        qs = qs.filter(user_id__in=user_ids)
+
+    return {
+        (r.user_id, r.luna, r.moneda, r.tip, r.categorie): (r.total, r.numar)
+        for r in qs.iterator()
+    }
+
+
+def diferente_rezumat(user_ids=None):
+    """
+    Cheile pentru care rezumatul stocat diferă de tabelele brute.
+    Returnează [(cheie, stocat, calculat)].
+    """
+
+    calculat = calculeaza_din_sursa(user_ids)
+    stocat = rezumat_existent(user_ids)
+
+    diferente = []
+    for cheie in sorted(set(calculat) | set(stocat)):
+        a = stocat.get(cheie, (Decimal("0"), 0))
+        b = calculat.get(cheie, (Decimal("0"), 0))
+        if a != b:
+            diferente.append((cheie, a, b))
+
+    return diferente
+
+
+@transaction.atomic
+def reconstruieste_rezumat(user_ids=None):
+    """
+    Șterge și reface rezumatul din tabelele brute. Returnează nr. de rânduri.
+    """
+
+    calculat = calculeaza_din_sursa(user_ids)
+
+    qs = RezumatLunar.objects.all()
+    if user_ids is not None:
+        qs = qs.filter(user_id__in=user_ids)
+    qs.delete()
+
+    RezumatLunar.objects.bulk_create(
+        [
+            RezumatLunar(
+                user_id=user_id,
+                luna=luna,
+                moneda=moneda,
+                tip=tip,
+                categorie=categorie,
+                total=total,
+                numar=numar,
+            )
+            for (user_id, luna, moneda, tip, categorie), (total, numar) in calculat.items()
+        ],
+        batch_size=1000,
+    )
+
+    return len(calculat)
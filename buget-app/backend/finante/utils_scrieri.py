@@ -0,0 +1,46 @@
+from .utils_rezumat import aplica_in_bloc
+from .utils_statistici import inregistreaza_in_bloc
+from .utils_versiuni import creste_versiune
+from .utils_cache import invalideaza_raspunsuri
+from .utils_sync import inregistreaza_stergeri
+
+
+def dupa_scriere_in_bloc(obiecte, semn=1, inlocuite=()):
+    """
+    Ce fac signals.py pentru un rând salvat, făcut o dată pentru rânduri scrise
+    în bloc (bulk_create / bulk_update / ștergeri în bloc), care nu trimit
+    signals. `semn=-1` pentru rânduri scoase (obiectele încă au `pk`);
+    `inlocuite`: copiile rândurilor de dinainte de un bulk_update.
+    """
+
+    obiecte = list(obiecte)
+    inlocuite = list(inlocuite)
+    if semn < 0:
+        inregistreaza_stergeri(obiecte)
+    aplica_in_bloc(obiecte, semn, inlocuite)
+    inregistreaza_in_bloc(obiecte, semn, inlocuite)
+
+    toate = obiecte + inlocuite
+    creste_versiune(*{obj.user_id for obj in toate})
+    for model in {type(obj) for obj in toate}:
+        invalideaza_raspunsuri(
+            model, *{obj.user_id for obj in toate if type(obj) is model}
+        )
+
+
+def sterge_in_bloc(obiecte):
+    """
+    Șterge rândurile (de același model) cu un singur QuerySet.delete(), deci
+    cu cascadele și signals-urile lui Django; signals.py recunoaște ștergerea
+    după `origin` și lasă rezumatul, statisticile, versiunile și urmele pe
+    seama lui `dupa_scriere_in_bloc`, o dată pe cheie.
+    """
+
+    obiecte = list(obiecte)
+    if not obiecte:
+        return
+
+    qs = type(obiecte[0]).objects.filter(pk__in=[obj.pk for obj in obiecte])
+    qs._sters_in_bloc = True
+    qs.delete()
+    dupa_scriere_in_bloc(obiecte, semn=-1)
@@ -0,0 +1,197 @@
+"""
+Serializare rapidă pentru listele mari, doar la citire: rândurile vin ca
+tupluri (`values_list`, cu join-ul pe user în același SELECT) și devin
+dict-uri printr-un codor compilat o singură dată din câmpurile
+serializerului, fără instanțe de model și fără mașinăria DRF pe fiecare
+câmp. Rezultatul e identic cu `Serializer(qs, many=True).data`.
+"""
+
+from datetime import date
+from decimal import Decimal, getcontext
+from functools import cache
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.fields import ISO_8601
+from rest_framework.settings import api_settings
+
+
+# câmpuri al căror to_representation nu schimbă valoarea venită din bază
+FARA_CONVERSIE = (
+    serializers.CharField,
+    serializers.EmailField,
+    serializers.SlugField,
+    serializers.URLField,
+    serializers.ChoiceField,
+    serializers.IntegerField,
+    serializers.BooleanField,
+)
+
+
+def _coloana(model, sursa):
+    # "user.username" -> "user__username", doar dacă e o coloană reală
+    parti = sursa.split(".")
+    for parte in parti[:-1]:
+        model = model._meta.get_field(parte).related_model
+        if model is None:
+            raise TypeError(sursa)
+
+    camp = model._meta.get_field(parti[-1])
+    if not camp.concrete or camp.is_relation:
+        raise TypeError(sursa)
+    return "__".join(parti)
+
+
+def _este_iso(camp, implicit):
+    formatul = getattr(camp, "format", implicit)
+    return formatul is not None and formatul.lower() == ISO_8601
+
+
+def _zecimal(camp):
+    # DecimalField.to_representation, cu cuantumul și contextul calculate o dată
+    cuantum = Decimal(".1") ** camp.decimal_places
+    context = getcontext().copy()
+    if camp.max_digits is not None:
+        context.prec = camp.max_digits
+    rotunjire = camp.rounding
+
+    def conversie(valoare):
+        if not isinstance(valoare, Decimal):
+            return camp.to_representation(valoare)
+        return f"{valoare.quantize(cuantum, rounding=rotunjire, context=context):f}"
+
+    return conversie
+
+
+def _moment(camp):
+    # DateTimeField.to_representation pentru momente aware; fusul curent se
+    # citește o dată pe listă (`codeaza`), nu pe fiecare valoare
+    def conversie(valoare, fus):
+        if fus is None or valoare.utcoffset() is None:
+            return camp.to_representation(valoare)
+        iso = valoare.astimezone(fus).isoformat()
+        return iso[:-6] + "Z" if iso.endswith("+00:00") else iso
+
+    conversie.cu_fus = True
+    return conversie
+
+
+def _conversie(camp):
+    if type(camp) in FARA_CONVERSIE:
+        return None
+
+    if type(camp) is serializers.DateField and _este_iso(
+        camp, api_settings.DATE_FORMAT
+    ):
+        return date.isoformat
+
+    if (
+        type(camp) is serializers.DecimalField
+        and camp.decimal_places is not None
+        and getattr(camp, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+        and not camp.localize
+        and not camp.normalize_output
+    ):
+        return _zecimal(camp)
+
+    if (
+        type(camp) is serializers.DateTimeField
+        and not hasattr(camp, "timezone")
+        and _este_iso(camp, api_settings.DATETIME_FORMAT)
+    ):
+        return _moment(camp)
+
+    # câmpurile simple (Decimal, DateTime, ...) își păstrează conversia DRF;
+    # relațiile, serializerele imbricate și metodele nu au o coloană
+    if isinstance(
+        camp,
+        (
+            serializers.RelatedField,
+            serializers.ManyRelatedField,
+            serializers.BaseSerializer,
+            serializers.SerializerMethodField,
+            serializers.HiddenField,
+        ),
+    ):
+        raise TypeError(type(camp).__name__)
+    return camp.to_representation
+
+
+def _compileaza(chei, conversii):
+    # conversiile se aleg o dată; pe fiecare rând rămâne un singur dict
+    campuri = [
+        (cheie, conversie, getattr(conversie, "cu_fus", False))
+        for cheie, conversie in zip(chei, conversii)
+    ]
+
+    def codeaza_rand(r, fus):
+        # zip se oprește la câmpurile serializerului (coloanele `extra` rămân)
+        return {
+            cheie: v if c is None or v is None else (c(v, fus) if cu_fus else c(v))
+            for (cheie, c, cu_fus), v in zip(campuri, r)
+        }
+
+    return codeaza_rand
+
+
+class CodorRanduri:
+    """
+    Codorul unui ModelSerializer: coloanele de cerut cu `valori()` și
+    funcția compilată care face din fiecare rând dict-ul serializerului.
+    """
+
+    def __init__(self, serializer_class):
+        model = serializer_class.Meta.model
+        campuri = [
+            (nume, camp)
+            for nume, camp in serializer_class().fields.items()
+            if not camp.write_only
+        ]
+
+        self.coloane = tuple(_coloana(model, camp.source) for _, camp in campuri)
+        # codeaza_rand(rand, fus_orar) -> dict-ul serializerului
+        self.codeaza_rand = _compileaza(
+            [nume for nume, _ in campuri], [_conversie(camp) for _, camp in campuri]
+        )
+
+    def valori(self, qs, *extra):
+        """
+        Rândurile ca tupluri cu nume (`extra`: coloane cerute în plus, ex.
+        cheia de paginare); primele coloane sunt cele ale serializerului.
+        """
+
+        coloane = self.coloane + tuple(c for c in extra if c not in self.coloane)
+        return qs.values_list(*coloane, named=True)
+
+    def codeaza(self, randuri):
+        fus = timezone.get_current_timezone() if settings.USE_TZ else None
+        codeaza_rand = self.codeaza_rand
+        return [codeaza_rand(rand, fus) for rand in randuri]
+
+
+@cache
+def codor_pentru(serializer_class):
+    """
+    Codorul serializerului sau None dacă are câmpuri fără coloană directă
+    (relații, metode, serializere imbricate): acelea rămân pe DRF.
+    """
+
+    if not issubclass(serializer_class, serializers.ModelSerializer):
+        return None
+    try:
+        return CodorRanduri(serializer_class)
+    except (TypeError, FieldDoesNotExist):
+        return None
+
+
+def serializeaza(serializer_class, qs):
+    """
+    Echivalentul lui `serializer_class(qs, many=True).data` pentru liste.
+    """
+
+    codor = codor_pentru(serializer_class)
+    if codor is None:
+        return serializer_class(qs, many=True).data
+    return codor.codeaza(codor.valori(qs))
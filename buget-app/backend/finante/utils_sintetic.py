@@ -0,0 +1,365 @@
+"""
+Date sintetice, reproductibile (același `seed` → aceleași date), pentru
+măsurători de performanță: useri, gospodării (bridge-uri), ani de venituri,
+cheltuieli și mișcări de fonduri, cu sume și frecvențe apropiate de cele reale.
+"""
+
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from random import Random
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from .models import (
+    CategorieVariabila,
+    CheltuialaFixa,
+    CheltuialaVariabila,
+    CursValutar,
+    EconomieLunara,
+    EconomieVacanta,
+    Fond,
+    Moneda,
+    MiscareFond,
+    RezumatLunar,
+    SoldFond,
+    UserBridge,
+    Venit,
+)
+from .utils import (
+    cheie_luna_bugetara,
+    cu_ani_in_urma,
+    luni_bugetare,
+    perioada_din_cheie,
+)
+from .utils_cache import invalideaza_raspunsuri
+from .utils_curs import goleste_cache_cursuri
+from .utils_economii import inchide_luni_toti
+from .utils_rezumat import reconstruieste_rezumat
+from .utils_solduri import reconstruieste_solduri
+from .utils_statistici import reconciliaza_statistici
+from .utils_users import invalideaza_bridge
+from .utils_versiuni import creste_versiune, creste_versiune_cursuri
+
+
+PREFIX_USER = "sintetic_"
+PAROLA_IMPLICITA = "parola123"
+MARIME_LOT = 5000  # rânduri pe bulk_create
+
+# cât de des apare fiecare categorie și ce sumă tipică are (EUR)
+CATEGORII = {
+    CategorieVariabila.ALIMENTE: (30, 35),
+    CategorieVariabila.SANATATE: (4, 40),
+    CategorieVariabila.AUTO: (8, 55),
+    CategorieVariabila.CULTURA: (3, 20),
+    CategorieVariabila.SHOPPING: (8, 45),
+    CategorieVariabila.NEPREVAZUTE: (3, 60),
+    CategorieVariabila.ANIMALUTE: (3, 25),
+    CategorieVariabila.DIVERTISMENT: (6, 20),
+    CategorieVariabila.VACANTA: (1, 250),
+    CategorieVariabila.INVESTITII: (1, 200),
+}
+CHELTUIELI_FIXE = {
+    "chirie": 450,
+    "utilități": 120,
+    "internet": 15,
+    "telefon": 12,
+    "abonament sală": 35,
+    "rată mașină": 250,
+    "asigurare": 40,
+    "grădiniță": 200,
+}
+CURS_EUR_RON = Decimal("4.95")
+
+MODELE_SINTETICE = (
+    Venit,
+    CheltuialaFixa,
+    CheltuialaVariabila,
+    EconomieVacanta,
+    EconomieLunara,
+    MiscareFond,
+    Fond,
+    RezumatLunar,
+    SoldFond,
+)
+
+
+@contextmanager
+def _fara_auto_now_add(*campuri):
+    # datele istorice (`data`, `created_at`) nu trebuie suprascrise cu „acum”
+    for camp in campuri:
+        camp.auto_now_add = False
+    try:
+        yield
+    finally:
+        for camp in campuri:
+            camp.auto_now_add = True
+
+
+def _suma(rnd, medie, moneda):
+    # distribuție log-normală: multe sume mici, câteva mari
+    suma = Decimal(str(rnd.lognormvariate(0, 0.6) * medie))
+    if moneda == Moneda.RON:
+        suma *= CURS_EUR_RON
+    return suma.quantize(Decimal("0.01")) + Decimal("0.01")
+
+
+def _moment(rnd, zi):
+    return timezone.make_aware(
+        datetime.combine(zi, time(rnd.randrange(7, 23), rnd.randrange(60)))
+    )
+
+
+class _Scriitor:
+    """
+    Adună rânduri și le scrie în loturi de MARIME_LOT, câte un model pe rând.
+    """
+
+    def __init__(self):
+        self.loturi = {}
+        self.scrise = {}
+
+    def adauga(self, obj):
+        if hasattr(obj, "seteaza_luna_bugetara"):
+            obj.seteaza_luna_bugetara()
+
+        lot = self.loturi.setdefault(type(obj), [])
+        lot.append(obj)
+        if len(lot) >= MARIME_LOT:
+            self.scrie(type(obj))
+
+    def scrie(self, model):
+        lot = self.loturi.pop(model, [])
+        model.objects.bulk_create(lot, batch_size=1000)
+        self.scrise[model.__name__] = self.scrise.get(model.__name__, 0) + len(lot)
+
+    def scrie_tot(self):
+        for model in list(self.loturi):
+            self.scrie(model)
+
+
+def _genereaza_user(rnd, scriitor, user, luni, azi):
+    moneda = Moneda.RON if rnd.random() < 0.7 else Moneda.EUR
+    salariu = rnd.uniform(900, 4000)
+    fixe = rnd.sample(sorted(CHELTUIELI_FIXE), rnd.randint(2, 6))
+    variabile_pe_luna = rnd.randint(10, 60)
+    categorii, ponderi = zip(*((c, p) for c, (p, _) in CATEGORII.items()))
+
+    for luna in luni:
+        start, end = perioada_din_cheie(luna)
+        end = min(end, azi)
+        zile = (end - start).days
+
+        def zi():
+            return start + timedelta(days=rnd.randint(0, zile))
+
+        # salariul (uneori și un venit suplimentar)
+        for _ in range(1 if rnd.random() < 0.8 else 2):
+            data = zi()
+            scriitor.adauga(
+                Venit(
+                    user=user,
+                    suma=_suma(rnd, salariu, moneda),
+                    moneda=moneda,
+                    data=data,
+                    created_at=_moment(rnd, data),
+                )
+            )
+
+        for descriere in fixe:
+            data = zi()
+            scriitor.adauga(
+                CheltuialaFixa(
+                    user=user,
+                    descriere=descriere,
+                    suma=_suma(rnd, CHELTUIELI_FIXE[descriere], moneda),
+                    moneda=moneda,
+                    data=data,
+                    created_at=_moment(rnd, data),
+                )
+            )
+
+        for categorie in rnd.choices(categorii, ponderi, k=variabile_pe_luna):
+            data = zi()
+            scriitor.adauga(
+                CheltuialaVariabila(
+                    user=user,
+                    categorie=categorie,
+                    suma=_suma(rnd, CATEGORII[categorie][1], moneda),
+                    moneda=moneda,
+                    data=data,
+                    created_at=_moment(rnd, data),
+                )
+            )
+
+        if rnd.random() < 0.3:
+            scriitor.adauga(
+                EconomieVacanta(
+                    user=user,
+                    tip="economii",
+                    suma=_suma(rnd, 150, Moneda.EUR),
+                    moneda=Moneda.EUR,
+                    data=zi(),
+                )
+            )
+
+        for _ in range(rnd.choice((0, 0, 1, 1, 2))):
+            retragere = rnd.random() < 0.15
+            suma = _suma(rnd, 300, moneda) * (-1 if retragere else 1)
+            scriitor.adauga(
+                MiscareFond(
+                    user=user,
+                    tip="retrage" if retragere else "adauga",
+                    rubrica=rnd.choice(MiscareFond.RUBRICI)[0],
+                    suma_eur=suma if moneda == Moneda.EUR else None,
+                    suma_ron=suma if moneda == Moneda.RON else None,
+                    data=zi(),
+                )
+            )
+
+
+def _genereaza_cursuri(rnd, de_la, pana_la):
+    # mers aleator în jurul cursului real; cursurile existente rămân neatinse
+    curs = CURS_EUR_RON
+    cursuri = []
+    zi = de_la
+    while zi <= pana_la:
+        curs = max(Decimal("4"), curs + Decimal(str(rnd.gauss(0, 0.004))))
+        curs = curs.quantize(Decimal("0.000001"))
+        cursuri.append(
+            CursValutar(data=zi, moneda=Moneda.EUR, moneda_baza=Moneda.RON, curs=curs)
+        )
+        cursuri.append(
+            CursValutar(
+                data=zi,
+                moneda=Moneda.RON,
+                moneda_baza=Moneda.EUR,
+                curs=(1 / curs).quantize(Decimal("0.000001")),
+            )
+        )
+        zi += timedelta(days=1)
+
+    CursValutar.objects.bulk_create(cursuri, batch_size=1000, ignore_conflicts=True)
+    goleste_cache_cursuri()  # bulk_create nu trimite signals
+    creste_versiune_cursuri()
+
+
+def useri_sintetici():
+    return User.objects.filter(username__startswith=PREFIX_USER)
+
+
+def genereaza(
+    useri=1000,
+    ani=3,
+    gospodarii=0.6,
+    seed=42,
+    parola=PAROLA_IMPLICITA,
+    azi=None,
+    progres=None,
+):
+    """
+    Creează `useri` useri sintetici cu până la `ani` ani de istoric; fracțiunea
+    `gospodarii` din ei e grupată în perechi (bridge acceptat). La final
+    reface rezumatul lunar, soldurile fondurilor, statisticile și economiile
+    lunare, ca după scrieri normale. Returnează {model: rânduri scrise}.
+    `progres(useri_gata)` se apelează după fiecare lot de useri.
+    """
+
+    if useri_sintetici().exists():
+        raise ValueError("Există deja useri sintetici; șterge-i întâi.")
+
+    rnd = Random(seed)
+    azi = azi or timezone.localdate()
+    prima_zi = cu_ani_in_urma(azi, ani)
+    luna_curenta = cheie_luna_bugetara(azi)
+
+    # o singură derivare a parolei pentru toți (e scumpă intenționat)
+    parola = make_password(parola)
+    inscrieri = [
+        prima_zi + timedelta(days=rnd.randint(0, (azi - prima_zi).days // 2))
+        for _ in range(useri)
+    ]
+    User.objects.bulk_create(
+        [
+            User(
+                username=f"{PREFIX_USER}{i:06d}",
+                email=f"{PREFIX_USER}{i:06d}@example.com",
+                password=parola,
+                date_joined=_moment(rnd, inscrieri[i]),
+            )
+            for i in range(useri)
+        ],
+        batch_size=1000,
+    )
+    creati = list(useri_sintetici().order_by("username"))
+    user_ids = [u.id for u in creati]
+
+    # gospodăriile: perechi de useri amestecați, plus câteva cereri neacceptate
+    amestecati = creati[:]
+    rnd.shuffle(amestecati)
+    in_pereche = int(len(amestecati) * gospodarii) // 2 * 2
+    bridge_uri = [
+        UserBridge(from_user=a, to_user=b, accepted=True)
+        for a, b in zip(amestecati[0:in_pereche:2], amestecati[1:in_pereche:2])
+    ]
+    bridge_uri += [
+        UserBridge(from_user=a, to_user=rnd.choice(creati), accepted=False)
+        for a in amestecati[in_pereche:]
+        if rnd.random() < 0.05
+    ]
+    UserBridge.objects.bulk_create(bridge_uri, batch_size=1000)
+
+    _genereaza_cursuri(rnd, prima_zi - timedelta(days=31), azi)
+
+    scriitor = _Scriitor()
+    with _fara_auto_now_add(
+        Venit._meta.get_field("created_at"),
+        CheltuialaFixa._meta.get_field("created_at"),
+        CheltuialaVariabila._meta.get_field("created_at"),
+        EconomieVacanta._meta.get_field("data"),
+        MiscareFond._meta.get_field("data"),
+    ):
+        for nr, (user, inscriere) in enumerate(zip(creati, inscrieri), start=1):
+            luni = luni_bugetare(cheie_luna_bugetara(inscriere), luna_curenta)
+            _genereaza_user(rnd, scriitor, user, luni, azi)
+            if progres and nr % 100 == 0:
+                progres(nr)
+        scriitor.scrie_tot()
+
+    # bulk_create nu trimite signals: agregatele se refac din tabelele brute
+    with transaction.atomic():
+        reconstruieste_rezumat(user_ids)
+        reconstruieste_solduri(user_ids)
+        reconciliaza_statistici()
+    for _ in inchide_luni_toti(user_ids):
+        pass
+
+    invalideaza_bridge(*user_ids)
+    creste_versiune(*user_ids)
+    for model in (*MODELE_SINTETICE, User):
+        invalideaza_raspunsuri(model, *user_ids)
+
+    return {**scriitor.scrise, "User": useri, "UserBridge": len(bridge_uri)}
+
+
+def sterge_sintetice():
+    """
+    Șterge userii sintetici și tot ce țin, fără semnale pe fiecare rând
+    (ar fi milioane), apoi reface statisticile. Returnează nr. de useri.
+    """
+
+    user_ids = list(useri_sintetici().values_list("id", flat=True))
+
+    with transaction.atomic():
+        for model in MODELE_SINTETICE:
+            qs = model.objects.filter(user_id__in=user_ids)
+            qs._raw_delete(qs.db)
+
+        useri_sintetici().delete()  # bridge-urile se șterg în cascadă
+        reconciliaza_statistici()
+
+    invalideaza_bridge(*user_ids)
+    return len(user_ids)
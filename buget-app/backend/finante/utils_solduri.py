@@ -0,0 +1,185 @@
+"""
+Soldurile fondurilor pe (user, rubrică, monedă), în SoldFond: ținute la zi
+de signals.py la fiecare mișcare, citite fără să se adune tot istoricul
+MiscareFond. `reconstruieste_solduri` le reface din tabela brută.
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from .models import MiscareFond, Moneda, SoldFond
+from .utils_rezumat import incrementeaza
+
+
+# moneda → coloana ei din MiscareFond
+COLOANE_MONEDE = {Moneda.EUR: "suma_eur", Moneda.RON: "suma_ron"}
+CENT = Decimal("0.01")
+
+
+def sume_miscare(user_id, rubrica, suma_eur, suma_ron):
+    """
+    {(user_id, rubrică, monedă): sumă} pentru sumele completate ale unei
+    mișcări.
+    """
+
+    sume = {Moneda.EUR: suma_eur, Moneda.RON: suma_ron}
+    return {
+        (user_id, rubrica, moneda): Decimal(str(suma))
+        for moneda, suma in sume.items()
+        if suma is not None
+    }
+
+
+def sume_instanta(miscare):
+    return sume_miscare(
+        miscare.user_id, miscare.rubrica, miscare.suma_eur, miscare.suma_ron
+    )
+
+
+def aplica_solduri(vechi, noi):
+    """
+    Trece soldurile de la sumele `vechi` la cele `noi` (ambele din
+    `sume_miscare`; {} la creare / ștergere): un UPDATE pe cheia schimbată.
+    """
+
+    delte = defaultdict(lambda: (Decimal("0"), 0))
+    for sume, semn in ((noi, 1), (vechi, -1)):
+        for cheie, suma in sume.items():
+            total, numar = delte[cheie]
+            delte[cheie] = (total + semn * suma, numar + semn)
+
+    for (user_id, rubrica, moneda), (total, numar) in delte.items():
+        if total or numar:
+            incrementeaza(
+                SoldFond,
+                dict(user_id=user_id, rubrica=rubrica, moneda=moneda),
+                total,
+                numar,
+            )
+
+
+# ---------- citire ----------
+
+
+def solduri(user_ids):
+    """
+    {rubrică: {monedă: sold}} pentru userii dați, dintr-un singur query pe
+    SoldFond (cel mult rubrici × monede rânduri pe user).
+    """
+
+    rezultat = defaultdict(dict)
+    randuri = (
+        SoldFond.objects.filter(user_id__in=user_ids, numar__gt=0)
+        .values("rubrica", "moneda")
+        .annotate(sold=Sum("total"))
+        .order_by()
+    )
+    for r in randuri:
+        rezultat[r["rubrica"]][r["moneda"]] = r["sold"]
+    return rezultat
+
+
+def totaluri_fonduri(user_ids):
+    """
+    (total EUR, total RON) pe toate rubricile, cât dau SUM(suma_eur) și
+    SUM(suma_ron) pe MiscareFond (0 fără mișcări).
+    """
+
+    totaluri = dict(
+        SoldFond.objects.filter(user_id__in=user_ids, numar__gt=0)
+        .values("moneda")
+        .annotate(sold=Sum("total"))
+        .order_by()
+        .values_list("moneda", "sold")
+    )
+    return totaluri.get(Moneda.EUR, 0), totaluri.get(Moneda.RON, 0)
+
+
+# ---------- reconciliere ----------
+
+
+def calculeaza_din_sursa(user_ids=None):
+    """
+    Soldurile calculate direct din MiscareFond: {(user, rubrică, monedă):
+    (total, număr)}.
+    """
+
+    qs = MiscareFond.objects.all()
+    if user_ids is not None:
+        qs = qs.filter(user_id__in=user_ids)
+
+    rezultat = {}
+    for moneda, coloana in COLOANE_MONEDE.items():
+        randuri = (
+            qs.filter(**{f"{coloana}__isnull": False})
+            .values("user_id", "rubrica")
+            .annotate(total=Sum(coloana), numar=Count("id"))
+            .order_by()
+        )
+        for r in randuri:
+            # SQLite adună în virgulă mobilă: înapoi la cenți, ca în SoldFond
+            total = r["total"].quantize(CENT)
+            rezultat[(r["user_id"], r["rubrica"], moneda)] = (total, r["numar"])
+    return rezultat
+
+
+def solduri_existente(user_ids=None):
+    qs = SoldFond.objects.filter(numar__gt=0)
+    if user_ids is not None:
+        qs = qs.filter(user_id__in=user_ids)
+
+    return {
+        (r.user_id, r.rubrica, r.moneda): (r.total, r.numar) for r in qs.iterator()
+    }
+
+
+def diferente_solduri(user_ids=None):
+    """
+    Cheile pentru care soldul stocat diferă de MiscareFond.
+    Returnează [(cheie, stocat, calculat)].
+    """
+
+    calculat = calculeaza_din_sursa(user_ids)
+    stocat = solduri_existente(user_ids)
+
+    diferente = []
+    for cheie in sorted(set(calculat) | set(stocat)):
+        a = stocat.get(cheie, (Decimal("0"), 0))
+        b = calculat.get(cheie, (Decimal("0"), 0))
+        if a != b:
+            diferente.append((cheie, a, b))
+
+    return diferente
+
+
+@transaction.atomic
+def reconstruieste_solduri(user_ids=None):
+    """
+    Șterge și reface soldurile din MiscareFond. Returnează nr. de rânduri.
+    """
+
+    calculat = calculeaza_din_sursa(user_ids)
+
+    qs = SoldFond.objects.all()
+    if user_ids is not None:
+        qs = qs.filter(user_id__in=user_ids)
+    qs.delete()
+
+    SoldFond.objects.bulk_create(
+        [
+            SoldFond(
+                user_id=user_id,
+                rubrica=rubrica,
+                moneda=moneda,
+                total=total,
+                numar=numar,
+            )
+            for (user_id, rubrica, moneda), (total, numar) in calculat.items()
+        ],
+        batch_size=1000,
+    )
+
+    return len(calculat)
@@ -0,0 +1,274 @@
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import StatisticaGlobala, StatisticaZilnica, TipStatistica
+from .utils_rezumat import SURSE_REZUMAT, incrementeaza
+
+
+CENT = Decimal("0.01")
+ZILE_ACTIVITATE = 30  # un user e „activ” dacă are tranzacții în ultimele N zile
+# rândurile unei zile sunt împărțite pe felii după user, ca scrierile
+# simultane ale unor useri diferiți să nu aștepte după același rând
+FELII = 8
+
+
+def felie(user_id):
+    return user_id % FELII
+
+
+def zi_din(moment):
+    # aceeași zi pe care o dă TruncDate() în reconciliere
+    if moment is None:
+        return timezone.localdate()
+    if timezone.is_aware(moment):
+        moment = timezone.localtime(moment)
+    return moment.date()
+
+
+def inregistreaza(tip, moneda, zi, total, numar, user_id):
+    """
+    Adaugă o schimbare în seria zilei `zi` și în totalul platformei, ambele
+    pe felia userului.
+    """
+
+    if not total and not numar:
+        return
+
+    f = felie(user_id)
+    incrementeaza(
+        StatisticaZilnica,
+        dict(zi=zi, tip=tip, moneda=moneda, felie=f),
+        total,
+        numar,
+    )
+    incrementeaza(
+        StatisticaGlobala, dict(tip=tip, moneda=moneda, felie=f), total, numar
+    )
+
+
+def inregistreaza_in_bloc(obiecte, semn=1, inlocuite=()):
+    """
+    Ca `inregistreaza`, pentru rânduri scrise fără signals (bulk_create,
+    bulk_update cu `inlocuite`): o actualizare pe cheie (zi / total, felie),
+    nu una pe rând. Cheile se scriu în ordine, întâi seria, apoi totalurile
+    (ca la `inregistreaza`), ca două scrieri în bloc simultane să blocheze
+    rândurile în aceeași ordine (fără deadlock).
+    """
+
+    zilnice = defaultdict(lambda: (Decimal("0"), 0))
+    globale = defaultdict(lambda: (Decimal("0"), 0))
+    for obj, s in [*((o, semn) for o in obiecte), *((o, -semn) for o in inlocuite)]:
+        tip, f = SURSE_REZUMAT[type(obj)], felie(obj.user_id)
+        suma = s * Decimal(str(obj.suma))
+        for delte, cheie in (
+            (zilnice, (zi_din(obj.created_at), tip, obj.moneda, f)),
+            (globale, (tip, obj.moneda, f)),
+        ):
+            total, numar = delte[cheie]
+            delte[cheie] = (total + suma, numar + s)
+
+    for model, delte, campuri in (
+        (StatisticaZilnica, zilnice, ("zi", "tip", "moneda", "felie")),
+        (StatisticaGlobala, globale, ("tip", "moneda", "felie")),
+    ):
+        for cheie in sorted(delte):
+            total, numar = delte[cheie]
+            if total or numar:
+                incrementeaza(model, dict(zip(campuri, cheie)), total, numar)
+
+
+# ---------- citire ----------
+
+
+def _totaluri_globale():
+    # {(tip, monedă): (total, număr)} din cele cel mult tipuri × monede × FELII
+    # rânduri globale (userii activi au un singur rând, scris la reconciliere)
+    randuri = (
+        StatisticaGlobala.objects.values("tip", "moneda")
+        .annotate(suma=Sum("total"), cate=Sum("numar"))
+        .order_by()
+    )
+    return {
+        (r["tip"], r["moneda"]): (r["suma"].quantize(CENT), r["cate"])
+        for r in randuri
+    }
+
+
+def instantaneu():
+    """
+    Totalurile platformei din rândurile globale (un query pe un număr fix de
+    rânduri, indiferent de vechimea platformei), plus userii activi numărați
+    la ultima reconciliere.
+    """
+
+    numar = dict.fromkeys(TipStatistica.values, 0)
+    pe_moneda = defaultdict(lambda: {"venit": Decimal("0"), "cheltuieli": Decimal("0")})
+
+    for (tip, moneda), (total, cate) in _totaluri_globale().items():
+        numar[tip] += cate
+        if tip == TipStatistica.VENIT:
+            pe_moneda[moneda]["venit"] += total
+        elif tip in (TipStatistica.FIXA, TipStatistica.VARIABILA):
+            pe_moneda[moneda]["cheltuieli"] += total
+
+    return {
+        "total_venit": sum((m["venit"] for m in pe_moneda.values()), Decimal("0")),
+        "total_cheltuieli": sum(
+            (m["cheltuieli"] for m in pe_moneda.values()), Decimal("0")
+        ),
+        "pe_moneda": dict(sorted(pe_moneda.items())),
+        "useri": numar.pop(TipStatistica.USERI),
+        "useri_activi": numar.pop(TipStatistica.USERI_ACTIVI),
+        "tranzactii": numar,
+    }
+
+
+def istoric(de_la, pana_la):
+    """
+    Serii zilnice (useri noi, tranzacții noi pe tip) între două zile inclusiv;
+    zilele fără activitate apar cu 0.
+    """
+
+    zile = [de_la + timedelta(days=i) for i in range((pana_la - de_la).days + 1)]
+    index = {zi: i for i, zi in enumerate(zile)}
+
+    tipuri = [TipStatistica.USERI, *SURSE_REZUMAT.values()]
+    serii = {tip: [0] * len(zile) for tip in tipuri}
+
+    randuri = (
+        StatisticaZilnica.objects.filter(zi__range=(de_la, pana_la), tip__in=tipuri)
+        .values("zi", "tip")
+        .annotate(cate=Sum("numar"))
+        .order_by()
+    )
+    for r in randuri:
+        serii[r["tip"]][index[r["zi"]]] = r["cate"]
+
+    return {"labels": [zi.isoformat() for zi in zile], "serii": serii}
+
+
+# ---------- reconciliere ----------
+
+
+def calculeaza_din_sursa():
+    """
+    Recalculează statisticile din tabelele brute.
+    Returnează {(zi, tip, moneda, felie): (total, numar)}; totalurile
+    platformei (pe felii) și userii activi au `zi` None.
+    """
+
+    rezultat = {}
+
+    for model, tip in SURSE_REZUMAT.items():
+        randuri = (
+            model.objects.annotate(
+                zi=TruncDate("created_at"), felie=F("user_id") % FELII
+            )
+            .values("zi", "moneda", "felie")
+            .annotate(suma=Sum("suma"), cate=Count("id"))
+            .order_by()
+        )
+        for r in randuri.iterator():
+            suma = r["suma"].quantize(CENT)
+            rezultat[(r["zi"], tip, r["moneda"], r["felie"])] = (suma, r["cate"])
+
+    useri = (
+        User.objects.annotate(zi=TruncDate("date_joined"), felie=F("id") % FELII)
+        .values("zi", "felie")
+        .annotate(cate=Count("id"))
+        .order_by()
+    )
+    for r in useri.iterator():
+        cheie = (r["zi"], TipStatistica.USERI, "", r["felie"])
+        rezultat[cheie] = (Decimal("0"), r["cate"])
+
+    # totalurile platformei = seria adunată peste zile, pe aceeași felie
+    globale = defaultdict(lambda: (Decimal("0"), 0))
+    for (_, tip, moneda, f), (total, numar) in rezultat.items():
+        suma, cate = globale[(None, tip, moneda, f)]
+        globale[(None, tip, moneda, f)] = (suma + total, cate + numar)
+    rezultat.update(globale)
+
+    prag = timezone.localdate() - timedelta(days=ZILE_ACTIVITATE)
+    activi = set()
+    for model in SURSE_REZUMAT:
+        activi.update(
+            model.objects.filter(data__gte=prag)
+            .values_list("user_id", flat=True)
+            .distinct()
+        )
+    cheie = (None, TipStatistica.USERI_ACTIVI, "", 0)
+    rezultat[cheie] = (Decimal("0"), len(activi))
+
+    return rezultat
+
+
+def statistici_existente():
+    rezultat = {
+        (r.zi, r.tip, r.moneda, r.felie): (r.total, r.numar)
+        for r in StatisticaZilnica.objects.exclude(numar=0, total=0).iterator()
+    }
+    for r in StatisticaGlobala.objects.exclude(numar=0, total=0):
+        rezultat[(None, r.tip, r.moneda, r.felie)] = (r.total, r.numar)
+    return rezultat
+
+
+def diferente_statistici():
+    """
+    Cheile pentru care statisticile stocate diferă de tabelele brute
+    (`zi` None = totalurile platformei și userii activi).
+    Returnează [(cheie, stocat, calculat)].
+    """
+
+    calculat = calculeaza_din_sursa()
+    stocat = statistici_existente()
+
+    diferente = []
+    for cheie in sorted(set(calculat) | set(stocat), key=lambda c: (str(c[0]), c[1:])):
+        a = stocat.get(cheie, (Decimal("0"), 0))
+        b = calculat.get(cheie, (Decimal("0"), 0))
+        if a != b:
+            diferente.append((cheie, a, b))
+
+    return diferente
+
+
+@transaction.atomic
+def reconciliaza_statistici():
+    """
+    Reface seria zilnică și totalurile platformei din tabelele brute și
+    numără userii activi. Returnează nr. de rânduri zilnice.
+    """
+
+    calculat = calculeaza_din_sursa()
+
+    StatisticaZilnica.objects.all().delete()
+    StatisticaGlobala.objects.all().delete()
+
+    zilnice = [
+        StatisticaZilnica(
+            zi=zi, tip=tip, moneda=moneda, felie=felie, total=total, numar=numar
+        )
+        for (zi, tip, moneda, felie), (total, numar) in calculat.items()
+        if zi is not None
+    ]
+
+    StatisticaZilnica.objects.bulk_create(zilnice, batch_size=1000)
+    StatisticaGlobala.objects.bulk_create(
+        [
+            StatisticaGlobala(
+                tip=tip, moneda=moneda, felie=felie, total=total, numar=numar
+            )
+            for (zi, tip, moneda, felie), (total, numar) in calculat.items()
+            if zi is None
+        ]
+    )
+
+    return len(zilnice)
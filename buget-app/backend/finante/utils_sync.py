@@ -0,0 +1,145 @@
+"""
+Sincronizare incrementală (/api/sync/): clientul trimite tokenul primit
+data trecută și primește doar rândurile create sau modificate de atunci
+(după `updated_at`) și id-urile celor șterse (din urmele `Stergere`).
+Fără token, cu un token mai vechi decât urmele păstrate sau cu altă
+gospodărie decât cea de acum, răspunsul e complet. Setări în
+settings.FINANTE_SYNC.
+"""
+
+import base64
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from .models import (
+    Venit,
+    CheltuialaFixa,
+    CheltuialaVariabila,
+    EconomieVacanta,
+    MiscareFond,
+    Stergere,
+)
+from .serializers import (
+    VenitSerializer,
+    CheltuialaFixaSerializer,
+    CheltuialaVariabilaSerializer,
+    EconomieVacantaSerializer,
+    MiscareFondSerializer,
+)
+from .utils_serializare import serializeaza
+
+
+SETARI_SYNC = {
+    # rândurile scrise într-o tranzacție încă deschisă au `updated_at` din
+    # trecut: tokenul se dă cu atâtea secunde în urmă, ca să nu le piardă
+    "SUPRAPUNERE_S": 60,
+    "PASTRARE_ZILE": 30,  # cât se păstrează urmele rândurilor șterse
+}
+
+# cheia din răspuns → (model, serializer)
+MODELE_SYNC = {
+    "venituri": (Venit, VenitSerializer),
+    "cheltuieli_fixe": (CheltuialaFixa, CheltuialaFixaSerializer),
+    "cheltuieli_variabile": (CheltuialaVariabila, CheltuialaVariabilaSerializer),
+    "economii_vacanta": (EconomieVacanta, EconomieVacantaSerializer),
+    "miscari_fonduri": (MiscareFond, MiscareFondSerializer),
+}
+CHEIE_MODEL = {model: cheie for cheie, (model, _) in MODELE_SYNC.items()}
+
+
+def setari_sync():
+    return {**SETARI_SYNC, **getattr(settings, "FINANTE_SYNC", {})}
+
+
+def inregistreaza_stergeri(obiecte):
+    """
+    Urmele rândurilor șterse (doar pentru modelele din MODELE_SYNC), într-un
+    singur INSERT.
+    """
+
+    Stergere.objects.bulk_create(
+        [
+            Stergere(
+                model=CHEIE_MODEL[type(obj)], obiect_id=obj.pk, user_id=obj.user_id
+            )
+            for obj in obiecte
+            if type(obj) in CHEIE_MODEL
+        ]
+    )
+
+
+def curata_stergeri():
+    """
+    Scoate urmele mai vechi decât PASTRARE_ZILE; tokenurile de dinainte
+    primesc oricum răspuns complet. Întoarce câte s-au șters.
+    """
+
+    prag = timezone.now() - timedelta(days=setari_sync()["PASTRARE_ZILE"])
+    sterse, _ = Stergere.objects.filter(sters_la__lt=prag).delete()
+    return sterse
+
+
+def codeaza_token(moment, user_ids):
+    text = json.dumps([moment.isoformat(), sorted(user_ids)])
+    return base64.urlsafe_b64encode(text.encode()).decode()
+
+
+def decodeaza_token(token):
+    try:
+        moment, user_ids = json.loads(base64.urlsafe_b64decode(token))
+        moment = parse_datetime(moment)
+        if moment is None or moment.utcoffset() is None:
+            raise ValueError(token)
+        return moment, sorted(int(i) for i in user_ids)
+    except Exception:
+        raise ValidationError({"since": "Token de sincronizare invalid."})
+
+
+def date_sync(user_ids, token=None):
+    """
+    Răspunsul /api/sync/ pentru userii din gospodărie: pe fiecare cheie din
+    MODELE_SYNC, {"modificate": [...], "sterse": [id, ...]}, plus tokenul
+    următor și `complet` (clientul înlocuiește tot ce are).
+    """
+
+    setari = setari_sync()
+    acum = timezone.now()
+
+    prag = None
+    if token:
+        moment, gospodarie = decodeaza_token(token)
+        pastrare = timedelta(days=setari["PASTRARE_ZILE"])
+        if gospodarie == sorted(user_ids) and moment > acum - pastrare:
+            prag = moment
+
+    raspuns = {
+        "token": codeaza_token(
+            acum - timedelta(seconds=setari["SUPRAPUNERE_S"]), user_ids
+        ),
+        "complet": prag is None,
+    }
+
+    sterse = {cheie: [] for cheie in MODELE_SYNC}
+    if prag is not None:
+        urme = Stergere.objects.filter(
+            user_id__in=user_ids, sters_la__gt=prag
+        ).values_list("model", "obiect_id")
+        for cheie, obiect_id in urme:
+            if cheie in sterse:
+                sterse[cheie].append(obiect_id)
+
+    for cheie, (model, serializer_class) in MODELE_SYNC.items():
+        qs = model.objects.filter(user_id__in=user_ids).order_by("updated_at", "id")
+        if prag is not None:
+            qs = qs.filter(updated_at__gt=prag)
+        raspuns[cheie] = {
+            "modificate": serializeaza(serializer_class, qs),
+            "sterse": sterse[cheie],
+        }
+
+    return raspuns
@@ -1,26 +1,104 @@
+from django.core.cache import cache
+from django.db import transaction
 from django.db.models import Q
+
+from .instrumentare import cronometrat
 from .models import UserBridge
 
 
+CHEIE_BRIDGE = "finante:bridge:{}"
+TIMEOUT_BRIDGE = 60 * 60
+
+# crește la fiecare invalidare; memo-ul de pe request.user se verifică față de ea
+_generatie = 0
+
+
+def _vecini_din_db(user_id):
+    perechi = (
+        UserBridge.objects.filter(accepted=True)
+        .filter(Q(from_user_id=user_id) | Q(to_user_id=user_id))
+        .values_list("from_user_id", "to_user_id")
+        .order_by("id")
+    )
+
+    return [to_id if from_id == user_id else from_id for from_id, to_id in perechi]
+
+
+def vecini_pentru(user_ids):
+    """
+    {user_id: [useri conectați prin bridge acceptat]} pentru mai mulți useri,
+    dintr-un singur query (pentru comenzi care lucrează pe toți userii).
+    """
+
+    user_ids = list(user_ids)
+    vecini = {user_id: [] for user_id in user_ids}
+    perechi = (
+        UserBridge.objects.filter(accepted=True)
+        .filter(Q(from_user_id__in=user_ids) | Q(to_user_id__in=user_ids))
+        .values_list("from_user_id", "to_user_id")
+        .order_by("id")
+    )
+
+    for from_id, to_id in perechi:
+        if from_id in vecini:
+            vecini[from_id].append(to_id)
+        if to_id in vecini:
+            vecini[to_id].append(from_id)
+
+    return vecini
+
+
+@cronometrat("bridge")
 def get_connected_user_ids(user):
     """
     Returnează lista de user_ids:
     - userul curent
     - utilizatorii conectați prin bridge acceptat
+
+    Rezultatul e ținut pe obiectul user (o dată pe request) și în cache-ul
+    comun; ambele se invalidează când se schimbă un UserBridge (signals.py).
     """
 
-    bridges = UserBridge.objects.filter(accepted=True).filter(
-        Q(from_user=user) | Q(to_user=user)
-    )
+    memo = getattr(user, "_connected_user_ids", None)
+    if memo is not None and memo[0] == _generatie:
+        return list(memo[1])
+
+    cheie = CHEIE_BRIDGE.format(user.id)
+    vecini = cache.get(cheie)
+
+    if vecini is None:
+        vecini = _vecini_din_db(user.id)
+        cache.set(cheie, vecini, TIMEOUT_BRIDGE)
+
+    user_ids = [user.id] + vecini
+    user._connected_user_ids = (_generatie, user_ids)
+
+    return list(user_ids)
+
 
-    connected_user_ids = []
+def memoreaza_conectati(user, vecini):
+    """
+    Memorează pe `user` vecinii deja cunoscuți (ex. din token), ca
+    get_connected_user_ids să nu-i mai caute.
+    """
+
+    user._connected_user_ids = (_generatie, [user.id, *vecini])
+
+
+def invalideaza_bridge(*user_ids):
+    """
+    Vecinii memorați ai acestor useri (cache comun și memo-urile din proces)
+    nu mai sunt valabili. Se aplică imediat și din nou la commit: o cerere
+    concurentă poate pune în cache vecinii vechi până atunci.
+    """
 
-    for bridge in bridges:
-        if bridge.from_user_id == user.id:
-            connected_user_ids.append(bridge.to_user_id)
-        else:
-            connected_user_ids.append(bridge.from_user_id)
+    chei = [CHEIE_BRIDGE.format(user_id) for user_id in user_ids]
 
-    return [user.id] + connected_user_ids
+    def aplica():
+        global _generatie
 
+        _generatie += 1
+        cache.delete_many(chei)
 
+    aplica()
+    transaction.on_commit(aplica)
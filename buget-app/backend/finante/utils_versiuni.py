@@ -0,0 +1,143 @@
+import hashlib
+import time
+from datetime import date
+from functools import wraps
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from .utils_users import get_connected_user_ids
+
+
+CHEIE_VERSIUNE = "finante:versiune:{}"
+CHEIE_VERSIUNE_CURSURI = "finante:versiune:cursuri"
+# fără expirare: o versiune pierdută (restart, evicție) se recreează mai nouă
+TIMEOUT_VERSIUNE = None
+
+
+def _versiune_noua():
+    # timestamp în ns: crește mereu, deci o versiune recreată nu repetă una veche
+    return time.time_ns()
+
+
+def versiuni(user_ids):
+    """
+    {user_id: versiune} pentru userii dați, plus versiunea cursurilor
+    sub cheia "cursuri". Versiunile lipsă din cache se creează acum.
+    """
+
+    chei = {CHEIE_VERSIUNE.format(uid): uid for uid in user_ids}
+    chei[CHEIE_VERSIUNE_CURSURI] = "cursuri"
+
+    gasite = cache.get_many(chei)
+    lipsa = {cheie: _versiune_noua() for cheie in chei if cheie not in gasite}
+    if lipsa:
+        cache.set_many(lipsa, TIMEOUT_VERSIUNE)
+        gasite.update(lipsa)
+
+    return {chei[cheie]: v for cheie, v in gasite.items()}
+
+
+def _seteaza(chei):
+    versiune = _versiune_noua()
+    cache.set_many(dict.fromkeys(chei, versiune), TIMEOUT_VERSIUNE)
+
+
+def creste_versiune(*user_ids):
+    """
+    Marchează datele userilor ca schimbate. Se aplică după commit, ca un
+    cititor concurent să nu pună datele vechi sub versiunea nouă.
+    """
+
+    chei = [CHEIE_VERSIUNE.format(uid) for uid in set(user_ids)]
+    transaction.on_commit(lambda: _seteaza(chei))
+
+
+def creste_versiune_cursuri():
+    transaction.on_commit(lambda: _seteaza([CHEIE_VERSIUNE_CURSURI]))
+
+
+# ---------- GET condiționat ----------
+
+
+def _etag_si_data(request, user_ids):
+    v = versiuni(user_ids)
+    azi = date.today()
+
+    semnatura = "|".join(
+        [
+            str(request.user.id),
+            request.path,
+            request.META.get("QUERY_STRING", ""),
+            azi.isoformat(),  # perioada bugetară / „azi” din răspuns
+            ",".join(f"{uid}:{v[uid]}" for uid in sorted(user_ids)),
+            str(v["cursuri"]),
+        ]
+    )
+    # alt format negociat (msgpack, coloane) → altă reprezentare, alt ETag
+    formatul = getattr(getattr(request, "accepted_renderer", None), "format", "json")
+    if formatul != "json":
+        semnatura += f"|{formatul}"
+    etag = quote_etag(hashlib.md5(semnatura.encode()).hexdigest())
+    # „azi” intră în ETag, deci și Last-Modified: nu mai vechi decât începutul
+    # zilei (și al perioadei bugetare), altfel un client doar cu
+    # If-Modified-Since ar primi 304 pe răspunsul calculat ieri
+    modificat = max(
+        max(v.values()) // 1_000_000_000, int(time.mktime(azi.timetuple()))
+    )
+
+    return etag, modificat
+
+
+def _nemodificat(request, etag, modificat):
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+    if if_none_match:
+        # cu If-None-Match, If-Modified-Since se ignoră (RFC 9110)
+        etaguri = parse_etags(if_none_match)
+        return "*" in etaguri or etag in etaguri or f"W/{etag}" in etaguri
+
+    if_modified_since = parse_http_date_safe(
+        request.META.get("HTTP_IF_MODIFIED_SINCE", "")
+    )
+    return if_modified_since is not None and modificat <= if_modified_since
+
+
+def raspuns_conditionat(request, produce):
+    """
+    Răspunde 304 fără să apeleze `produce()` dacă datele userilor conectați
+    (și cursurile) nu s-au schimbat de la ETag-ul / data clientului.
+    """
+
+    if request.method not in ("GET", "HEAD"):
+        return produce()
+
+    etag, modificat = _etag_si_data(request, get_connected_user_ids(request.user))
+
+    if _nemodificat(request, etag, modificat):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = produce()
+        if response.status_code != status.HTTP_200_OK:
+            return response
+
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(modificat)
+    # browserul păstrează răspunsul, dar îl revalidează la fiecare cerere
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def get_conditionat(view):
+    """
+    ETag / Last-Modified pe versiunea datelor userilor conectați.
+    Se pune sub @permission_classes, direct pe funcție.
+    """
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        return raspuns_conditionat(request, lambda: view(request, *args, **kwargs))
+
+    return wrapper
@@ -1,15 +1,31 @@
 from datetime import date, timedelta
-from django.db.models.functions import TruncDate
-from django.db.models import Sum, Q
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.db.models import Q, Sum
 from django.contrib.auth.models import User
 import calendar
+import copy
+import os
+import re
 from calendar import monthrange
 
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
 from rest_framework import viewsets, permissions, status
+from rest_framework.exceptions import ValidationError
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import (
+    action,
+    api_view,
+    parser_classes,
+    permission_classes,
+    renderer_classes,
+)
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from rest_framework.settings import api_settings
 
 from .models import (
     Venit,
@@ -20,6 +36,9 @@ from .models import (
     MiscareFond,
     Fond,
     UserBridge,
+    RezumatLunar,
+    TipRezumat,
+    Moneda,
 )
 
 from .serializers import (
@@ -31,36 +50,429 @@ from .serializers import (
     EconomieLunaraSerializer,
     MiscareFondSerializer,
     FondSerializer,
+    ListaInBlocSerializer,
 )
 
-from .utils import get_luna_bugetara
+from .utils import (
+    get_luna_bugetara,
+    cheie_luna_bugetara,
+    luni_bugetare,
+    perioada_din_cheie,
+)
 from .utils_users import get_connected_user_ids
+from .utils_rezumat import rezumat_luna, rezumat_luni, total_tip
+from .utils_fonduri import timeline_fonduri
+from .utils_solduri import solduri, totaluri_fonduri
+from .pagination import KeysetPagination
+from .instrumentare import HISTOGRAME, buget_interogari, setari_profilare
+from .utils_import import importa_extras, format_din_nume
+from .utils_export import FORMATE_EXPORT, randuri_export
+from .utils_curs import (
+    curs_la,
+    totaluri_convertite,
+    totaluri_convertite_pe_luni,
+    zile_fara_curs,
+)
+from .utils_statistici import instantaneu, istoric
+from .utils_versiuni import get_conditionat, raspuns_conditionat
+from .utils_cache import cache_raspuns, contoare_cache
+from .utils_serializare import codor_pentru, serializeaza
+from .utils_sync import date_sync
+from .utils_scrieri import dupa_scriere_in_bloc, sterge_in_bloc
+from .renderers import JSONColoaneRenderer
+
+
+def _data_din_query(params, nume):
+    valoare = params.get(nume)
+    if not valoare:
+        return None
+
+    data = parse_date(valoare)
+    if data is None:
+        raise ValidationError({nume: "Data trebuie să fie în formatul AAAA-LL-ZZ."})
+    return data
+
+
+def _moneda_din_query(params, nume="moneda"):
+    moneda = params.get(nume)
+    if moneda and moneda not in Moneda.values:
+        raise ValidationError({nume: f"Monedă necunoscută ({', '.join(Moneda.values)})."})
+    return moneda or None
+
+
+# forma răspunsurilor, comună endpointurilor separate și lui dashboard
+
+
+def _raspuns_buget(start, end, venit, total_fixe, total_variabile):
+    total_cheltuieli = total_fixe + total_variabile
+
+    return {
+        "luna": f"{start} – {end}",
+        "venit": venit,
+        "cheltuieli": total_cheltuieli,
+        "fixe": total_fixe,
+        "variabile": total_variabile,
+        "economii": venit - total_cheltuieli,
+    }
+
+
+def _raspuns_grafice(start, end, rezumat, categorii=None):
+    cheltuieli = [
+        {"categorie": categorie, "total": total}
+        for (tip, categorie), total in rezumat.items()
+        if tip == TipRezumat.VARIABILA
+    ]
+    if categorii is not None:
+        # în serii fiecare lună are toate categoriile, în aceeași ordine
+        pe_categorie = {c["categorie"]: c["total"] for c in cheltuieli}
+        cheltuieli = [
+            {"categorie": categorie, "total": pe_categorie.get(categorie, 0)}
+            for categorie in categorii
+        ]
+    venit = total_tip(rezumat, TipRezumat.VENIT)
+
+    return {
+        "luna": f"{start} – {end}",
+        "venit": venit,
+        "cheltuieli": cheltuieli,
+        "economii": venit - sum(c["total"] for c in cheltuieli),
+    }
+
+
+MAX_LUNI_SERIE = 120
+
+# graficele se pot cere și compact (Accept: application/vnd.buget.coloane+json)
+RENDERERE_GRAFICE = [*api_settings.DEFAULT_RENDERER_CLASSES, JSONColoaneRenderer]
+
+
+def _luna_din_query(params, nume):
+    valoare = params.get(nume)
+    if not valoare:
+        return None
+
+    if not re.fullmatch(r"\d{4}-(0[1-9]|1[0-2])", valoare):
+        raise ValidationError({nume: "Luna trebuie să fie în formatul AAAA-LL."})
+    return valoare
+
+
+def _luni_din_query(params):
+    """
+    Lunile bugetare cerute cu ?de_la=AAAA-LL / ?pana_la=AAAA-LL (inclusiv),
+    sau None dacă nu s-a cerut o serie.
+    """
+
+    de_la = _luna_din_query(params, "de_la")
+    pana_la = _luna_din_query(params, "pana_la")
+    if not de_la and not pana_la:
+        return None
+
+    pana_la = pana_la or cheie_luna_bugetara()
+    de_la = de_la or pana_la
+    if de_la > pana_la:
+        raise ValidationError({"de_la": "Trebuie să fie înainte de pana_la."})
+
+    luni = luni_bugetare(de_la, pana_la)
+    if len(luni) > MAX_LUNI_SERIE:
+        raise ValidationError({"de_la": f"Maxim {MAX_LUNI_SERIE} luni."})
+    return luni
+
+
+def _serie_buget(user_ids, luni, baza=None):
+    if baza:
+        # un query grupat pe tabelă, cu conversia în SQL
+        totaluri, fara_curs = totaluri_convertite_pe_luni(
+            baza, luni, user_id__in=user_ids
+        )
+        pe_luni = [
+            (luna, t[TipRezumat.VENIT], t[TipRezumat.FIXA], t[TipRezumat.VARIABILA])
+            for luna, t in totaluri.items()
+        ]
+    else:
+        # un singur query grupat pe rezumatul lunar
+        pe_luni = [
+            (
+                luna,
+                total_tip(rezumat, TipRezumat.VENIT),
+                total_tip(rezumat, TipRezumat.FIXA),
+                total_tip(rezumat, TipRezumat.VARIABILA),
+            )
+            for luna, rezumat in rezumat_luni(user_ids, luni).items()
+        ]
+
+    raspuns = {
+        "de_la": luni[0],
+        "pana_la": luni[-1],
+        "luni": [
+            {"cheie": luna, **_raspuns_buget(*perioada_din_cheie(luna), *totaluri)}
+            for luna, *totaluri in pe_luni
+        ],
+    }
+    if baza:
+        raspuns.update({"moneda": baza, "fara_curs": fara_curs})
+    return raspuns
+
+
+def _serie_grafice(user_ids, luni):
+    pe_luni = rezumat_luni(
+        user_ids, luni, tipuri=[TipRezumat.VENIT, TipRezumat.VARIABILA]
+    )
+    categorii = sorted(
+        {
+            categorie
+            for rezumat in pe_luni.values()
+            for tip, categorie in rezumat
+            if tip == TipRezumat.VARIABILA
+        }
+    )
+
+    return {
+        "de_la": luni[0],
+        "pana_la": luni[-1],
+        "luni": [
+            {
+                "cheie": luna,
+                **_raspuns_grafice(*perioada_din_cheie(luna), rezumat, categorii),
+            }
+            for luna, rezumat in pe_luni.items()
+        ],
+    }
+
+
+def _raspuns_status_venit(luni):
+    # luni: (luna bugetară, total), în ordine
+    luni = list(luni)
+
+    return {
+        "labels": [luna for luna, _ in luni],
+        "data": [float(total) for _, total in luni],
+    }
+
+
+def _raspuns_vacanta(puse, cheltuite):
+    return {
+        "puse_deoparte": puse,
+        "cheltuite": cheltuite,
+        "ramase": puse - cheltuite,
+    }
+
+
+def _raspuns_fonduri(total_eur, total_ron, miscari):
+    return {
+        "total_eur": total_eur,
+        "total_ron": total_ron,
+        "miscari": miscari,
+    }
 
 
 class BaseViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    # interogări permise pe acțiune (auth + bridge + rezumat lunar și
+    # statistici incluse, cu INSERT-urile de la prima scriere pe o cheie)
+    buget_interogari = {
+        "list": 3,
+        "retrieve": 3,
+        "create": 15,
+        "update": 21,
+        "partial_update": 21,
+        "destroy": 8,
+    }
+    camp_cursor = "data"  # câmpul după care se paginează (desc, apoi id desc)
+    filtru_categorie = False
 
     def get_queryset(self):
         user_ids = get_connected_user_ids(self.request.user)
-        return self.queryset.filter(user_id__in=user_ids)
+        qs = self.queryset.filter(user_id__in=user_ids)
 
+        params = self.request.query_params
+
+        # ?de_la=2026-01-01&pana_la=2026-01-31
+        de_la = _data_din_query(params, "de_la")
+        if de_la:
+            qs = qs.filter(data__gte=de_la)
+
+        pana_la = _data_din_query(params, "pana_la")
+        if pana_la:
+            qs = qs.filter(data__lte=pana_la)
+
+        # ?categorie=alimente (se poate repeta)
+        if self.filtru_categorie and params.getlist("categorie"):
+            qs = qs.filter(categorie__in=params.getlist("categorie"))
+
+        return qs
+
+    # 304 dacă datele userilor conectați nu s-au schimbat (utils_versiuni)
+    def list(self, request, *args, **kwargs):
+        return raspuns_conditionat(request, lambda: self._lista(request))
+
+    def _lista(self, request):
+        # rândurile ca tupluri, prin codorul serializerului (utils_serializare)
+        codor = codor_pentru(self.get_serializer_class())
+        if codor is None:
+            return super().list(request)
+
+        randuri = codor.valori(
+            self.filter_queryset(self.get_queryset()), self.camp_cursor, "id"
+        )
+        pagina = self.paginate_queryset(randuri)
+        if pagina is not None:
+            return self.get_paginated_response(codor.codeaza(pagina))
+        return Response(codor.codeaza(randuri))
+
+    def retrieve(self, request, *args, **kwargs):
+        return raspuns_conditionat(
+            request, lambda: super(BaseViewSet, self).retrieve(request, *args, **kwargs)
+        )
+
+    # scrierea și actualizarea rezumatului lunar (signals.py) în aceeași tranzacție
+    @transaction.atomic
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    @transaction.atomic
+    def perform_update(self, serializer):
+        serializer.save()
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
+
+
+MAX_IN_BLOC = 500  # elemente (create + update + delete) pe o cerere /bulk/
+
+
+def _id_element(element):
+    # id-ul unui element din "update" (dict) sau "delete" (număr)
+    valoare = element.get("id") if isinstance(element, dict) else element
+    return valoare if type(valoare) is int else None
 
-class VenitViewSet(BaseViewSet):
-    queryset = Venit.objects.all()
+
+class ScriereInBlocMixin:
+    """
+    POST .../bulk/ cu {"create": [...], "update": [{"id": ..., ...}],
+    "delete": [id, ...]}: elementele se validează într-o singură trecere
+    (ListaInBlocSerializer) și se scriu într-o tranzacție, cu bulk_create,
+    bulk_update și un singur QuerySet.delete(); rezumatul, statisticile și
+    versiunile se actualizează o dată pe cheie (dupa_scriere_in_bloc).
+    Răspunsul are rezultatul pe element; dacă vreun element e invalid, nu
+    se scrie nimic și vin erorile pe element.
+    """
+
+    buget_interogari = {**BaseViewSet.buget_interogari, "bulk": 40}
+
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        corp = request.data if isinstance(request.data, dict) else {}
+        liste = {cheie: corp.get(cheie, []) for cheie in ("create", "update", "delete")}
+        if not all(isinstance(lista, list) for lista in liste.values()):
+            raise ValidationError('"create", "update" și "delete" sunt liste.')
+        if sum(len(lista) for lista in liste.values()) > MAX_IN_BLOC:
+            raise ValidationError(f"Cel mult {MAX_IN_BLOC} elemente pe cerere.")
+
+        ids = [_id_element(e) for e in liste["update"] + liste["delete"]]
+        ids = [i for i in ids if i is not None]
+        if len(ids) != len(set(ids)):
+            raise ValidationError("Un rând poate apărea o singură dată pe cerere.")
+
+        with transaction.atomic():
+            # rândurile gospodăriei, blocate până la commit (suma veche e
+            # scăzută din rezumat)
+            randuri = (
+                self.get_queryset().select_for_update(of=("self",)).in_bulk(ids)
+            )
+            creari, actualizari = self._valideaza_in_bloc(liste, randuri)
+            erori_stergeri = [
+                {} if _id_element(e) in randuri else {"id": ["Rând inexistent."]}
+                for e in liste["delete"]
+            ]
+
+            if creari.errors or actualizari.errors or any(erori_stergeri):
+                return Response(
+                    {
+                        "create": creari.errors or [{}] * len(liste["create"]),
+                        "update": actualizari.errors or [{}] * len(liste["update"]),
+                        "delete": erori_stergeri,
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            sterse = [randuri[i] for i in liste["delete"]]
+            actualizate = [randuri[e["id"]] for e in liste["update"]]
+            noi = self._scrie_in_bloc(
+                sterse, actualizate, actualizari.validated_data, creari.validated_data
+            )
+
+        return Response(
+            {
+                "create": self.get_serializer(noi, many=True).data,
+                "update": self.get_serializer(actualizate, many=True).data,
+                "delete": liste["delete"],
+            }
+        )
+
+    def _valideaza_in_bloc(self, liste, randuri):
+        serializer_class = self.get_serializer_class()
+        context = self.get_serializer_context()
+
+        creari = ListaInBlocSerializer(
+            child=serializer_class(context=context),
+            data=liste["create"],
+            context=context,
+        )
+        actualizari = ListaInBlocSerializer(
+            randuri,
+            child=serializer_class(partial=True, context=context),
+            data=liste["update"],
+            partial=True,
+            context=context,
+        )
+        creari.is_valid()
+        actualizari.is_valid()
+        return creari, actualizari
+
+    def _scrie_in_bloc(self, sterse, actualizate, modificari, creari):
+        model = self.queryset.model
+
+        sterge_in_bloc(sterse)
+
+        if actualizate:
+            inlocuite = [copy.copy(obj) for obj in actualizate]
+            campuri = {"luna_bugetara", "updated_at"}
+            acum = timezone.now()  # bulk_update nu aplică auto_now
+            for obj, valori in zip(actualizate, modificari):
+                for camp, valoare in valori.items():
+                    setattr(obj, camp, valoare)
+                campuri.update(valori)
+                obj.seteaza_luna_bugetara()
+                obj.updated_at = acum
+            model.objects.bulk_update(actualizate, campuri)
+            dupa_scriere_in_bloc(actualizate, inlocuite=inlocuite)
+
+        noi = [model(user=self.request.user, **valori) for valori in creari]
+        if noi:
+            for obj in noi:
+                obj.seteaza_luna_bugetara()
+            model.objects.bulk_create(noi)
+            dupa_scriere_in_bloc(noi)
+
+        return noi
+
+
+class VenitViewSet(ScriereInBlocMixin, BaseViewSet):
+    queryset = Venit.objects.select_related("user")
     serializer_class = VenitSerializer
+    camp_cursor = "created_at"
 
 
-class CheltuialaFixaViewSet(BaseViewSet):
-    queryset = CheltuialaFixa.objects.all()
+class CheltuialaFixaViewSet(ScriereInBlocMixin, BaseViewSet):
+    queryset = CheltuialaFixa.objects.select_related("user")
     serializer_class = CheltuialaFixaSerializer
 
 
-class CheltuialaVariabilaViewSet(BaseViewSet):
-    queryset = CheltuialaVariabila.objects.all()
+class CheltuialaVariabilaViewSet(ScriereInBlocMixin, BaseViewSet):
+    queryset = CheltuialaVariabila.objects.select_related("user")
     serializer_class = CheltuialaVariabilaSerializer
+    filtru_categorie = True
 
 
 class EconomieVacantaViewSet(BaseViewSet):
@@ -70,6 +482,7 @@ class EconomieVacantaViewSet(BaseViewSet):
 
 class RegisterView(APIView):
     permission_classes = []
+    buget_interogari = 10
 
     def post(self, request):
         serializer = RegisterSerializer(data=request.data)
@@ -87,22 +500,10 @@ class FondViewSet(BaseViewSet):
     serializer_class = FondSerializer
 
 
-def perioada_bugetara(ref_date=None):
-    if not ref_date:
-        ref_date = date.today()
-
-    if ref_date.day >= 26:
-        start = ref_date.replace(day=26)
-        end = (start.replace(day=1) + timedelta(days=32)).replace(day=25)
-    else:
-        end = ref_date.replace(day=25)
-        start = (end.replace(day=1) - timedelta(days=1)).replace(day=26)
-
-    return start, end
-
-
+@buget_interogari(3)
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@get_conditionat
 def venit_total_lunar(request):
     today = date.today()
 
@@ -130,6 +531,7 @@ def venit_total_lunar(request):
     )
 
 
+@buget_interogari(1)
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def me(request):
@@ -144,112 +546,93 @@ def me(request):
     )
 
 
+@buget_interogari(5)
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@get_conditionat
 def buget_lunar(request):
-    start, end = perioada_bugetara()
+    start, end = get_luna_bugetara()
     user_ids = get_connected_user_ids(request.user)
+    baza = _moneda_din_query(request.query_params)
 
-    venit = (
-        Venit.objects.filter(
-            user_id__in=user_ids,
-            data__range=(start, end),
-        ).aggregate(
-            total=Sum("suma")
-        )["total"]
-        or 0
-    )
+    # ?de_la=2025-01&pana_la=2026-12 → seria lunilor, nu doar luna curentă
+    luni = _luni_din_query(request.query_params)
+    if luni:
+        return Response(_serie_buget(user_ids, luni, baza))
 
-    total_fixe = (
-        CheltuialaFixa.objects.filter(
-            user_id__in=user_ids,
-            data__range=(start, end),
-        ).aggregate(total=Sum("suma"))["total"]
-        or 0
-    )
+    if baza:
+        # ?moneda=EUR → totaluri convertite cu cursul zilei fiecărui rând, în SQL
+        totaluri, fara_curs = totaluri_convertite(
+            baza, user_id__in=user_ids, data__range=(start, end)
+        )
+        venit = totaluri[TipRezumat.VENIT]
+        total_fixe = totaluri[TipRezumat.FIXA]
+        total_variabile = totaluri[TipRezumat.VARIABILA]
+    else:
+        # un singur query pe rezumatul lunar, nu trei agregări pe tabelele brute
+        rezumat = rezumat_luna(user_ids, cheie_luna_bugetara(start))
 
-    total_variabile = (
-        CheltuialaVariabila.objects.filter(
-            user_id__in=user_ids,
-            data__range=(start, end),
-        ).aggregate(total=Sum("suma"))["total"]
-        or 0
-    )
+        venit = total_tip(rezumat, TipRezumat.VENIT)
+        total_fixe = total_tip(rezumat, TipRezumat.FIXA)
+        total_variabile = total_tip(rezumat, TipRezumat.VARIABILA)
 
-    total_cheltuieli = total_fixe + total_variabile
+    raspuns = _raspuns_buget(start, end, venit, total_fixe, total_variabile)
+    if baza:
+        raspuns.update({"moneda": baza, "fara_curs": fara_curs})
 
-    return Response(
-        {
-            "luna": f"{start} – {end}",
-            "venit": venit,
-            "cheltuieli": total_cheltuieli,
-            "fixe": total_fixe,
-            "variabile": total_variabile,
-            "economii": venit - total_cheltuieli,
-        }
-    )
+    return Response(raspuns)
 
 
+@buget_interogari(3)
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@renderer_classes(RENDERERE_GRAFICE)
+@get_conditionat
+@cache_raspuns([Venit, CheltuialaVariabila])
 def grafice_luna(request):
-    start, end = perioada_bugetara()
+    start, end = get_luna_bugetara()
     user_ids = get_connected_user_ids(request.user)
 
-    cheltuieli = (
-        CheltuialaVariabila.objects.filter(
-            user_id__in=user_ids, data__range=(start, end)
-        )
-        .values("categorie")
-        .annotate(total=Sum("suma"))
-    )
-    venit = (
-        Venit.objects.filter(user_id__in=user_ids, data__range=(start, end)).aggregate(
-            total=Sum("suma")
-        )["total"]
-        or 0
-    )
+    luni = _luni_din_query(request.query_params)
+    if luni:
+        return Response(_serie_grafice(user_ids, luni))
 
-    return Response(
-        {
-            "luna": f"{start} – {end}",
-            "venit": venit,
-            "cheltuieli": list(cheltuieli),
-            "economii": venit - sum(c["total"] for c in cheltuieli),
-        }
+    rezumat = rezumat_luna(
+        user_ids,
+        cheie_luna_bugetara(start),
+        tipuri=[TipRezumat.VENIT, TipRezumat.VARIABILA],
     )
 
+    return Response(_raspuns_grafice(start, end, rezumat))
 
+
+@buget_interogari(9)
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
 def calculeaza_economii_luna(request):
-    start, end = perioada_bugetara()
-    luna = f"{start.year}-{start.month:02d}"
+    start, end = get_luna_bugetara()
+    luna = cheie_luna_bugetara(start)
     user_ids = get_connected_user_ids(request.user)
 
-    venit = (
-        Venit.objects.filter(
-            user_id__in=user_ids,
-            data__range=(start, end),
-        ).aggregate(
-            total=Sum("suma")
-        )["total"]
-        or 0
-    )
+    # soldul lunar e în EUR: rândurile în RON se convertesc cu cursul zilei lor
+    filtre = dict(user_id__in=user_ids, data__range=(start, end))
+    totaluri, fara_curs = totaluri_convertite(Moneda.EUR, **filtre)
 
-    cheltuieli = (
-        CheltuialaFixa.objects.filter(
-            user_id__in=user_ids,
-            data__range=(start, end),
-        ).aggregate(total=Sum("suma"))["total"]
-        or 0
-    ) + (
-        CheltuialaVariabila.objects.filter(
-            user_id__in=user_ids,
-            data__range=(start, end),
-        ).aggregate(total=Sum("suma"))["total"]
-        or 0
-    )
+    # fără curs, rândurile ar lipsi din sold: nu salvăm un sold greșit
+    if fara_curs:
+        return Response(
+            {
+                "detail": "Lipsește cursul valutar pentru unele zile; "
+                "soldul nu s-a salvat.",
+                "luna": luna,
+                "fara_curs": fara_curs,
+                "zile_fara_curs": zile_fara_curs(Moneda.EUR, **filtre),
+            },
+            status=status.HTTP_409_CONFLICT,
+        )
+
+    venit = totaluri[TipRezumat.VENIT]
+    cheltuieli = totaluri[TipRezumat.FIXA] + totaluri[TipRezumat.VARIABILA]
 
     economie = venit - cheltuieli
 
@@ -265,20 +648,26 @@ def calculeaza_economii_luna(request):
             "venit": venit,
             "cheltuieli": cheltuieli,
             "economie": economie,
+            "fara_curs": fara_curs,
         }
     )
 
 
+@buget_interogari(2)
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@get_conditionat
+@cache_raspuns([EconomieLunara], doar_userul=True)
 def istoric_economii(request):
     data = EconomieLunara.objects.filter(user=request.user).order_by("luna")
     serializer = EconomieLunaraSerializer(data, many=True)
     return Response(serializer.data)
 
 
+@buget_interogari(3)
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@get_conditionat
 def economii_vacanta_sumar(request):
     puse = (
         EconomieVacanta.objects.filter(user=request.user, tip="economii").aggregate(
@@ -294,15 +683,29 @@ def economii_vacanta_sumar(request):
         or 0
     )
 
-    return Response(
-        {
-            "puse_deoparte": puse,
-            "cheltuite": cheltuite,
-            "ramase": puse - cheltuite,
-        }
-    )
+    return Response(_raspuns_vacanta(puse, cheltuite))
 
 
+SEMNE_MISCARE = {"retrage": -1, "adauga": 1}
+
+
+def _sume_cu_semn(serializer, semne=SEMNE_MISCARE):
+    # retragerile au sumele negative (și adăugările pozitive), puse înainte
+    # de salvare: o singură scriere, un singur pas în sold
+    miscare = serializer.instance
+    date = serializer.validated_data
+    semn = semne.get(date.get("tip", getattr(miscare, "tip", None)))
+
+    sume = {}
+    for camp in ("suma_eur", "suma_ron"):
+        valoare = date.get(camp, getattr(miscare, camp, None))
+        if semn and valoare:
+            sume[camp] = semn * abs(valoare)
+    return sume
+
+
+# soldul rubricii (utils_solduri) inclus, și la prima mișcare pe rubrică
+@buget_interogari(7)
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
 def miscare_fond(request):
@@ -310,15 +713,12 @@ def miscare_fond(request):
     if not serializer.is_valid():
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-    miscare = serializer.save(user=request.user)
-
-    # dacă e retragere, transformăm suma în negativ
-    if miscare.tip == "retrage":
-        if miscare.suma_eur:
-            miscare.suma_eur = -abs(miscare.suma_eur)
-        if miscare.suma_ron:
-            miscare.suma_ron = -abs(miscare.suma_ron)
-        miscare.save()
+    # dacă e retragere, transformăm suma în negativ; soldul rubricii
+    # (signals.py) se actualizează în aceeași tranzacție
+    with transaction.atomic():
+        miscare = serializer.save(
+            user=request.user, **_sume_cu_semn(serializer, {"retrage": -1})
+        )
 
     return Response(
         MiscareFondSerializer(miscare).data,
@@ -326,6 +726,7 @@ def miscare_fond(request):
     )
 
 
+@buget_interogari(12)
 @api_view(["PUT", "DELETE"])
 @permission_classes([IsAuthenticated])
 def miscare_fond_detail(request, pk):
@@ -339,59 +740,44 @@ def miscare_fond_detail(request, pk):
         )
 
     if request.method == "DELETE":
-        miscare.delete()
+        with transaction.atomic():
+            miscare.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     serializer = MiscareFondSerializer(miscare, data=request.data, partial=True)
     if not serializer.is_valid():
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-    miscare = serializer.save()
-
-    if miscare.tip == "retrage":
-        if miscare.suma_eur:
-            miscare.suma_eur = -abs(miscare.suma_eur)
-        if miscare.suma_ron:
-            miscare.suma_ron = -abs(miscare.suma_ron)
-        miscare.save()
-    elif miscare.tip == "adauga":
-        if miscare.suma_eur:
-            miscare.suma_eur = abs(miscare.suma_eur)
-        if miscare.suma_ron:
-            miscare.suma_ron = abs(miscare.suma_ron)
-        miscare.save()
+    with transaction.atomic():
+        miscare = serializer.save(**_sume_cu_semn(serializer))
 
     return Response(MiscareFondSerializer(miscare).data)
 
 
+@buget_interogari(5)
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@get_conditionat
 def fonduri(request):
     user_ids = get_connected_user_ids(request.user)
 
     qs = MiscareFond.objects.filter(user_id__in=user_ids)
 
-    total_eur = qs.aggregate(total=Sum("suma_eur"))["total"] or 0
-    total_ron = qs.aggregate(total=Sum("suma_ron"))["total"] or 0
-
-    serializer = MiscareFondSerializer(qs, many=True)
+    # totalurile din soldurile pe rubrici, nu din tot istoricul
+    total_eur, total_ron = totaluri_fonduri(user_ids)
 
     return Response(
-        {
-            "total_eur": total_eur,
-            "total_ron": total_ron,
-            "miscari": serializer.data,
-        }
+        _raspuns_fonduri(total_eur, total_ron, serializeaza(MiscareFondSerializer, qs))
     )
 
 
+@buget_interogari(3)
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@renderer_classes(RENDERERE_GRAFICE)
+@get_conditionat
 def fonduri_grafic(request):
-    qs = MiscareFond.objects.filter(user=request.user)
-
-    total_eur = qs.aggregate(total=Sum("suma_eur"))["total"] or 0
-    total_ron = qs.aggregate(total=Sum("suma_ron"))["total"] or 0
+    total_eur, total_ron = totaluri_fonduri([request.user.id])
 
     return Response(
         {
@@ -401,70 +787,171 @@ def fonduri_grafic(request):
     )
 
 
+@buget_interogari(2)
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
-def fonduri_grafic_timeline(request):
-    qs = (
-        MiscareFond.objects.filter(user=request.user)
-        .annotate(zi=TruncDate("data"))
-        .values("zi")
-        .annotate(
-            eur=Sum("suma_eur"),
-            ron=Sum("suma_ron"),
-        )
-        .order_by("zi")
-    )
-
-    labels = []
-    eur = []
-    ron = []
-
-    sold_eur = 0
-    sold_ron = 0
-
-    for r in qs:
-        sold_eur += r["eur"] or 0
-        sold_ron += r["ron"] or 0
-        labels.append(r["zi"])
-        eur.append(sold_eur)
-        ron.append(sold_ron)
+@get_conditionat
+def fonduri_solduri(request):
+    # soldurile pe rubrici ale gospodăriei, din SoldFond (utils_solduri)
+    user_ids = get_connected_user_ids(request.user)
+    pe_rubrici = solduri(user_ids)
+    rubrici = [
+        {
+            "rubrica": rubrica,
+            "nume": nume,
+            "sold_eur": pe_rubrici[rubrica].get(Moneda.EUR, 0),
+            "sold_ron": pe_rubrici[rubrica].get(Moneda.RON, 0),
+        }
+        for rubrica, nume in MiscareFond.RUBRICI
+    ]
 
     return Response(
         {
-            "labels": labels,
-            "datasets": [
-                {"label": "EUR", "data": eur},
-                {"label": "RON", "data": ron},
-            ],
+            "rubrici": rubrici,
+            "total_eur": sum(r["sold_eur"] for r in rubrici),
+            "total_ron": sum(r["sold_ron"] for r in rubrici),
         }
     )
 
 
+@buget_interogari(2)
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@renderer_classes(RENDERERE_GRAFICE)
+@get_conditionat
+@cache_raspuns([MiscareFond, User], doar_userul=True)
+def fonduri_grafic_timeline(request):
+    total, _ = timeline_fonduri([request.user.id])
+    return Response(total)
+
+
+@buget_interogari(3)
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+@renderer_classes(RENDERERE_GRAFICE)
+@get_conditionat
+@cache_raspuns([Venit])
 def venit_status_lunar(request):
     user_ids = get_connected_user_ids(request.user)
-    venituri = Venit.objects.filter(user_id__in=user_ids)
 
-    luni = {}
+    # gruparea pe luna bugetară se face în baza de date
+    luni = (
+        Venit.objects.filter(user_id__in=user_ids)
+        .values("luna_bugetara")
+        .annotate(total=Sum("suma"))
+        .order_by("luna_bugetara")
+    )
 
-    for v in venituri:
-        start, _ = get_luna_bugetara(v.data)
-        key = f"{start.year}-{start.month:02d}"
-        luni.setdefault(key, 0)
-        luni[key] += float(v.suma)
+    return Response(
+        _raspuns_status_venit((l["luna_bugetara"], l["total"]) for l in luni)
+    )
 
-    labels = sorted(luni.keys())
-    data = [luni[l] for l in labels]
+
+# Home / Economii dintr-o singură cerere
+
+
+@buget_interogari(5)
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+@get_conditionat
+def dashboard(request):
+    """
+    Răspunsurile buget_lunar, grafice_luna, venit_status_lunar,
+    economii_vacanta_sumar și fonduri, cu userii și perioada aflate o dată
+    și câte un query pe tabelă (agregări condiționate pe rezumatul lunar).
+    """
+
+    start, end = get_luna_bugetara()
+    user_ids = get_connected_user_ids(request.user)
 
     return Response(
-        {
-            "labels": labels,
-            "data": data,
-        }
+        _raspuns_dashboard(
+            start,
+            end,
+            _dashboard_rezumat(user_ids, cheie_luna_bugetara(start), request.user.id),
+            _dashboard_vacanta(request.user.id),
+            _dashboard_fonduri(user_ids),
+        )
+    )
+
+
+# cele trei query-uri ale lui dashboard sunt independente (views_async le
+# rulează în paralel)
+
+
+def _dashboard_rezumat(user_ids, luna, user_id):
+    # luna curentă (buget + grafice), venitul pe luni (status) și vacanța
+    vacanta = Q(tip=TipRezumat.VARIABILA, categorie="vacanta")
+    randuri = (
+        RezumatLunar.objects.filter(user_id__in=user_ids, numar__gt=0)
+        .filter(Q(luna=luna) | Q(tip=TipRezumat.VENIT) | vacanta)
+        .values("luna", "tip", "categorie")
+        .annotate(
+            suma=Sum("total"),
+            vacanta_mea=Sum("total", filter=vacanta & Q(user_id=user_id)),
+        )
+        .order_by("luna", "tip", "categorie")
     )
 
+    rezumat = {}
+    venit_pe_luni = {}
+    cheltuite_vacanta = 0
+    for r in randuri:
+        if r["luna"] == luna:
+            rezumat[(r["tip"], r["categorie"])] = r["suma"]
+        if r["tip"] == TipRezumat.VENIT:
+            venit_pe_luni[r["luna"]] = r["suma"]
+        if r["vacanta_mea"] is not None:
+            cheltuite_vacanta += r["vacanta_mea"]
+
+    return rezumat, venit_pe_luni, cheltuite_vacanta
+
+
+def _dashboard_vacanta(user_id):
+    return (
+        EconomieVacanta.objects.filter(user_id=user_id, tip="economii").aggregate(
+            total=Sum("suma")
+        )["total"]
+        or 0
+    )
+
+
+def _dashboard_fonduri(user_ids):
+    # totalurile fondurilor se adună din aceleași rânduri, fără al doilea query
+    qs = MiscareFond.objects.filter(user_id__in=user_ids)
+    codor = codor_pentru(MiscareFondSerializer)
+    if codor is None:
+        # serializerul are câmpuri fără coloană directă: rândurile trec prin DRF
+        miscari = list(qs.select_related("user"))
+        randuri = MiscareFondSerializer(miscari, many=True).data
+    else:
+        miscari = list(codor.valori(qs))
+        randuri = codor.codeaza(miscari)
+    total_eur = sum((m.suma_eur for m in miscari if m.suma_eur is not None), 0)
+    total_ron = sum((m.suma_ron for m in miscari if m.suma_ron is not None), 0)
+
+    return _raspuns_fonduri(total_eur, total_ron, randuri)
+
+
+def _raspuns_dashboard(start, end, din_rezumat, puse_vacanta, fonduri):
+    rezumat, venit_pe_luni, cheltuite_vacanta = din_rezumat
 
+    return {
+        "buget_lunar": _raspuns_buget(
+            start,
+            end,
+            total_tip(rezumat, TipRezumat.VENIT),
+            total_tip(rezumat, TipRezumat.FIXA),
+            total_tip(rezumat, TipRezumat.VARIABILA),
+        ),
+        "grafice_luna": _raspuns_grafice(start, end, rezumat),
+        "venit_status": _raspuns_status_venit(venit_pe_luni.items()),
+        "economii_vacanta": _raspuns_vacanta(puse_vacanta, cheltuite_vacanta),
+        "fonduri": fonduri,
+    }
+
+
+@buget_interogari(2)
 @api_view(["GET"])
 @permission_classes([IsAdminUser])
 def lista_utilizatori(request):
@@ -485,6 +972,7 @@ def lista_utilizatori(request):
     return Response(data)
 
 
+@buget_interogari(3)
 @api_view(["PUT"])
 @permission_classes([IsAdminUser])
 def update_user(request, pk):
@@ -500,26 +988,96 @@ def update_user(request, pk):
     return Response({"success": True})
 
 
+@buget_interogari(4)
 @api_view(["GET"])
 @permission_classes([IsAdminUser])
 def admin_stats(request):
-    total_venit = Venit.objects.aggregate(total=Sum("suma"))["total"] or 0
+    baza = _moneda_din_query(request.query_params)
 
-    total_cheltuieli = (
-        CheltuialaFixa.objects.aggregate(total=Sum("suma"))["total"] or 0
-    ) + (CheltuialaVariabila.objects.aggregate(total=Sum("suma"))["total"] or 0)
+    if baza:
+        totaluri, fara_curs = totaluri_convertite(baza)
+        total_venit = totaluri[TipRezumat.VENIT]
+        total_cheltuieli = totaluri[TipRezumat.FIXA] + totaluri[TipRezumat.VARIABILA]
+        raspuns = {}
+    else:
+        # instantaneul precalculat: un query, indiferent de volumul de date
+        raspuns = instantaneu()
+        total_venit = raspuns.pop("total_venit")
+        total_cheltuieli = raspuns.pop("total_cheltuieli")
 
     economii = total_venit - total_cheltuieli
 
+    raspuns = {
+        "total_venit": total_venit,
+        "total_cheltuieli": total_cheltuieli,
+        "economii": economii,
+        **raspuns,
+    }
+    if baza:
+        raspuns.update({"moneda": baza, "fara_curs": fara_curs})
+
+    return Response(raspuns)
+
+
+ZILE_ISTORIC = 90
+MAX_ZILE_ISTORIC = 3660
+
+
+@buget_interogari(2)
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def admin_stats_istoric(request):
+    """
+    Serii zilnice de useri noi și tranzacții noi, pentru graficul de creștere.
+    Implicit ultimele ZILE_ISTORIC zile; altfel ?de_la / ?pana_la.
+    """
+
+    pana_la = _data_din_query(request.query_params, "pana_la") or date.today()
+    de_la = _data_din_query(request.query_params, "de_la") or (
+        pana_la - timedelta(days=ZILE_ISTORIC - 1)
+    )
+
+    if de_la > pana_la:
+        raise ValidationError({"de_la": "Trebuie să fie înainte de pana_la."})
+    if (pana_la - de_la).days >= MAX_ZILE_ISTORIC:
+        raise ValidationError({"de_la": f"Maxim {MAX_ZILE_ISTORIC} zile."})
+
+    return Response(istoric(de_la, pana_la))
+
+
+@buget_interogari(1)
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def admin_cache(request):
+    # hit / miss pe endpointurile de grafice cache-uite
+    return Response(contoare_cache())
+
+
+@buget_interogari(1)
+@api_view(["GET", "DELETE"])
+@permission_classes([IsAdminUser])
+def admin_perf(request):
+    """
+    Latența pe rută (histograme din ProfilareMiddleware) în procesul care
+    răspunde; fiecare worker are ale lui. DELETE le golește.
+    """
+
+    if request.method == "DELETE":
+        HISTOGRAME.goleste()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    setari = setari_profilare()
     return Response(
         {
-            "total_venit": total_venit,
-            "total_cheltuieli": total_cheltuieli,
-            "economii": economii,
+            "proces": os.getpid(),
+            "fereastra_s": setari["FEREASTRA_S"],
+            "esantion": setari["ESANTION"],
+            "rute": HISTOGRAME.instantaneu(),
         }
     )
 
 
+@buget_interogari(30)
 @api_view(["DELETE"])
 @permission_classes([IsAdminUser])
 def delete_user(request, pk):
@@ -542,6 +1100,7 @@ def delete_user(request, pk):
 # Send request from one user to another (e.g. for sharing budget data)
 
 
+@buget_interogari(3)
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
 def send_bridge_request(request):
@@ -557,6 +1116,7 @@ def send_bridge_request(request):
 # Accept bridge request
 
 
+@buget_interogari(3)
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
 def accept_bridge(request, pk):
@@ -566,6 +1126,7 @@ def accept_bridge(request, pk):
     return Response({"success": True})
 
 
+@buget_interogari(2)
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def lista_useri_simpli(request):
@@ -582,6 +1143,7 @@ def lista_useri_simpli(request):
     return Response(data)
 
 
+@buget_interogari(2)
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
 def send_bridge(request):
@@ -595,6 +1157,7 @@ def send_bridge(request):
     return Response({"success": True})
 
 
+@buget_interogari(3)
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
 def accept_bridge(request, pk):
@@ -605,94 +1168,122 @@ def accept_bridge(request, pk):
     return Response({"success": True})
 
 
+@buget_interogari(3)
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@get_conditionat
 def bridge_requests(request):
-    bridges = UserBridge.objects.filter(to_user=request.user, accepted=False)
+    bridges = UserBridge.objects.filter(
+        to_user=request.user, accepted=False
+    ).select_related("from_user")
 
     data = [{"id": b.id, "from_user": b.from_user.username} for b in bridges]
 
     return Response(data)
 
 
-def get_connected_user_ids(user):
-    bridges = UserBridge.objects.filter(accepted=True).filter(
-        Q(from_user=user) | Q(to_user=user)
-    )
+# grafice invetitii fonduri pentru conturi  conectate (ex. eu + partener) – total și separat per user
+
+
+@buget_interogari(4)
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+@renderer_classes(RENDERERE_GRAFICE)
+@get_conditionat
+@cache_raspuns([MiscareFond, User])
+def fonduri_grafic_timeline_extended(request):
+    user_ids = get_connected_user_ids(request.user)
 
-    connected_user_ids = []
+    # total + per user dintr-un singur query (funcții fereastră)
+    total_data, per_user = timeline_fonduri(user_ids)
 
-    for bridge in bridges:
-        if bridge.from_user_id == user.id:
-            connected_user_ids.append(bridge.to_user_id)
-        else:
-            connected_user_ids.append(bridge.from_user_id)
+    return Response({"total": total_data, "per_user": per_user})
 
-    return [user.id] + connected_user_ids
 
+# import extras de cont (CSV / OFX) → venituri + cheltuieli variabile
 
-# grafice invetitii fonduri pentru conturi  conectate (ex. eu + partener) – total și separat per user
 
+# autentificarea; fiecare lot are bugetul lui (utils_import.buget_lot)
+@buget_interogari(1)
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+@parser_classes([MultiPartParser])
+def import_extras(request):
+    fisier = request.FILES.get("fisier")
+    if not fisier:
+        return Response({"error": "Fișierul lipsește"}, status=400)
+
+    format_ = request.data.get("format") or format_din_nume(fisier.name)
+    moneda = request.data.get("moneda", Moneda.EUR)
+
+    if format_ not in ("csv", "ofx"):
+        return Response({"error": "Format necunoscut (csv sau ofx)"}, status=400)
+    if moneda not in Moneda.values:
+        return Response({"error": "Monedă necunoscută"}, status=400)
 
+    try:
+        rezultat = importa_extras(fisier.open("rb"), request.user, format_, moneda)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=400)
+
+    return Response(rezultat, status=status.HTTP_201_CREATED)
+
+
+# export complet (CSV / NDJSON), trimis în flux
+
+
+# rândurile se citesc cu cursor pe server, câte un query pe tabelă
+@buget_interogari(6)
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
-def fonduri_grafic_timeline_extended(request):
+def export_date(request):
+    # ?fisier=csv|ndjson (`format` e rezervat de DRF pentru renderere)
+    fisier = request.query_params.get("fisier", "csv")
+    if fisier not in FORMATE_EXPORT:
+        return Response({"error": "Format necunoscut (csv sau ndjson)"}, status=400)
+
+    de_la = _data_din_query(request.query_params, "de_la")
+    pana_la = _data_din_query(request.query_params, "pana_la")
     user_ids = get_connected_user_ids(request.user)
 
-    # TOTAL (toți conectați)
-    qs_total = (
-        MiscareFond.objects.filter(user_id__in=user_ids)
-        .annotate(zi=TruncDate("data"))
-        .values("zi")
-        .annotate(
-            eur=Sum("suma_eur"),
-            ron=Sum("suma_ron"),
-        )
-        .order_by("zi")
+    encoder, content_type = FORMATE_EXPORT[fisier]
+    response = StreamingHttpResponse(
+        encoder(randuri_export(user_ids, de_la, pana_la)),
+        content_type=content_type,
     )
+    response["Content-Disposition"] = f'attachment; filename="buget.{fisier}"'
+    return response
 
-    def build_timeline(qs):
-        labels = []
-        eur = []
-        ron = []
-
-        sold_eur = 0
-        sold_ron = 0
-
-        for r in qs:
-            sold_eur += r["eur"] or 0
-            sold_ron += r["ron"] or 0
-            labels.append(r["zi"])
-            eur.append(sold_eur)
-            ron.append(sold_ron)
-
-        return {
-            "labels": labels,
-            "datasets": [
-                {"label": "EUR", "data": eur},
-                {"label": "RON", "data": ron},
-            ],
-        }
-
-    total_data = build_timeline(qs_total)
 
-    # PER USER
-    per_user = {}
+# curs valutar (din tabela CursValutar, cu cache în proces)
 
-    users = User.objects.filter(id__in=user_ids)
 
-    for u in users:
-        qs_user = (
-            MiscareFond.objects.filter(user=u)
-            .annotate(zi=TruncDate("data"))
-            .values("zi")
-            .annotate(
-                eur=Sum("suma_eur"),
-                ron=Sum("suma_ron"),
-            )
-            .order_by("zi")
+@buget_interogari(2)
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+@get_conditionat
+def curs_valutar(request):
+    moneda = _moneda_din_query(request.query_params) or Moneda.RON
+    baza = _moneda_din_query(request.query_params, "baza") or Moneda.EUR
+    data = _data_din_query(request.query_params, "data") or date.today()
+
+    curs = curs_la(moneda, baza, data)
+    if curs is None:
+        return Response(
+            {"detail": "Nu există curs pentru perechea cerută."},
+            status=status.HTTP_404_NOT_FOUND,
         )
 
-        per_user[u.username] = build_timeline(qs_user)
+    return Response({"moneda": moneda, "baza": baza, "data": data, "curs": curs})
 
-    return Response({"total": total_data, "per_user": per_user})
+
+# sincronizare incrementală: doar ce s-a schimbat de la tokenul clientului
+
+
+@buget_interogari(8)
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+@get_conditionat
+def sync(request):
+    user_ids = get_connected_user_ids(request.user)
+    return Response(date_sync(user_ids, request.query_params.get("since")))
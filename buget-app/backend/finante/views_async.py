@@ -0,0 +1,255 @@
+"""
+Variante async (ASGI) ale endpointurilor de citire, cu același răspuns ca
+views.py. Query-urile independente rulează în paralel, fiecare pe firul și
+conexiunea lui din FIRE_DB: metodele async ale ORM-ului (aaggregate etc.)
+trec toate prin același fir „thread sensitive”, deci un asyncio.gather peste
+ele ar rula tot pe rând.
+"""
+
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Sum
+from django.http import HttpResponse, HttpResponseNotAllowed
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotAuthenticated
+
+from .autentificare import JWTAuthenticationCronometrat
+from .instrumentare import buget_interogari, numara_in_fir
+from .models import (
+    CheltuialaVariabila,
+    EconomieVacanta,
+    MiscareFond,
+    TipRezumat,
+    Venit,
+)
+from .renderers import JSONRendererCronometrat
+from .serializers import MiscareFondSerializer
+from .utils import cheie_luna_bugetara, get_luna_bugetara
+from .utils_curs import total_convertit
+from .utils_rezumat import SURSE_REZUMAT, rezumat_luna, total_tip
+from .utils_serializare import serializeaza
+from .utils_solduri import totaluri_fonduri
+from .utils_users import get_connected_user_ids
+from .views import (
+    _dashboard_fonduri,
+    _dashboard_rezumat,
+    _dashboard_vacanta,
+    _luni_din_query,
+    _moneda_din_query,
+    _raspuns_buget,
+    _raspuns_dashboard,
+    _raspuns_fonduri,
+    _raspuns_grafice,
+    _raspuns_status_venit,
+    _raspuns_vacanta,
+    _serie_buget,
+    _serie_grafice,
+)
+
+
+FIRE_DB = getattr(settings, "FINANTE_FIRE_DB_ASYNC", 8)
+_fire = ThreadPoolExecutor(max_workers=FIRE_DB, thread_name_prefix="finante-db")
+
+_jwt = JWTAuthenticationCronometrat()
+_renderer = JSONRendererCronometrat()
+
+
+def _in_fir(functie, *args):
+    # conexiunea firului respectă CONN_MAX_AGE, ca la un request sincron
+    for conn in connections.all(initialized_only=True):
+        conn.close_if_unusable_or_obsolete()
+
+    with numara_in_fir():
+        return functie(*args)
+
+
+async def in_fir(functie, *args):
+    """
+    Rulează `functie(*args)` (cod ORM sincron) într-un fir din FIRE_DB.
+    """
+
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()  # pentru contorul de interogări
+    return await loop.run_in_executor(_fire, context.run, _in_fir, functie, *args)
+
+
+async def in_paralel(*apeluri):
+    """
+    in_paralel((f, a, b), (g, c)) → [f(a, b), g(c)], rulate simultan.
+    """
+
+    return await asyncio.gather(*(in_fir(*apel) for apel in apeluri))
+
+
+def _json(data, status_code=status.HTTP_200_OK):
+    return HttpResponse(
+        _renderer.render(data), status=status_code, content_type="application/json"
+    )
+
+
+def _autentifica(request):
+    rezultat = _jwt.authenticate(request)
+    if rezultat is None:
+        raise NotAuthenticated()
+    return rezultat[0]
+
+
+def api_async(view):
+    """
+    Echivalentul lui @api_view(["GET"]) + IsAuthenticated pentru un view
+    async care întoarce date (nu Response): JWT, erori DRF, JSON.
+    """
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method != "GET":
+            return HttpResponseNotAllowed(["GET"])
+
+        try:
+            request.user = await in_fir(_autentifica, request)
+            data = await view(request, *args, **kwargs)
+        except APIException as e:
+            # aceeași formă ca exception_handler-ul DRF
+            detaliu = e.detail
+            if not isinstance(detaliu, (list, dict)):
+                detaliu = {"detail": detaliu}
+
+            response = _json(detaliu, e.status_code)
+            if e.status_code == status.HTTP_401_UNAUTHORIZED:
+                response["WWW-Authenticate"] = _jwt.authenticate_header(request)
+            return response
+
+        return _json(data)
+
+    return wrapper
+
+
+# ---------- endpointuri ----------
+
+
+@buget_interogari(5)
+@api_async
+async def buget_lunar(request):
+    start, end = get_luna_bugetara()
+    user_ids = await in_fir(get_connected_user_ids, request.user)
+    baza = _moneda_din_query(request.GET)
+
+    luni = _luni_din_query(request.GET)
+    if luni:
+        return await in_fir(_serie_buget, user_ids, luni, baza)
+
+    if baza:
+        # cele trei tabele, convertite în SQL, în paralel
+        rezultate = await in_paralel(
+            *(
+                (
+                    total_convertit,
+                    model.objects.filter(
+                        user_id__in=user_ids, data__range=(start, end)
+                    ),
+                    baza,
+                )
+                for model in SURSE_REZUMAT
+            )
+        )
+        (venit, lipsa_v), (fixe, lipsa_f), (variabile, lipsa_c) = rezultate
+
+        raspuns = _raspuns_buget(start, end, venit, fixe, variabile)
+        raspuns.update({"moneda": baza, "fara_curs": lipsa_v + lipsa_f + lipsa_c})
+        return raspuns
+
+    rezumat = await in_fir(rezumat_luna, user_ids, cheie_luna_bugetara(start))
+    return _raspuns_buget(
+        start,
+        end,
+        total_tip(rezumat, TipRezumat.VENIT),
+        total_tip(rezumat, TipRezumat.FIXA),
+        total_tip(rezumat, TipRezumat.VARIABILA),
+    )
+
+
+@buget_interogari(3)
+@api_async
+async def grafice_luna(request):
+    start, end = get_luna_bugetara()
+    user_ids = await in_fir(get_connected_user_ids, request.user)
+
+    luni = _luni_din_query(request.GET)
+    if luni:
+        return await in_fir(_serie_grafice, user_ids, luni)
+
+    rezumat = await in_fir(
+        rezumat_luna,
+        user_ids,
+        cheie_luna_bugetara(start),
+        [TipRezumat.VENIT, TipRezumat.VARIABILA],
+    )
+    return _raspuns_grafice(start, end, rezumat)
+
+
+def _venit_pe_luni(user_ids):
+    return list(
+        Venit.objects.filter(user_id__in=user_ids)
+        .values_list("luna_bugetara")
+        .annotate(total=Sum("suma"))
+        .order_by("luna_bugetara")
+    )
+
+
+@buget_interogari(3)
+@api_async
+async def venit_status_lunar(request):
+    user_ids = await in_fir(get_connected_user_ids, request.user)
+    return _raspuns_status_venit(await in_fir(_venit_pe_luni, user_ids))
+
+
+def _suma(qs, camp="suma"):
+    return qs.aggregate(total=Sum(camp))["total"] or 0
+
+
+@buget_interogari(3)
+@api_async
+async def economii_vacanta_sumar(request):
+    puse, cheltuite = await in_paralel(
+        (_suma, EconomieVacanta.objects.filter(user=request.user, tip="economii")),
+        (
+            _suma,
+            CheltuialaVariabila.objects.filter(user=request.user, categorie="vacanta"),
+        ),
+    )
+    return _raspuns_vacanta(puse, cheltuite)
+
+
+def _miscari(qs):
+    return serializeaza(MiscareFondSerializer, qs)
+
+
+@buget_interogari(4)
+@api_async
+async def fonduri(request):
+    user_ids = await in_fir(get_connected_user_ids, request.user)
+    qs = MiscareFond.objects.filter(user_id__in=user_ids)
+
+    (total_eur, total_ron), miscari = await in_paralel(
+        (totaluri_fonduri, user_ids), (_miscari, qs)
+    )
+    return _raspuns_fonduri(total_eur, total_ron, miscari)
+
+
+@buget_interogari(5)
+@api_async
+async def dashboard(request):
+    start, end = get_luna_bugetara()
+    user_ids = await in_fir(get_connected_user_ids, request.user)
+
+    din_rezumat, puse_vacanta, din_fonduri = await in_paralel(
+        (_dashboard_rezumat, user_ids, cheie_luna_bugetara(start), request.user.id),
+        (_dashboard_vacanta, request.user.id),
+        (_dashboard_fonduri, user_ids),
+    )
+    return _raspuns_dashboard(start, end, din_rezumat, puse_vacanta, din_fonduri)